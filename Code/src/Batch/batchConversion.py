@@ -0,0 +1,213 @@
+import contextlib
+import glob
+import io
+import os
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+# Extensions of the input files taken from a directory, the first matching one is removed to name the outputs
+input_extensions = (".city.json", ".city.jsonl", ".json", ".jsonl")
+
+# Output path options of main.main that are directories in a batch conversion, with the suffix of every file in them
+per_file_path_options = {
+    "incremental_state_path": "_state.json",
+    "profile_path": "_profile.json",
+    "profile_stats_path": ".prof"
+}
+
+# Conversion function of a worker process, set once by init_worker
+worker_convert: Optional[Callable[..., Any]] = None
+
+
+def init_worker(shacl_file_path: Optional[str] = None):
+    """
+    Initialize a worker process with the state shared by the conversions of all its files: the modules of the
+    conversion, imported once, and the SHACL shapes graph, parsed once if SHACL validation is enabled.
+
+    :param shacl_file_path: Path to the SHACL shapes file, None without SHACL validation.
+    """
+    global worker_convert
+    # Imported here, as main imports this module
+    import main
+    from SHACL import shaclValidation
+    worker_convert = main.main
+    if shacl_file_path:
+        shaclValidation.init_worker(shacl_file_path)
+
+
+def get_input_files(input_path: str) -> List[str]:
+    """
+    List the files of a batch conversion.
+
+    :param input_path: A directory, whose CityJSON and CityJSONSeq files are converted, or a glob pattern, e.g. tiles/*.city.json.
+    :return: The paths of the files, sorted.
+    """
+    if os.path.isdir(input_path):
+        return sorted(os.path.join(input_path, name) for name in os.listdir(input_path)
+                      if name.endswith(input_extensions) and os.path.isfile(os.path.join(input_path, name)))
+    return sorted(path for path in glob.glob(input_path, recursive=True) if os.path.isfile(path))
+
+
+def get_file_stem(input_file_path: str) -> str:
+    """
+    Get the name of an input file without its extension, used as the identifier of the CityJSON and to name the outputs.
+
+    :param input_file_path: Path to the input file.
+    :return: The name of the file without its extension.
+    """
+    name = os.path.basename(input_file_path)
+    for extension in input_extensions:
+        if name.endswith(extension):
+            return name[:-len(extension)]
+    return os.path.splitext(name)[0]
+
+
+def convert_file(input_file_path: str, output_file_path: str, base_url: str, city_id: str, options: Dict[str, Any]) -> Tuple[str, float, str]:
+    """
+    Convert a file in a worker process, catching any error so the other files of the batch are still converted.
+
+    :param input_file_path: Path to the input file.
+    :param output_file_path: Path to the output file.
+    :param base_url: Base URL for the CityJSON file.
+    :param city_id: Identifier for the CityJSON file.
+    :param options: The other keyword arguments of main.main.
+    :return: The status, "converted", "skipped" if the output was not written, e.g. for an invalid file, or "failed",
+        the wall time in seconds, and the messages printed by the conversion or the error.
+    """
+    messages = io.StringIO()
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(messages):
+            written = worker_convert(input_file_path, output_file_path, base_url, city_id, **options)
+        status = "converted" if written else "skipped"
+    except KeyboardInterrupt:
+        raise
+    except BaseException as error:
+        # Also catches the panics of the schema validator, which are not Exceptions
+        status = "failed"
+        messages.write(f"{type(error).__name__}: {error}\n")
+    return status, time.perf_counter() - start, messages.getvalue()
+
+
+def run_pool(executor: ProcessPoolExecutor, workers: int, pending: Deque[str], suspects: Deque[str],
+             get_arguments: Callable[[str], Tuple[Any, ...]], report: Callable[[str, str, float, str], None]) -> List[str]:
+    """
+    Convert files in a pool of worker processes until they are all converted or a worker process dies, which breaks
+    the whole pool.
+
+    At most one file per worker is submitted at a time, so the files being converted when the pool breaks are known.
+    The suspects are submitted alone, each one being the only file converted by the pool.
+
+    :param executor: The pool of worker processes.
+    :param workers: Number of worker processes.
+    :param pending: The files to convert, removed once submitted.
+    :param suspects: The files to convert alone, removed once submitted.
+    :param get_arguments: Function giving the arguments of convert_file for a file.
+    :param report: Function called with the file, status, wall time and messages of every converted file.
+    :return: The files that were being converted when the pool broke, empty if it did not.
+    """
+    futures: Dict[Future, str] = {}
+    crashed: List[str] = []
+    while not crashed and (futures or pending or suspects):
+        if suspects:
+            if not futures:
+                input_file_path = suspects.popleft()
+                futures[executor.submit(convert_file, *get_arguments(input_file_path))] = input_file_path
+        else:
+            while pending and len(futures) < workers:
+                input_file_path = pending.popleft()
+                futures[executor.submit(convert_file, *get_arguments(input_file_path))] = input_file_path
+
+        done, _ = wait(futures, return_when=FIRST_COMPLETED)
+        for future in done:
+            input_file_path = futures.pop(future)
+            try:
+                report(input_file_path, *future.result())
+            except BrokenProcessPool:
+                crashed.append(input_file_path)
+            except Exception as error:
+                # E.g. the arguments or the result could not be pickled
+                report(input_file_path, "failed", 0.0, f"{type(error).__name__}: {error}\n")
+    # Their conversion was not finished when the pool broke
+    crashed.extend(futures.values())
+    return crashed
+
+
+def convert_batch(input_path: str, output_folder: str, base_url: str, workers: int, shacl_file_path: Optional[str], options: Dict[str, Any], output_extension: str) -> Dict[str, int]:
+    """
+    Convert the files of a directory or glob pattern, distributing them over a pool of worker processes.
+
+    Every worker initializes its shared state once, see init_worker, instead of every file paying for the startup of a
+    new process. The files are submitted from the largest to the smallest, so the last ones to finish are small, and
+    their status and wall time are printed as soon as they are converted. Every file is converted with a single process,
+    its CityJSON identifier is the name of the file without its extension, and its output has the same name in
+    output_folder. An error in a file is reported without stopping the conversion of the other files. A worker process
+    dying, e.g. out of memory, breaks the pool: it is replaced by a new one, and the files that were being converted are
+    converted again one at a time, so only the file killing its worker process fails.
+
+    :param input_path: A directory or a glob pattern, see get_input_files.
+    :param output_folder: Folder of the output files, created if missing.
+    :param base_url: Base URL for the CityJSON files.
+    :param workers: Number of worker processes, each converting one file at a time.
+    :param shacl_file_path: Path to the SHACL shapes file, None without SHACL validation.
+    :param options: The other keyword arguments of main.main, the options of per_file_path_options being folders.
+    :param output_extension: Extension of the output files, e.g. ".jsonld".
+    :return: Number of files per status.
+    """
+    input_files = get_input_files(input_path)
+    counts = {"converted": 0, "skipped": 0, "failed": 0}
+    if not input_files:
+        print(f"No input files found for: {input_path}")
+        return counts
+
+    os.makedirs(output_folder, exist_ok=True)
+    for option in per_file_path_options:
+        if options.get(option):
+            os.makedirs(options[option], exist_ok=True)
+
+    print(f"Converting {len(input_files)} files with {workers} workers")
+    start = time.perf_counter()
+    stems: Dict[str, List[str]] = {}
+    for input_file_path in input_files:
+        stems.setdefault(get_file_stem(input_file_path), []).append(input_file_path)
+    for stem, paths in stems.items():
+        if len(paths) > 1:
+            # Their outputs would overwrite each other
+            for input_file_path in paths:
+                counts["failed"] += 1
+                print(f"[{sum(counts.values())}/{len(input_files)}] failed {input_file_path}")
+                print(f"    Another input file has the same name without extension: {stem}")
+
+    def report(input_file_path: str, status: str, seconds: float, messages: str):
+        counts[status] += 1
+        print(f"[{sum(counts.values())}/{len(input_files)}] {status} {input_file_path} ({seconds:.2f} s)")
+        for line in messages.splitlines():
+            print(f"    {line}")
+
+    def get_arguments(input_file_path: str) -> Tuple[str, str, str, str, Dict[str, Any]]:
+        stem = get_file_stem(input_file_path)
+        file_options = dict(options, workers=1)
+        for option, suffix in per_file_path_options.items():
+            if options.get(option):
+                file_options[option] = os.path.join(options[option], stem + suffix)
+        return input_file_path, os.path.join(output_folder, stem + output_extension), base_url, stem, file_options
+
+    pending = deque(input_file_path for input_file_path in sorted(input_files, key=os.path.getsize, reverse=True)
+                    if len(stems[get_file_stem(input_file_path)]) == 1)
+    # Files that were being converted when a worker process died, converted again one at a time to find which one
+    # killed it
+    suspects: Deque[str] = deque()
+    while pending or suspects:
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(shacl_file_path,)) as executor:
+            crashed = run_pool(executor, workers, pending, suspects, get_arguments, report)
+        if len(crashed) == 1:
+            report(crashed[0], "failed", 0.0, "The worker process died, e.g. out of memory or in a native library\n")
+        else:
+            suspects.extend(crashed)
+
+    print(f"{counts['converted']} converted, {counts['skipped']} skipped, {counts['failed']} failed "
+          f"in {time.perf_counter() - start:.2f} s")
+    return counts
@@ -0,0 +1,152 @@
+import argparse
+import json
+import random
+from typing import Any, Dict, List, Optional, Sequence
+
+geometry_type_values = ["MultiPoint",
+                        "MultiLineString",
+                        "MultiSurface",
+                        "CompositeSurface",
+                        "Solid",
+                        "MultiSolid",
+                        "CompositeSolid"]
+
+# Corners of a box, as offsets from its lower corner
+box_corners = [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0),
+               (0, 0, 1), (1, 0, 1), (1, 1, 1), (0, 1, 1)]
+# Faces of a box, as indices into box_corners
+box_faces = [[0, 3, 2, 1], [4, 5, 6, 7], [0, 1, 5, 4], [1, 2, 6, 5], [2, 3, 7, 6], [3, 0, 4, 7]]
+
+# Size of a box and spacing of the grid the boxes are placed on, in transformed units
+box_size = 10000
+grid_spacing = 10000
+
+
+def box_boundaries(type: str, corners: List[int]):
+    """
+    Get the boundaries of a box of the given geometry type.
+
+    :param type: The geometry type, one of geometry_type_values.
+    :param corners: Vertex indices of the 8 corners of the box.
+    :return: The boundaries of the geometry.
+    """
+    faces = [[corners[index] for index in face] for face in box_faces]
+    if type == "MultiPoint":
+        return list(corners)
+    if type == "MultiLineString":
+        return [faces[0] + [faces[0][0]], faces[1] + [faces[1][0]]]
+    if type in ["MultiSurface", "CompositeSurface"]:
+        return [[face] for face in faces]
+    if type == "Solid":
+        return [[[face] for face in faces]]
+    if type in ["MultiSolid", "CompositeSolid"]:
+        return [[[[face] for face in faces]]]
+    raise ValueError(f"type value must be one of {', '.join(geometry_type_values)}")
+
+
+def generate_cityjson(object_count: int, geometry_types: Sequence[str] = geometry_type_values, lods: Sequence[str] = ("1", "2"),
+                      vertex_sharing: float = 0.5, seed: Optional[int] = 0) -> Dict[str, Any]:
+    """
+    Generate a synthetic CityJSON file of boxes placed on a grid.
+
+    Every city object is a Building with one geometry per LoD, the geometry types being used in turn.
+    With vertex sharing, a box reuses the corners it has in common with its neighbours on the grid, as
+    in a terraced row; otherwise it gets its own 8 vertices.
+
+    :param object_count: Number of city objects.
+    :param geometry_types: Geometry types to use, from geometry_type_values.
+    :param lods: LoDs of the geometries of every city object.
+    :param vertex_sharing: Fraction of the city objects sharing their vertices with their neighbours, between 0 and 1.
+    :param seed: Seed of the random generator, for reproducible files.
+    :return: The CityJSON file.
+    """
+    for type in geometry_types:
+        if type not in geometry_type_values:
+            raise ValueError(f"type value must be one of {', '.join(geometry_type_values)}")
+    if not 0 <= vertex_sharing <= 1:
+        raise ValueError("vertex_sharing value must be between 0 and 1")
+
+    rng = random.Random(seed)
+    row_length = max(1, int(object_count ** 0.5))
+    vertices: List[List[int]] = []
+    shared_vertices: Dict[tuple, int] = {}
+
+    def add_vertex(vertex: List[int], shared: bool) -> int:
+        if shared:
+            key = tuple(vertex)
+            if key not in shared_vertices:
+                shared_vertices[key] = len(vertices)
+                vertices.append(vertex)
+            return shared_vertices[key]
+        vertices.append(vertex)
+        return len(vertices) - 1
+
+    cityobjects = {}
+    geometry_index = 0
+    for object_index in range(object_count):
+        x = (object_index % row_length) * grid_spacing
+        y = (object_index // row_length) * grid_spacing
+        height = rng.randint(1, 5) * box_size
+        shared = rng.random() < vertex_sharing
+        corners = [add_vertex([x + dx * box_size, y + dy * box_size, dz * height], shared)
+                   for dx, dy, dz in box_corners]
+
+        geometry = []
+        for lod in lods:
+            type = geometry_types[geometry_index % len(geometry_types)]
+            geometry_index += 1
+            geometry.append({"type": type, "lod": lod, "boundaries": box_boundaries(type, corners)})
+
+        cityobjects[f"building_{object_index}"] = {
+            "type": "Building",
+            "attributes": {"measuredHeight": height / 1000, "storeysAboveGround": height // box_size},
+            "geometry": geometry
+        }
+
+    return {
+        "type": "CityJSON",
+        "version": "2.0",
+        "transform": {"scale": [0.001, 0.001, 0.001], "translate": [85000.0, 446000.0, 0.0]},
+        "metadata": {"referenceSystem": "https://www.opengis.net/def/crs/EPSG/0/7415", "title": "Synthetic city"},
+        "CityObjects": cityobjects,
+        "vertices": vertices
+    }
+
+
+def write_cityjson(path: str, cityjson: Dict[str, Any]):
+    """
+    Write a CityJSON file.
+
+    :param path: Path to save the CityJSON to file.
+    :param cityjson: The CityJSON file.
+    """
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(cityjson, file, separators=(",", ":"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        prog='cj2jld-generator',
+        description='Generate a synthetic CityJSON file of boxes for benchmarking cj2jld.'
+    )
+    parser.add_argument(
+        '-n', '--objects', type=int, help='Number of city objects (required)', required=True)
+    parser.add_argument(
+        '-o', '--output-file', help='Output CityJSON file path (required)', required=True)
+    parser.add_argument(
+        '-gt', '--geometry-types', nargs='+', choices=geometry_type_values, default=geometry_type_values,
+        help='Geometry types used in turn (by default, all of them)')
+    parser.add_argument(
+        '-l', '--lods', nargs='+', default=["1", "2"],
+        help='LoDs of the geometries of every city object (by default, 1 2)')
+    parser.add_argument(
+        '-vs', '--vertex-sharing', type=float, default=0.5,
+        help='Fraction of the city objects sharing vertices with their neighbours (by default, 0.5)')
+    parser.add_argument(
+        '-s', '--seed', type=int, default=0,
+        help='Seed of the random generator (by default, 0)')
+
+    args = parser.parse_args()
+    write_cityjson(args.output_file, generate_cityjson(
+        args.objects, args.geometry_types, args.lods, args.vertex_sharing, args.seed))
+    print(f"CityJSON written to: {args.output_file}")
@@ -0,0 +1,300 @@
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+import numpy as np
+import shapely
+from Benchmark.generator import generate_cityjson, write_cityjson, geometry_type_values
+from Vertices.vertexBlocks import vertices_encodings
+from main import main as convert, output_format_values
+
+default_sizes = [1000, 10000, 100000, 1000000]
+
+# Stages of main.main measured by its Profiler, in the order they run: the city objects are converted lazily,
+# "cityobjects" building them and "to_json" converting their geometries, while the output is written.
+# Every stage has its wall time, CPU time and increase of resident memory ("rss_increase_bytes")
+stage_names = ["read", "validate", "vertices", "cityobjects", "to_json", "write"]
+
+# Results of another version measured the stages differently and are not compared
+results_version = 2
+
+# Slowdown in seconds below which a stage is never reported as a regression, as short stages are noisy
+min_regression_seconds = 0.05
+
+
+def run_conversion(input_file_path: str, output_file_path: str, workers: int, output_format: str,
+                   geometry_cache_size: int, compact_coordinates: bool = False, include_wkt: bool = True,
+                   include_3d_boundaries: bool = True, vertex_references: bool = False, vertices_encoding: str = "list",
+                   vertex_block_size: int = 1000, include_envelope: bool = False, include_convex_hull: bool = False) -> Dict[str, Any]:
+    """
+    Convert a CityJSON file with main.main, measuring its stages with its Profiler.
+
+    The stages are the ones of a real conversion, so their times follow any change of the pipeline.
+
+    :param input_file_path: Path to the input CityJSON file.
+    :param output_file_path: Path to the output file.
+    :param workers: Number of worker processes converting the city objects.
+    :param output_format: Output format, one of output_format_values.
+    :param geometry_cache_size: Size of the geometry cache, 0 to disable it.
+    :param compact_coordinates: Flag to encode the points of the bounding boxes as JSON literals of coordinate arrays.
+    :param include_wkt: Flag to include the 2D boundaries of the geometries in WKT format.
+    :param include_3d_boundaries: Flag to include the 3D boundaries of the geometries as bounding boxes.
+    :param vertex_references: Flag to refer to the vertices by IRI in the bounding boxes.
+    :param vertices_encoding: Encoding of the vertices of the CityJSON node, one of vertices_encodings.
+    :param vertex_block_size: Number of vertices per vertex block.
+    :param include_envelope: Flag to include the 2D envelope of the city objects.
+    :param include_convex_hull: Flag to include the 2D convex hull of the city objects.
+    :return: Results of the stages and counts of the converted file.
+    """
+    report_path = f"{output_file_path}.profile.json"
+    # The messages of the conversion are not part of the benchmark output
+    with contextlib.redirect_stdout(io.StringIO()):
+        written = convert(input_file_path, output_file_path, "https://example.com/", "benchmark", False, False,
+                          workers=workers, output_format=output_format, geometry_cache_size=geometry_cache_size,
+                          profile_path=report_path, compact_coordinates=compact_coordinates, include_wkt=include_wkt,
+                          include_3d_boundaries=include_3d_boundaries, vertex_references=vertex_references,
+                          vertices_encoding=vertices_encoding, vertex_block_size=vertex_block_size,
+                          include_envelope=include_envelope, include_convex_hull=include_convex_hull)
+    with open(report_path, encoding='utf-8') as report_file:
+        report = json.load(report_file)
+    os.remove(report_path)
+
+    items = report["counts"].get("items", {})
+    result = {
+        "valid": bool(written),
+        "objects": items.get("cityobjects", 0),
+        "vertices": items.get("vertices", 0),
+        "output_bytes": os.path.getsize(output_file_path) if written else 0,
+        "stages": report["stages"],
+        "total": report["total"],
+        "max_rss_bytes": report["max_rss_bytes"]
+    }
+    if "geometry_cache" in report["counts"]:
+        result["geometry_cache"] = report["counts"]["geometry_cache"]
+    return result
+
+
+def format_memory(stage: Dict[str, Any]) -> str:
+    """
+    Format the increase of resident memory of a stage for the printed results.
+
+    :param stage: Measures of the stage in the profile report.
+    :return: Increase of resident memory in MiB, or an empty string when it is not measured.
+    """
+    if stage.get("rss_increase_bytes") is None:
+        return ""
+    return f" (+{stage['rss_increase_bytes'] / 2 ** 20:.0f} MiB)"
+
+
+def run_size(object_count: int, generator_options: Dict[str, Any], conversion_options: Dict[str, Any], work_folder: str) -> Dict[str, Any]:
+    """
+    Generate a synthetic file of the given size and convert it in a fresh process.
+
+    A fresh process per size keeps the peak resident memory of one size from hiding the next one.
+
+    :param object_count: Number of city objects.
+    :param generator_options: Keyword arguments of generate_cityjson.
+    :param conversion_options: Keyword arguments of run_conversion.
+    :param work_folder: Folder for the generated and converted files.
+    :return: Results of the size.
+    """
+    input_file_path = os.path.join(work_folder, f"synthetic_{object_count}.city.json")
+    output_file_path = os.path.join(work_folder, f"synthetic_{object_count}.out")
+
+    start_wall = time.perf_counter()
+    write_cityjson(input_file_path, generate_cityjson(object_count, **generator_options))
+    generate_seconds = time.perf_counter() - start_wall
+
+    try:
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+            result = executor.submit(run_conversion, input_file_path, output_file_path, **conversion_options).result()
+    finally:
+        for path in [input_file_path, output_file_path]:
+            if os.path.exists(path):
+                os.remove(path)
+
+    result["generate_seconds"] = generate_seconds
+    return result
+
+
+def get_environment() -> Dict[str, Any]:
+    """
+    Describe the machine and the versions the benchmark ran with.
+
+    :return: Description of the environment.
+    """
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "shapely": shapely.__version__
+    }
+
+
+def compare_results(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[Dict[str, Any]]:
+    """
+    Compare the wall time of every stage with a baseline run.
+
+    :param results: Results of the benchmark.
+    :param baseline: Results of a previous benchmark.
+    :param tolerance: Relative slowdown above which a stage is reported as a regression, e.g. 0.1 for 10%,
+        if it is also longer than min_regression_seconds.
+    :return: One comparison per size and stage found in both runs.
+    """
+    if baseline.get("version") != results_version:
+        print(f"The baseline has results of version {baseline.get('version')}, not {results_version}, it is not compared")
+        return []
+    baseline_runs = {run["objects"]: run for run in baseline.get("runs", [])}
+    comparisons = []
+    for run in results["runs"]:
+        baseline_run = baseline_runs.get(run["objects"])
+        if baseline_run is None:
+            continue
+        for name in stage_names + ["total"]:
+            current = run["total"] if name == "total" else run["stages"].get(name)
+            previous = baseline_run["total"] if name == "total" else baseline_run["stages"].get(name)
+            if not current or not previous or not previous["wall_seconds"]:
+                continue
+            ratio = current["wall_seconds"] / previous["wall_seconds"]
+            comparisons.append({
+                "objects": run["objects"],
+                "stage": name,
+                "baseline_wall_seconds": previous["wall_seconds"],
+                "wall_seconds": current["wall_seconds"],
+                "ratio": ratio,
+                "regression": ratio > 1 + tolerance and current["wall_seconds"] - previous["wall_seconds"] > min_regression_seconds
+            })
+    return comparisons
+
+
+def run_benchmark(sizes: List[int], generator_options: Dict[str, Any], conversion_options: Dict[str, Any],
+                  baseline: Optional[Dict[str, Any]] = None, tolerance: float = 0.1) -> Dict[str, Any]:
+    """
+    Run the benchmark for every size and compare it with a baseline.
+
+    :param sizes: Numbers of city objects to benchmark.
+    :param generator_options: Keyword arguments of generate_cityjson.
+    :param conversion_options: Keyword arguments of run_conversion.
+    :param baseline: Results of a previous benchmark, optional.
+    :param tolerance: Relative slowdown above which a stage is reported as a regression.
+    :return: Machine-readable results of the benchmark.
+    """
+    results = {
+        "version": results_version,
+        "environment": get_environment(),
+        "generator": generator_options,
+        "conversion": conversion_options,
+        "runs": []
+    }
+    with tempfile.TemporaryDirectory() as work_folder:
+        for object_count in sizes:
+            run = run_size(object_count, generator_options, conversion_options, work_folder)
+            run["objects"] = object_count
+            results["runs"].append(run)
+            print(f"{object_count} objects: " + ", ".join(
+                f"{name} {run['stages'][name]['wall_seconds']:.2f}s" + format_memory(run["stages"][name])
+                for name in stage_names if name in run["stages"])
+                + f", total {run['total']['wall_seconds']:.2f}s"
+                + (f", max RSS {run['max_rss_bytes'] / 2 ** 20:.0f} MiB" if run["max_rss_bytes"] else ""))
+
+    if baseline is not None:
+        results["comparison"] = compare_results(results, baseline, tolerance)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        prog='cj2jld-benchmark',
+        description='Benchmark every stage of cj2jld on synthetic CityJSON files of growing size.'
+    )
+    parser.add_argument(
+        '-n', '--sizes', type=int, nargs='+', default=default_sizes,
+        help=f'Numbers of city objects to benchmark (by default, {" ".join(map(str, default_sizes))})')
+    parser.add_argument(
+        '-o', '--output-file', help='Path of the JSON file the results are written to (by default, printed only)')
+    parser.add_argument(
+        '-bl', '--baseline', help='Path of the JSON results of a previous run to compare with')
+    parser.add_argument(
+        '-t', '--tolerance', type=float, default=0.1,
+        help='Relative slowdown of a stage compared with the baseline reported as a regression (by default, 0.1)')
+    parser.add_argument(
+        '-gt', '--geometry-types', nargs='+', choices=geometry_type_values, default=geometry_type_values,
+        help='Geometry types of the synthetic files (by default, all of them)')
+    parser.add_argument(
+        '-l', '--lods', nargs='+', default=["1", "2"],
+        help='LoDs of the geometries of every city object (by default, 1 2)')
+    parser.add_argument(
+        '-vs', '--vertex-sharing', type=float, default=0.5,
+        help='Fraction of the city objects sharing vertices with their neighbours (by default, 0.5)')
+    parser.add_argument(
+        '-w', '--workers', type=int, default=1,
+        help='Number of worker processes converting the city objects (by default, 1)')
+    parser.add_argument(
+        '-of', '--output-format', choices=output_format_values, default="jsonld",
+        help='Output format of the conversion (by default, jsonld)')
+    parser.add_argument(
+        '-gc', '--geometry-cache', type=int, default=0,
+        help='Size of the geometry cache, 0 to disable it (by default, 0)')
+    parser.add_argument(
+        '-cc', '--compact-coordinates', action='store_true',
+        help='To encode the points of the bounding boxes as JSON literals of coordinate arrays (by default, false)')
+    parser.add_argument(
+        '-nw', '--no-wkt', action='store_true',
+        help='To leave out the 2D boundaries of the geometries in WKT format (by default, false)')
+    parser.add_argument(
+        '-n3d', '--no-3d-boundaries', action='store_true',
+        help='To leave out the 3D boundaries of the geometries (by default, false)')
+    parser.add_argument(
+        '-vr', '--vertex-references', action='store_true',
+        help='To refer to the vertices by IRI in the bounding boxes (by default, false)')
+    parser.add_argument(
+        '-ve', '--vertices-encoding', choices=vertices_encodings, default="list",
+        help='Encoding of the vertices of the CityJSON node (by default, list)')
+    parser.add_argument(
+        '-vbs', '--vertex-block-size', type=int, default=1000,
+        help='Number of vertices per vertex block of the json and base64 encodings (by default, 1000)')
+    parser.add_argument(
+        '-env', '--envelope', action='store_true',
+        help='To add the 2D envelope of every city object (by default, false)')
+    parser.add_argument(
+        '-hull', '--convex-hull', action='store_true',
+        help='To add the 2D convex hull of every city object (by default, false)')
+
+    args = parser.parse_args()
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as baseline_file:
+            baseline = json.load(baseline_file)
+
+    results = run_benchmark(
+        args.sizes,
+        {"geometry_types": args.geometry_types, "lods": args.lods, "vertex_sharing": args.vertex_sharing, "seed": 0},
+        {"workers": args.workers, "output_format": args.output_format, "geometry_cache_size": args.geometry_cache,
+         "compact_coordinates": args.compact_coordinates, "include_wkt": not args.no_wkt,
+         "include_3d_boundaries": not args.no_3d_boundaries, "vertex_references": args.vertex_references,
+         "vertices_encoding": args.vertices_encoding, "vertex_block_size": args.vertex_block_size,
+         "include_envelope": args.envelope, "include_convex_hull": args.convex_hull},
+        baseline, args.tolerance)
+
+    if args.output_file:
+        with open(args.output_file, 'w', encoding='utf-8') as results_file:
+            json.dump(results, results_file, indent=4)
+        print(f"Results written to: {args.output_file}")
+
+    regressions = [comparison for comparison in results.get("comparison", []) if comparison["regression"]]
+    for comparison in regressions:
+        print(f"Regression at {comparison['objects']} objects in {comparison['stage']}: "
+              f"{comparison['baseline_wall_seconds']:.2f}s -> {comparison['wall_seconds']:.2f}s")
+    if regressions:
+        sys.exit(1)
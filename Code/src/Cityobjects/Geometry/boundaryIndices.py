@@ -0,0 +1,27 @@
+from itertools import chain
+from typing import Any, Dict, Iterator
+
+# Nesting depth of the vertex indices in the boundaries of every geometry type
+boundary_depths = {"MultiPoint": 1,
+                   "MultiLineString": 2,
+                   "MultiSurface": 3,
+                   "CompositeSurface": 3,
+                   "Solid": 4,
+                   "MultiSolid": 5,
+                   "CompositeSolid": 5}
+
+
+def iter_boundary_indices(geometry: Dict[str, Any]) -> Iterator[int]:
+    """
+    Iterate over the vertex indices of the boundaries of a geometry, without building the nested lists again.
+
+    :param geometry: The CityJSON geometry.
+    :return: Iterator over the vertex indices, in boundary order, empty for the geometry types without boundaries
+        of vertex indices, e.g. GeometryInstance.
+    """
+    if geometry["type"] not in boundary_depths:
+        return iter(())
+    boundaries = geometry["boundaries"]
+    for _ in range(boundary_depths[geometry["type"]] - 1):
+        boundaries = chain.from_iterable(boundaries)
+    return iter(boundaries)
@@ -0,0 +1,83 @@
+from typing import Any, Dict, List, Optional
+import numpy as np
+import shapely
+from Cityobjects.Geometry.boundaryIndices import iter_boundary_indices
+
+
+class ExtentGeometries:
+    """
+    A class to represent the simple 2D geometries enclosing all the geometries of a city object, given as extra
+    "geosparql:hasGeometry" nodes so GeoSPARQL queries can filter on them before using the detailed WKT of the
+    geometries ("cj:hasGeometry").
+
+    The role of every node is given by its class: cj:Envelope for the 2D bounding rectangle, cj:ConvexHull for the
+    2D convex hull of the vertices. Both enclose the projection of every geometry of the city object, whatever its
+    LoD, so a city object whose envelope does not intersect a region cannot intersect it either.
+
+    The geometries are only computed in to_json, in one pass over the vertices of the city object.
+
+    Arguments:
+        geometries (List[Dict[str, Any]]): The "geometry" member of the CityObject as found in the CityJSON file.
+        real_vertices (np.ndarray): The transformed vertices of the file, see Transform.to_real_vertices.
+        envelope (bool): Flag to include the envelope.
+        convex_hull (bool): Flag to include the convex hull.
+    """
+
+    def __init__(self, geometries: List[Dict[str, Any]], real_vertices: np.ndarray, envelope: bool = True, convex_hull: bool = False):
+        self.geometries = geometries
+        self.real_vertices = real_vertices
+        self.envelope = envelope
+        self.convex_hull = convex_hull
+        self.converted: Optional[List[Dict[str, Any]]] = None
+
+    def get_points(self) -> Optional[np.ndarray]:
+        """
+        Gather the 2D coordinates of the vertices of all the geometries with a single fancy index.
+
+        :return: The coordinates, or None if the geometries have no vertex.
+        """
+        indices = []
+        for geometry in self.geometries:
+            indices.extend(iter_boundary_indices(geometry))
+        if not indices:
+            return None
+        return self.real_vertices[np.asarray(indices, dtype=np.intp), :2]
+
+    @staticmethod
+    def geometry_to_json(role: str, geometry: Any) -> Dict[str, Any]:
+        """
+        Convert an extent geometry to its JSON-LD representation.
+
+        :param role: The class giving the role of the geometry, e.g. "cj:Envelope".
+        :param geometry: The shapely geometry.
+        :return: JSON-LD representation of the geometry.
+        """
+        return {
+            "@type": ["geosparql:Geometry", role],
+            "geosparql:asWKT": {
+                "@value": shapely.to_wkt(geometry, rounding_precision=-1),
+                "@type": "geosparql:wktLiteral"
+            }
+        }
+
+    def to_json(self) -> Optional[List[Dict[str, Any]]]:
+        """
+        Convert the extent geometries to their JSON-LD representation.
+
+        The envelope is a polygon, or a point or a line string for city objects without a 2D area.
+
+        :return: JSON-LD representation of the extent geometries, None if the geometries have no vertex.
+        """
+        if self.geometries is not None:
+            points = self.get_points()
+            if points is not None:
+                multi_point = shapely.multipoints(points)
+                data = []
+                if self.envelope:
+                    data.append(self.geometry_to_json("cj:Envelope", shapely.envelope(multi_point)))
+                if self.convex_hull:
+                    data.append(self.geometry_to_json("cj:ConvexHull", shapely.convex_hull(multi_point)))
+                self.converted = data or None
+            # The geometries and the vertices are not needed anymore
+            self.geometries = self.real_vertices = None
+        return self.converted
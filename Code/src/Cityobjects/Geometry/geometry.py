@@ -1,9 +1,14 @@
+from itertools import chain
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import numpy as np
+import shapely
 from shapely.geometry import Polygon, MultiPoint, MultiLineString, MultiPolygon
 from Cityobjects.Geometry.multiPoint import MultiPoint as CjMultiPoint
 from Cityobjects.Geometry.multiLineString import MultiLineString as CjMultiLineString
 from Cityobjects.Geometry.multiCompositeSurface import MultiCompositeSurface as CjMultiCompositeSurface
 from Cityobjects.Geometry.solid import Solid as CjSolid
 from Cityobjects.Geometry.multiCompositeSolid import MultiCompositeSolid as CjMultiCompositeSolid
+from Cityobjects.Geometry.geometryCache import GeometryCache
 
 
 class Geometry:
@@ -11,229 +16,346 @@ class Geometry:
     A class to represent a cityJSON geometric object with various types such as MultiPoint, MultiLineString, MultiSurface,
     CompositeSurface, Solid, MultiSolid, CompositeSolid.
 
+    The boundaries are only converted when the WKT or the bounding box is first used, usually when the
+    city object is written, and only to the representations that are included.
+
     Attributes:
         type (str): The type of the geometric object.
         lod (str): The level of detail of the geometric object.
-        boundaries (List): The boundaries of the geometric object in CityJSON format.
-        boundingBox (CjMultiPoint | CjMultiLineString | CjMultiCompositeSurface | CjSolid | CjMultiCompositeSolid): The bounding box of the the geometric object
+        boundaries (str): The boundaries of the geometric object in WKT format, None if the WKT is not included.
+        boundingBox (CjMultiPoint | CjMultiLineString | CjMultiCompositeSurface | CjSolid | CjMultiCompositeSolid): The bounding box of the the geometric object, not set when taken from the cache
+        bounding_box_json (Dict): The JSON-LD representation of the bounding box, None if the 3D boundaries are not included
 
     Arguments:
         type (str): The type of the geometric object.
         lod (str): The level of detail of the geometric object.
         boundaries (List): The boundaries of the geometric object.
-        vertices: The vertices of the geometric object.
-        scale: The scale factor for the vertices.
-        translate: The translation vector for the vertices.
+        real_vertices (np.ndarray): The transformed vertices of the file, see Transform.to_real_vertices.
+        cache (Optional[GeometryCache]): Cache of converted geometries to reuse for identical boundaries.
+        compact_coordinates (bool): Flag to encode the points of the bounding box as JSON literals of coordinate arrays.
+        include_wkt (bool): Flag to include the 2D boundaries in WKT format ("geosparql:asWKT").
+        include_3d_boundaries (bool): Flag to include the 3D boundaries as the bounding box ("cj:hasBoundingBox").
+        vertex_prefix (Optional[str]): Prefix of the IRIs of the vertices, e.g. "v:", to refer to the shared vertices
+            by IRI in the bounding box instead of repeating their coordinates, see points_to_json.
     """
 
-    def __init__(self, type: str, lod: str, boundaries, vertices, scale, translate):
+    def __init__(self, type: str, lod: str, boundaries, real_vertices: np.ndarray, cache: Optional[GeometryCache] = None, compact_coordinates: bool = False, include_wkt: bool = True, include_3d_boundaries: bool = True, vertex_prefix: Optional[str] = None):
         self.type = type
         self.lod = lod
-        self.boundaries = self.to_wkt(boundaries, vertices, scale, translate)
+        self.compact_coordinates = compact_coordinates
+        self.vertex_prefix = vertex_prefix
+        self.include_wkt = include_wkt
+        self.include_3d_boundaries = include_3d_boundaries
+        self.cityjson_boundaries = boundaries
+        self.real_vertices = real_vertices
+        self.cache = cache
+        self.converted: Optional[Tuple[Optional[str], Optional[Dict[str, Any]]]] = None
+
+    def convert(self) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """
+        Convert the boundaries once, or take them from the cache.
+
+        :return: The WKT and the JSON-LD representation of the bounding box, None for the ones not included.
+        """
+        if self.converted is None:
+            cache = self.cache
+            key = cache.get_key(self.type, self.cityjson_boundaries) if cache is not None else None
+            cached = cache.get(key) if cache is not None else None
+            if cached is not None:
+                self.converted = cached
+            else:
+                wkt = self.to_wkt(self.cityjson_boundaries, self.real_vertices)
+                self.converted = (wkt, self.boundingBox.to_json() if self.include_3d_boundaries else None)
+                if cache is not None:
+                    cache.put(key, *self.converted)
+            # The CityJSON boundaries and the vertices are not needed anymore
+            self.cityjson_boundaries = self.real_vertices = self.cache = None
+        return self.converted
+
+    @property
+    def boundaries(self) -> Optional[str]:
+        """
+        The boundaries in WKT format, None if not included.
+        """
+        return self.convert()[0]
+
+    @property
+    def bounding_box_json(self) -> Optional[Dict[str, Any]]:
+        """
+        The JSON-LD representation of the bounding box, None if not included.
+        """
+        return self.convert()[1]
+
+    @staticmethod
+    def flatten_rings(boundaries, depth: int) -> List[List[int]]:
+        """
+        Flatten nested boundaries into the list of their rings (lists of vertex indices).
+
+        :param boundaries: The boundaries of the geometric object.
+        :param depth: Nesting depth of the vertex indices in the boundaries.
+        :return: List of rings in boundary order.
+        """
+        rings = boundaries
+        for _ in range(depth - 2):
+            rings = [ring for nested in rings for ring in nested]
+        return rings
+
+    @staticmethod
+    def nest_rings(boundaries, depth: int, rings: Iterator[List[Any]]):
+        """
+        Rebuild the nesting of the boundaries, replacing every ring with the next item of rings.
+
+        :param boundaries: The boundaries of the geometric object.
+        :param depth: Nesting depth of the vertex indices in the boundaries.
+        :param rings: Iterator over the replacement of every ring, in boundary order.
+        :return: Nested replacement of the boundaries.
+        """
+        if depth == 2:
+            return [next(rings) for _ in boundaries]
+        return [Geometry.nest_rings(nested, depth - 1, rings) for nested in boundaries]
+
+    @staticmethod
+    def gather_rings(rings: List[List[int]], real_vertices: np.ndarray, close: bool = False) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Replace the vertex indices of all the rings with their coordinates using a single fancy index.
+
+        :param rings: List of rings, each a list of vertex indices.
+        :param real_vertices: The transformed vertices.
+        :param close: Flag to append the first vertex to every ring whose first and last coordinates differ.
+        :return: Coordinates of all the rings one after another, the offsets of the rings in them, and the vertex
+            index of every coordinate.
+        """
+        lengths = np.fromiter((len(ring) for ring in rings), dtype=np.intp, count=len(rings))
+        indices = np.fromiter(chain.from_iterable(rings), dtype=np.intp, count=int(lengths.sum()))
+        offsets = np.zeros(len(rings) + 1, dtype=np.intp)
+        np.cumsum(lengths, out=offsets[1:])
+
+        coordinates = real_vertices[indices]
+        if close:
+            open_rings = Geometry.get_open_rings(coordinates, offsets)
+            closed_coordinates, closed_offsets = Geometry.close_rings(coordinates, offsets, open_rings)
+            return closed_coordinates, closed_offsets, Geometry.close_rings(indices, offsets, open_rings)[0]
+        return coordinates, offsets, indices
+
+    @staticmethod
+    def get_open_rings(coordinates: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+        """
+        Find the rings whose first and last coordinates differ.
 
-    def get_real_vertex(self, index, vertices, scale, translate):
+        :param coordinates: Coordinates of all the rings one after another.
+        :param offsets: The offsets of the rings, see gather_rings.
+        :return: Boolean mask of the open rings, empty rings are not open.
         """
-        Replace vertex index with actual vertex coordinates and apply the transform function.
+        starts = offsets[:-1]
+        ends = offsets[1:]
+        open_rings = ends > starts
+        open_rings[open_rings] = np.any(
+            coordinates[starts[open_rings]] != coordinates[ends[open_rings] - 1], axis=1)
+        return open_rings
+
+    @staticmethod
+    def close_rings(values: np.ndarray, offsets: np.ndarray, open_rings: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Append the first value to every open ring.
+
+        :param values: Coordinates, or any other per vertex values, of all the rings one after another.
+        :param offsets: The offsets of the rings, see gather_rings.
+        :param open_rings: The rings to close, by default the ones whose first and last coordinates differ, see get_open_rings.
+        :return: Values of all the closed rings one after another, and their offsets.
+        """
+        if open_rings is None:
+            open_rings = Geometry.get_open_rings(values, offsets)
+        closed_values = np.insert(values, offsets[1:][open_rings], values[offsets[:-1][open_rings]], axis=0)
+        closed_offsets = offsets + np.concatenate(([0], np.cumsum(open_rings)))
+        return closed_values, closed_offsets
+
+    def get_points(self, coordinates: np.ndarray, indices: np.ndarray) -> np.ndarray:
+        """
+        Select the points of the 3D boundaries: the coordinates, or the vertex indices when the vertices are referred
+        to by IRI.
+
+        :param coordinates: Coordinates of the points.
+        :param indices: Vertex indices of the points.
+        :return: The points.
+        """
+        return indices if self.vertex_prefix is not None else coordinates
+
+    @staticmethod
+    def projected_faces_to_wkt(coordinates: np.ndarray, offsets: np.ndarray) -> Optional[str]:
+        """
+        Project faces to 2D and convert the valid ones to a WKT MultiPolygon, in one vectorized pass.
+
+        Every ring is taken as a face on its own. Rings with fewer than 3 distinct positions, invalid and
+        empty polygons are left out.
+
+        :param coordinates: Coordinates of all the rings one after another.
+        :param offsets: The offsets of the rings, see gather_rings.
+        :return: MultiPolygon in WKT format, or None if no face is valid.
+        """
+        # Convert to 2D by ignoring the Z-coordinate, closing the rings in 2D
+        coordinates, offsets = Geometry.close_rings(coordinates[:, :2], offsets)
+        lengths = np.diff(offsets)
+        kept = lengths >= 4
+        if not kept.any():
+            return None
+        kept_lengths = lengths[kept]
+        rings = shapely.linearrings(
+            coordinates[np.repeat(kept, lengths)],
+            indices=np.repeat(np.arange(len(kept_lengths)), kept_lengths))
+        polygons = shapely.polygons(rings)
+        polygons = polygons[shapely.is_valid(polygons) & ~shapely.is_empty(polygons)]
+        if not len(polygons):
+            return None
+        return shapely.to_wkt(shapely.multipolygons(polygons), rounding_precision=-1)
+
+    @staticmethod
+    def split_rings(coordinates, offsets: np.ndarray) -> List[Any]:
+        """
+        Split the coordinates of consecutive rings at the given offsets.
 
-        :param index: The index of the vertex.
-        :param vertices: List of vertices.
-        :param scale: The scale factors.
-        :param translate: The translation factors.
-        :return: Transformed vertex.
+        :param coordinates: Coordinates of all the rings one after another, as an array or a list.
+        :param offsets: The offsets of the rings, see gather_rings.
+        :return: List with the coordinates of every ring.
         """
-        vertex = vertices[index]
-        return (vertex[0] * scale[0] + translate[0], vertex[1] * scale[1] + translate[1], vertex[2] * scale[2] + translate[2])
+        return [coordinates[start:end] for start, end in zip(offsets[:-1], offsets[1:])]
 
-    def point_to_wkt(self, points, vertices, scale, translate):
+    def point_to_wkt(self, points, real_vertices):
         """
         Convert (Multi)points to WKT format.
 
         :param points: List of points.
-        :param vertices: List of vertices.
-        :param scale: The scale factors.
-        :param translate: The translation factors.
-        :return: (Multi)Points in 2D WKT format and (Multi)Points in 3D coordinates in JSON-LD format.
+        :param real_vertices: The transformed vertices.
+        :return: (Multi)Points in 2D WKT format and (Multi)Points in 3D coordinates in JSON-LD format, None if not included.
         """
-        points_as_vertices_3d = [self.get_real_vertex(
-            point, vertices, scale, translate) for point in points]
+        indices = np.asarray(points, dtype=np.intp)
+        points_as_vertices = real_vertices[indices]
         # Convert to 2D by ignoring the Z-coordinate
-        points_as_vertices_2d = [(pt[0], pt[1])
-                                 for pt in points_as_vertices_3d]
-        multi_point = MultiPoint(points_as_vertices_2d)
-        return multi_point.wkt, points_as_vertices_3d
+        multi_point_wkt = MultiPoint(points_as_vertices[:, :2]).wkt if self.include_wkt else None
+        return multi_point_wkt, self.get_points(points_as_vertices, indices).tolist() if self.include_3d_boundaries else None
 
-    def linestring_to_wkt(self, lines, vertices, scale, translate):
+    def linestring_to_wkt(self, lines, real_vertices):
         """
         Convert (Multi)Linestrings to WKT format.
 
         :param lines: List of Lines.
-        :param vertices: List of vertices.
-        :param scale: The scale factors.
-        :param translate: The translation factors.
-        :return: (Multi)Linestrings in WKT format and (Multi)LineStrings in 3D coordinates in JSON-LD format.
+        :param real_vertices: The transformed vertices.
+        :return: (Multi)Linestrings in WKT format and (Multi)LineStrings in 3D coordinates in JSON-LD format, None if not included.
         """
-        lines_as_vertices_3d = [[self.get_real_vertex(
-            point, vertices, scale, translate) for point in line] for line in lines]
+        coordinates, offsets, indices = self.gather_rings(lines, real_vertices)
+        lines_as_vertices_3d = self.split_rings(self.get_points(coordinates, indices).tolist(), offsets) \
+            if self.include_3d_boundaries else None
+        if not self.include_wkt:
+            return None, lines_as_vertices_3d
         # Convert to 2D by ignoring the Z-coordinate
-        lines_as_vertices_2d = [[(pt[0], pt[1]) for pt in line]
-                                for line in lines_as_vertices_3d]
+        lines_as_vertices_2d = self.split_rings(coordinates[:, :2], offsets)
         multi_line = MultiLineString(lines_as_vertices_2d)
         return multi_line.wkt, lines_as_vertices_3d
 
-    def multi_surface_to_wkt(self, surfaces, vertices, scale, translate):
+    def multi_surface_to_wkt(self, surfaces, real_vertices):
         """
         Convert multi-surfaces to WKT format.
 
         :param surfaces: List of surfaces.
-        :param vertices: List of vertices.
-        :param scale: The scale factors.
-        :param translate: The translation factors.
-        :return: MultiSurfaces in WKT format and MultiSurfaces in 3D coordinates in JSON-LD format.
+        :param real_vertices: The transformed vertices.
+        :return: MultiSurfaces in WKT format and MultiSurfaces in 3D coordinates in JSON-LD format, None if not included.
         """
-        surfaces_as_vertices_3d = []
-        polygons = []
+        # Ensure the rings are closed
+        coordinates, offsets, indices = self.gather_rings(
+            self.flatten_rings(surfaces, 3), real_vertices, close=True)
+        surfaces_3d = self.nest_rings(surfaces, 3, iter(self.split_rings(self.get_points(coordinates, indices).tolist(), offsets))) \
+            if self.include_3d_boundaries else None
+        if not self.include_wkt:
+            return None, surfaces_3d
+        # Convert to 2D by ignoring the Z-coordinate
+        rings_2d = iter(self.split_rings(coordinates[:, :2], offsets))
 
+        polygons = []
         for surface in surfaces:
-            exterior_ring = [self.get_real_vertex(
-                idx, vertices, scale, translate) for idx in surface[0]]
-            interior_rings = [[self.get_real_vertex(
-                idx, vertices, scale, translate) for idx in ring] for ring in surface[1:]]
-
-            # Ensure the rings are closed
-            if exterior_ring[0] != exterior_ring[-1]:
-                exterior_ring.append(exterior_ring[0])
-            for ring in interior_rings:
-                if ring[0] != ring[-1]:
-                    ring.append(ring[0])
-
-            # Convert to 2D by ignoring the Z-coordinate
-            exterior_ring_2d = [(pt[0], pt[1]) for pt in exterior_ring]
-            interior_rings_2d = [[(pt[0], pt[1]) for pt in ring]
-                                 for ring in interior_rings]
-
-            polygon = Polygon(exterior_ring_2d, interior_rings_2d)
-            polygons.append(polygon)
-            surfaces_as_vertices_3d.append([exterior_ring] + interior_rings)
+            exterior_ring_2d = next(rings_2d)
+            interior_rings_2d = [next(rings_2d) for _ in surface[1:]]
+            polygons.append(Polygon(exterior_ring_2d, interior_rings_2d))
 
         multi_polygon = MultiPolygon(polygons)
-        return multi_polygon.wkt, surfaces_as_vertices_3d
+        return multi_polygon.wkt, surfaces_3d
 
-    def solid_to_wkt(self, solid, vertices, scale, translate):
+    def solid_to_wkt(self, solid, real_vertices):
         """
         Convert an array of multisurfaces (3D solid) to 2D WKT format by projection.
 
         :param solid: Array of multisurfaces.
-        :param vertices: List of vertices.
-        :param scale: The scale factors.
-        :param translate: The translation factors.
-        :return: Solids in WKT format and Solids in 3D coordinates in JSON-LD format.
-        """
-        all_polygons = []
-        all_shells_3d = []
-
-        for shell in solid:
-            shell_3d = []
-            for surface in shell:
-                surface_3d = []
-                for boundary in surface:
-                    surface_3d.append([self.get_real_vertex(
-                        idx, vertices, scale, translate) for idx in boundary])
-                shell_3d.append(surface_3d)
-            all_shells_3d.append(shell_3d)
-
-            for surface in shell_3d:
-                for boundary in surface:
-                    if len(boundary) >= 3:
-                        # polygon = Polygon([(pt[0], pt[1]) for pt in boundary]).convex_hull
-                        polygon = Polygon([(pt[0], pt[1]) for pt in boundary])
-                        # if polygon.is_valid and not polygon.is_empty:
-                        if polygon.is_valid and not polygon.is_empty and isinstance(polygon, Polygon):
-                            all_polygons.append(polygon)
-
-        # multipolygon = MultiPolygon(all_polygons).convex_hull
-        multipolygon = MultiPolygon(all_polygons)
-        return multipolygon.wkt, all_shells_3d
-
-    def multi_solid_to_wkt(self, multi_solid, vertices, scale, translate):
+        :param real_vertices: The transformed vertices.
+        :return: Solids in WKT format and Solids in 3D coordinates in JSON-LD format, None if not included.
+        """
+        coordinates, offsets, indices = self.gather_rings(
+            self.flatten_rings(solid, 4), real_vertices)
+        all_shells_3d = self.nest_rings(
+            solid, 4, iter(self.split_rings(self.get_points(coordinates, indices).tolist(), offsets))) if self.include_3d_boundaries else None
+        if not self.include_wkt:
+            return None, all_shells_3d
+
+        multipolygon_wkt = self.projected_faces_to_wkt(coordinates, offsets)
+        return multipolygon_wkt or "MULTIPOLYGON EMPTY", all_shells_3d
+
+    def multi_solid_to_wkt(self, multi_solid, real_vertices):
         """
         Convert an array of multi-solids to 2D WKT format by projection.
 
         :param multi_solid: Array of multi-solids.
-        :param vertices: List of vertices.
-        :param scale: The scale factors.
-        :param translate: The translation factors.
-        :return: MultiSolids in WKT format and MultiSolids in 3D coordinates in JSON-LD format.
-        """
-        all_polygons = []
-        all_solids_3d = []
-
-        for solid in multi_solid:
-            solid_3d = []
-            for shell in solid:
-                shell_3d = []
-                for surface in shell:
-                    surface_3d = []
-                    for boundary in surface:
-                        surface_3d.append([self.get_real_vertex(
-                            idx, vertices, scale, translate) for idx in boundary])
-                    shell_3d.append(surface_3d)
-                solid_3d.append(shell_3d)
-            all_solids_3d.append(solid_3d)
-
-            for shell in solid_3d:
-                for surface in shell:
-                    for boundary in surface:
-                        if len(boundary) >= 3:
-                            polygon = Polygon([(pt[0], pt[1])
-                                            for pt in boundary])
-                            if polygon.is_valid and not polygon.is_empty:
-                                all_polygons.append(polygon)
-
-        if all_polygons:
-            multipolygon = MultiPolygon(all_polygons)  # Using all_polygons directly
-            return multipolygon.wkt, all_solids_3d
-
-        return None, all_solids_3d
-
-    def to_wkt(self, boundaries, vertices, scale, translate):
+        :param real_vertices: The transformed vertices.
+        :return: MultiSolids in WKT format and MultiSolids in 3D coordinates in JSON-LD format, None if not included.
+        """
+        coordinates, offsets, indices = self.gather_rings(
+            self.flatten_rings(multi_solid, 5), real_vertices)
+        all_solids_3d = self.nest_rings(
+            multi_solid, 5, iter(self.split_rings(self.get_points(coordinates, indices).tolist(), offsets))) if self.include_3d_boundaries else None
+        if not self.include_wkt:
+            return None, all_solids_3d
+
+        return self.projected_faces_to_wkt(coordinates, offsets), all_solids_3d
+
+    def to_wkt(self, boundaries, real_vertices):
         """
         Convert the cityJSON geometry boundaries to WKT format.
 
         :param boundaries: The boundaries of the geometric object.
-        :param vertices: The vertices of the geometric object.
-        :param scale: The scale factors.
-        :param translate: The translation factors.
-        :return: Boundaries in WKT format.
+        :param real_vertices: The transformed vertices.
+        :return: Boundaries in WKT format, None if not included.
         """
         if self.type == "MultiPoint":
             multi_point_wkt, multi_point_3d = self.point_to_wkt(
-                boundaries, vertices, scale, translate)
-            self.boundingBox = CjMultiPoint(multi_point_3d)
+                boundaries, real_vertices)
+            if self.include_3d_boundaries:
+                self.boundingBox = CjMultiPoint(multi_point_3d, self.compact_coordinates, self.vertex_prefix)
             return multi_point_wkt
 
         elif self.type == "MultiLineString":
             multi_linestring_wkt, multi_linestring_3d = self.linestring_to_wkt(
-                boundaries, vertices, scale, translate)
-            self.boundingBox = CjMultiLineString(multi_linestring_3d)
+                boundaries, real_vertices)
+            if self.include_3d_boundaries:
+                self.boundingBox = CjMultiLineString(multi_linestring_3d, self.compact_coordinates, self.vertex_prefix)
             return multi_linestring_wkt
 
         elif self.type in ["MultiSurface", "CompositeSurface"]:
             multi_surface_composite_wkt, multi_surface_composite_3d = self.multi_surface_to_wkt(
-                boundaries, vertices, scale, translate)
-            self.boundingBox = CjMultiCompositeSurface(
-                multi_surface_composite_3d, self.type)
+                boundaries, real_vertices)
+            if self.include_3d_boundaries:
+                self.boundingBox = CjMultiCompositeSurface(
+                    multi_surface_composite_3d, self.type, self.compact_coordinates, self.vertex_prefix)
             return multi_surface_composite_wkt
 
         elif self.type == "Solid":
             solid_wkt, solid_3d = self.solid_to_wkt(
-                boundaries, vertices, scale, translate)
-            self.boundingBox = CjSolid(solid_3d)
+                boundaries, real_vertices)
+            if self.include_3d_boundaries:
+                self.boundingBox = CjSolid(solid_3d, self.compact_coordinates, self.vertex_prefix)
             return solid_wkt
 
         elif self.type in ["MultiSolid", "CompositeSolid"]:
             multi_composite_solid_wkt, multi_composite_solid_3d = self.multi_solid_to_wkt(
-                boundaries, vertices, scale, translate)
-            self.boundingBox = CjMultiCompositeSolid(multi_composite_solid_3d, self.type)
+                boundaries, real_vertices)
+            if self.include_3d_boundaries:
+                self.boundingBox = CjMultiCompositeSolid(
+                    multi_composite_solid_3d, self.type, self.compact_coordinates, self.vertex_prefix)
             return multi_composite_solid_wkt
 
     def to_json(self):
@@ -242,15 +364,18 @@ class Geometry:
 
         :return: JSON-LD representation of the Geometry object.
         """
+        wkt, bounding_box_json = self.convert()
         data = {
             "@type": "cj:Geometry",
             "cj:type": self.type,
-            "cj:lod": self.lod,
-            "geosparql:asWKT": {
-                "@value": self.boundaries,
-                "@type": "geosparql:wktLiteral"
-            },
-            "cj:hasBoundingBox": self.boundingBox.to_json()
+            "cj:lod": self.lod
         }
+        if self.include_wkt:
+            data["geosparql:asWKT"] = {
+                "@value": wkt,
+                "@type": "geosparql:wktLiteral"
+            }
+        if self.include_3d_boundaries:
+            data["cj:hasBoundingBox"] = bounding_box_json
 
         return data
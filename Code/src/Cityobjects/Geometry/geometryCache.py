@@ -0,0 +1,83 @@
+import json
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class GeometryCache:
+    """
+    A class to reuse the conversion of geometries with identical boundaries, with a bounded LRU eviction.
+
+    The entries are keyed by the geometry type, the boundaries (vertex indices) and a key identifying the
+    vertices the indices refer to, usually the transform of the file. They hold the WKT and the JSON-LD
+    representation of the bounding box of the geometry.
+
+    Arguments:
+        max_size (int): Maximum number of geometries kept, the least recently used one is evicted first.
+        vertices_key (Hashable): Key of the vertices the boundaries refer to, see get_vertices_key.
+    """
+
+    def __init__(self, max_size: int, vertices_key: Hashable = None):
+        if max_size < 1:
+            raise ValueError("max_size value must be at least 1")
+        self.max_size = max_size
+        self.vertices_key = vertices_key
+        self.entries: "OrderedDict[Tuple[str, str, Hashable], Tuple[Optional[str], Dict[str, Any]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def get_vertices_key(scale, translate) -> Tuple[Tuple[float, ...], Tuple[float, ...]]:
+        """
+        Get the key of vertices transformed with the given scale and translate.
+
+        :param scale: The scale of the transform.
+        :param translate: The translate of the transform.
+        :return: The key of the vertices.
+        """
+        return tuple(scale), tuple(translate)
+
+    def get_key(self, type: str, boundaries) -> Tuple[str, str, Hashable]:
+        """
+        Get the key of a geometry.
+
+        :param type: The type of the geometric object.
+        :param boundaries: The boundaries of the geometric object.
+        :return: The key of the geometry.
+        """
+        return type, json.dumps(boundaries, separators=(",", ":")), self.vertices_key
+
+    def get(self, key: Tuple[str, str, Hashable]) -> Optional[Tuple[Optional[str], Dict[str, Any]]]:
+        """
+        Get a converted geometry and count the hit or miss.
+
+        :param key: The key of the geometry, see get_key.
+        :return: The WKT and the JSON-LD representation of the bounding box, or None if not cached.
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: Tuple[str, str, Hashable], wkt: Optional[str], bounding_box: Dict[str, Any]):
+        """
+        Add a converted geometry, evicting the least recently used one when the cache is full.
+
+        :param key: The key of the geometry, see get_key.
+        :param wkt: The WKT of the geometry.
+        :param bounding_box: The JSON-LD representation of the bounding box of the geometry.
+        """
+        self.entries[key] = (wkt, bounding_box)
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get the hit and miss counters of the cache.
+
+        :return: Number of hits, misses and cached geometries.
+        """
+        return {"hits": self.hits, "misses": self.misses, "size": len(self.entries)}
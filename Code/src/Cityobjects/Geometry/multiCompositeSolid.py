@@ -1,8 +1,9 @@
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple, Dict, Any, Optional
+from Cityobjects.Geometry.points import points_to_json
 
 
 class MultiCompositeSolid:
-    def __init__(self, solids: List[List[List[List[List[Tuple[float, float, float]]]]]], type: str):
+    def __init__(self, solids: List[List[List[List[List[Tuple[float, float, float]]]]]], type: str, compact: bool = False, vertex_prefix: Optional[str] = None):
         """
         Initialize the MultiSolid object with the list of Solids.
 
@@ -11,9 +12,13 @@ class MultiCompositeSolid:
                        each multisurface is a list of boundaries,
                        and each boundary is a list of vertex coordinates (List of floats).
         :param type: The type of the multi-solid object, either 'MultiSolid' or 'CompositeSolid'.
+        :param compact: Flag to encode the points as a JSON literal of coordinate arrays, see points_to_json.
+        :param vertex_prefix: Prefix of the IRIs of the vertices to refer to instead of coordinates, see points_to_json.
         """
         self.solids = solids
         self.type = type
+        self.compact = compact
+        self.vertex_prefix = vertex_prefix
 
     def to_json(self) -> Dict[str, Any]:
         """
@@ -46,14 +51,7 @@ class MultiCompositeSolid:
                             "cj:hasLineString": [
                                 {
                                     "@type": "cj:LineString",
-                                    "cj:hasPoint": [
-                                        {
-                                            "@type": "cj:Point",
-                                            "cj:boundaryX": {"@value": point[0], "@type": "xsd:float"},
-                                            "cj:boundaryY": {"@value": point[1], "@type": "xsd:float"},
-                                            "cj:boundaryZ": {"@value": point[2], "@type": "xsd:float"}
-                                        } for point in line
-                                    ]
+                                    **points_to_json(line, self.compact, self.vertex_prefix)
                                 } for line in multisurface
                             ]
                         }
@@ -69,14 +67,7 @@ class MultiCompositeSolid:
                                 "cj:hasLineString": [
                                     {
                                         "@type": "cj:LineString",
-                                        "cj:hasPoint": [
-                                            {
-                                                "@type": "cj:Point",
-                                                "cj:boundaryX": {"@value": point[0], "@type": "xsd:float"},
-                                                "cj:boundaryY": {"@value": point[1], "@type": "xsd:float"},
-                                                "cj:boundaryZ": {"@value": point[2], "@type": "xsd:float"}
-                                            } for point in line
-                                        ]
+                                        **points_to_json(line, self.compact, self.vertex_prefix)
                                     }
                                 ]
                             })
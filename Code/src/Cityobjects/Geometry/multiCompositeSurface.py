@@ -1,16 +1,21 @@
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple, Dict, Any, Optional
+from Cityobjects.Geometry.points import points_to_json
 
 
 class MultiCompositeSurface:
-    def __init__(self, surfaces: List[List[Tuple[float, float, float]]], surface_type: str):
+    def __init__(self, surfaces: List[List[Tuple[float, float, float]]], surface_type: str, compact: bool = False, vertex_prefix: Optional[str] = None):
         """
         Initialize the MultiSurface object with the list of surfaces and type.
 
         :param surfaces: List of surfaces, where each surface is a list of vertex coordinates (List of floats).
         :param surface_type: Type of the surface (e.g., MultiSurface, CompositeSurface).
+        :param compact: Flag to encode the points as a JSON literal of coordinate arrays, see points_to_json.
+        :param vertex_prefix: Prefix of the IRIs of the vertices to refer to instead of coordinates, see points_to_json.
         """
         self.surfaces = surfaces
         self.surface_type = surface_type
+        self.compact = compact
+        self.vertex_prefix = vertex_prefix
 
     def to_json(self) -> Dict[str, Any]:
         """
@@ -31,14 +36,7 @@ class MultiCompositeSurface:
                     "cj:hasLineString": [
                         {
                             "@type": "cj:LineString",
-                            "cj:hasPoint": [
-                                {
-                                    "@type": "cj:Point",
-                                    "cj:boundaryX": {"@value": point[0], "@type": "xsd:float"},
-                                    "cj:boundaryY": {"@value": point[1], "@type": "xsd:float"},
-                                    "cj:boundaryZ": {"@value": point[2], "@type": "xsd:float"}
-                                } for point in line
-                            ]
+                            **points_to_json(line, self.compact, self.vertex_prefix)
                         } for line in surface
                     ]
                 }
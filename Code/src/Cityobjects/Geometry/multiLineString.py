@@ -1,14 +1,19 @@
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple, Dict, Any, Optional
+from Cityobjects.Geometry.points import points_to_json
 
 
 class MultiLineString:
-    def __init__(self, lines: List[List[Tuple[float, float, float]]]):
+    def __init__(self, lines: List[List[Tuple[float, float, float]]], compact: bool = False, vertex_prefix: Optional[str] = None):
         """
         Initialize the MultiLineString object with a list of lines.
 
         :param lines: List of lines, where each line is a list representing points [x, y, z].
+        :param compact: Flag to encode the points as a JSON literal of coordinate arrays, see points_to_json.
+        :param vertex_prefix: Prefix of the IRIs of the vertices to refer to instead of coordinates, see points_to_json.
         """
         self.lines = lines
+        self.compact = compact
+        self.vertex_prefix = vertex_prefix
 
     def to_json(self) -> Dict[str, Any]:
         """
@@ -21,23 +26,7 @@ class MultiLineString:
             "cj:hasLineString": [
                 {
                     "@type": "cj:LineString",
-                    "cj:hasPoint": [
-                        {
-                            "@type": "cj:Point",
-                            "cj:boundaryX": {
-                                "@value": point[0],
-                                "@type": "xsd:float"
-                            },
-                            "cj:boundaryY": {
-                                "@value": point[1],
-                                "@type": "xsd:float"
-                            },
-                            "cj:boundaryZ": {
-                                "@value": point[2],
-                                "@type": "xsd:float"
-                            }
-                        } for point in line
-                    ]
+                    **points_to_json(line, self.compact, self.vertex_prefix)
                 } for line in self.lines
             ]
         }
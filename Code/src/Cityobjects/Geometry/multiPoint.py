@@ -1,14 +1,19 @@
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple, Dict, Any, Optional
+from Cityobjects.Geometry.points import points_to_json
 
 
 class MultiPoint:
-    def __init__(self, points: List[Tuple[float, float, float]]):
+    def __init__(self, points: List[Tuple[float, float, float]], compact: bool = False, vertex_prefix: Optional[str] = None):
         """
         Initialize the MultiPoint object with a list of points.
 
         :param points: List of points, where each point is a List of floats [x, y, z].
+        :param compact: Flag to encode the points as a JSON literal of coordinate arrays, see points_to_json.
+        :param vertex_prefix: Prefix of the IRIs of the vertices to refer to instead of coordinates, see points_to_json.
         """
         self.points = points
+        self.compact = compact
+        self.vertex_prefix = vertex_prefix
 
     def to_json(self) -> Dict[str, Any]:
         """
@@ -18,22 +23,6 @@ class MultiPoint:
         """
         data = {
             "@type": "cj:MultiPoint",
-            "cj:hasPoint": [
-                {
-                    "@type": "cj:Point",
-                    "cj:boundaryX": {
-                        "@value": point[0],
-                        "@type": "xsd:float"
-                    },
-                    "cj:boundaryY": {
-                        "@value": point[1],
-                        "@type": "xsd:float"
-                    },
-                    "cj:boundaryZ": {
-                        "@value": point[2],
-                        "@type": "xsd:float"
-                    }
-                } for point in self.points
-            ]
+            **points_to_json(self.points, self.compact, self.vertex_prefix)
         }
         return data
@@ -0,0 +1,39 @@
+from typing import List, Tuple, Dict, Any, Optional, Union
+
+
+def points_to_json(points: List[Union[Tuple[float, float, float], int]], compact: bool = False, vertex_prefix: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Convert the points of a LineString or a MultiPoint to their JSON-LD properties.
+
+    :param points: List of points, where each point is a List of floats [x, y, z], or the vertex index of every
+        point if vertex_prefix is given.
+    :param compact: Flag to encode the points as a single JSON literal of coordinate arrays instead of one
+        Point node per coordinate.
+    :param vertex_prefix: Prefix of the IRIs of the vertices, e.g. "v:", to refer to the vertices of the
+        CityJSON node ("cj:hasVertices") in order instead of repeating their coordinates.
+    :return: The "cj:hasPoint", compact the "cj:hasCoordinates" or, with vertex_prefix, the "cj:hasVertex"
+        property of the points.
+    """
+    if vertex_prefix is not None:
+        return {
+            "cj:hasVertex": {
+                "@list": [{"@id": f"{vertex_prefix}{index}"} for index in points]
+            }
+        }
+    if compact:
+        return {
+            "cj:hasCoordinates": {
+                "@type": "@json",
+                "@value": points
+            }
+        }
+    return {
+        "cj:hasPoint": [
+            {
+                "@type": "cj:Point",
+                "cj:boundaryX": {"@value": point[0], "@type": "xsd:float"},
+                "cj:boundaryY": {"@value": point[1], "@type": "xsd:float"},
+                "cj:boundaryZ": {"@value": point[2], "@type": "xsd:float"}
+            } for point in points
+        ]
+    }
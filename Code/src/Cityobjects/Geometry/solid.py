@@ -1,16 +1,21 @@
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple, Dict, Any, Optional
+from Cityobjects.Geometry.points import points_to_json
 
 
 class Solid:
-    def __init__(self, shells: List[List[List[List[Tuple[float, float, float]]]]]):
+    def __init__(self, shells: List[List[List[List[Tuple[float, float, float]]]]], compact: bool = False, vertex_prefix: Optional[str] = None):
         """
         Initialize the Solid object with the list of shells.
 
         :param shells: List of shells, where each shell is a list of multisurfaces,
                        each multisurface is a list of boundaries, and each boundary 
                        is a list of vertex coordinates (List of floats).
+        :param compact: Flag to encode the points as a JSON literal of coordinate arrays, see points_to_json.
+        :param vertex_prefix: Prefix of the IRIs of the vertices to refer to instead of coordinates, see points_to_json.
         """
         self.shells = shells
+        self.compact = compact
+        self.vertex_prefix = vertex_prefix
 
     def to_json(self) -> Dict[str, Any]:
         """
@@ -38,14 +43,7 @@ class Solid:
                         "cj:hasLineString": [
                             {
                                 "@type": "cj:LineString",
-                                "cj:hasPoint": [
-                                    {
-                                        "@type": "cj:Point",
-                                        "cj:boundaryX": {"@value": point[0], "@type": "xsd:float"},
-                                        "cj:boundaryY": {"@value": point[1], "@type": "xsd:float"},
-                                        "cj:boundaryZ": {"@value": point[2], "@type": "xsd:float"}
-                                    } for point in line
-                                ]
+                                **points_to_json(line, self.compact, self.vertex_prefix)
                             } for line in multisurface
                         ]
                     }
@@ -1,7 +1,7 @@
-import json
 from typing import List, Dict, Any, Optional, Union
 from Metadata.geographicalExtent import GeographicalExtent
 from Cityobjects.Geometry.geometry import Geometry
+from Cityobjects.Geometry.extentGeometries import ExtentGeometries
 
 
 class SecondLevelCityObject:
@@ -23,7 +23,7 @@ class SecondLevelCityObject:
                    "TunnelInstallation",
                    "TunnelPart"]
 
-    def __init__(self, alias: str, id: str, type: str, parent: str, geometry: Optional[List[Geometry]], geographical_extent: Optional[GeographicalExtent] = None, attributes: Optional[Union[Dict[str, Any], str]] = None, children: Optional[List[str]] = None):
+    def __init__(self, alias: str, id: str, type: str, parent: str, geometry: Optional[List[Geometry]], geographical_extent: Optional[GeographicalExtent] = None, attributes: Optional[Union[Dict[str, Any], str]] = None, children: Optional[List[str]] = None, extent_geometries: Optional[ExtentGeometries] = None):
         """
         Initialize the SecondLevelCityObject with the given parameters.
 
@@ -35,6 +35,7 @@ class SecondLevelCityObject:
         :param geographical_extent: GeographicalExtent object or None.
         :param attributes: Dictionary of attributes or None.
         :param children: List of children identifiers or None.
+        :param extent_geometries: ExtentGeometries object enclosing the geometries, or None.
         """
         self.alias = alias
         self.id = id
@@ -46,10 +47,11 @@ class SecondLevelCityObject:
         self.parent = parent[0]
         self.geographical_extent = GeographicalExtent.to_geographical_extent(
             geographical_extent)
-        self.attributes = json.dumps(attributes) if attributes else None
+        self.attributes = attributes if attributes else None
         self.children = children
-        self.geometry = [geom.to_json()
-                         for geom in geometry] if geometry else None
+        # The geometries are only converted in to_json
+        self.geometry = geometry if geometry else None
+        self.extent_geometries = extent_geometries
 
     def to_json(self) -> Dict[str, Any]:
         """
@@ -57,11 +59,10 @@ class SecondLevelCityObject:
 
         :return: JSON-LD representation of the SecondLevelCityObject.
         """
-        geometry = self.geometry if self.geometry else None
-        geographical_extent_dict = json.loads(
-            self.geographical_extent.to_json()) if self.geographical_extent else None
-        attributes_dict = json.loads(
-            self.attributes) if self.attributes else None
+        geometry = [geom.to_json() for geom in self.geometry] if self.geometry else None
+        extent_geometries = self.extent_geometries.to_json() if self.extent_geometries else None
+        geographical_extent_dict = self.geographical_extent.to_json() if self.geographical_extent else None
+        attributes_dict = self.attributes if self.attributes else None
         children_list = [{"@id": f'{self.alias}:{child}'}
                          for child in self.children] if self.children else None
 
@@ -77,7 +78,8 @@ class SecondLevelCityObject:
                 "@type": "@json",
                 "@value": attributes_dict
             },
-            "cj:hasGeometry": geometry
+            "cj:hasGeometry": geometry,
+            "geosparql:hasGeometry": extent_geometries
         }
 
         # Add "cj:hasChildren" only if there are children
@@ -0,0 +1,51 @@
+import numpy as np
+from typing import Dict, Any, Optional, Union
+from Cityobjects.firstLevelCityObject import FirstLevelCityObject
+from Cityobjects.SecondLevelCityObject import SecondLevelCityObject
+from Cityobjects.Geometry.geometry import Geometry
+from Cityobjects.Geometry.geometryCache import GeometryCache
+from Cityobjects.Geometry.extentGeometries import ExtentGeometries
+from Vertices.vertices import Vertices
+
+
+def to_cityobject(alias: str, cityobject_id: str, cityobject: Dict[str, Any], real_vertices: np.ndarray, geometry_cache: Optional[GeometryCache] = None, compact_coordinates: bool = False, include_wkt: bool = True, include_3d_boundaries: bool = True, vertex_references: bool = False, include_envelope: bool = False, include_convex_hull: bool = False) -> Union[FirstLevelCityObject, SecondLevelCityObject]:
+    """
+    Convert a CityJSON CityObject to a FirstLevelCityObject or a SecondLevelCityObject.
+
+    :param alias: Alias for the city object.
+    :param cityobject_id: Identifier of the city object in the CityJSON "CityObjects" member.
+    :param cityobject: The CityObject as found in the CityJSON file.
+    :param real_vertices: The transformed vertices the geometry boundaries refer to, see Transform.to_real_vertices.
+    :param geometry_cache: Cache of converted geometries, optional.
+    :param compact_coordinates: Flag to encode the points of the bounding boxes as JSON literals of coordinate arrays.
+    :param include_wkt: Flag to include the 2D boundaries of the geometries in WKT format.
+    :param include_3d_boundaries: Flag to include the 3D boundaries of the geometries as bounding boxes.
+    :param vertex_references: Flag to refer to the vertices by IRI in the bounding boxes instead of repeating their coordinates.
+    :param include_envelope: Flag to include the 2D envelope of the city objects as an extra geometry.
+    :param include_convex_hull: Flag to include the 2D convex hull of the city objects as an extra geometry.
+    :return: FirstLevelCityObject or SecondLevelCityObject.
+    """
+    type = cityobject["type"]
+    geographical_extent = cityobject.get("geographicalExtent")
+    attributes = cityobject.get("attributes")
+    children = cityobject.get("children")
+
+    if "geometry" in cityobject:
+        vertex_prefix = Vertices.get_vertex_prefix() if vertex_references else None
+        geometry = [Geometry(geom["type"], geom["lod"], geom["boundaries"], real_vertices, geometry_cache, compact_coordinates,
+                             include_wkt, include_3d_boundaries, vertex_prefix)
+                    for geom in cityobject["geometry"]]
+        extent_geometries = ExtentGeometries(cityobject["geometry"], real_vertices, include_envelope, include_convex_hull) \
+            if include_envelope or include_convex_hull else None
+    else:
+        geometry = extent_geometries = None
+
+    if type in FirstLevelCityObject.type_values:
+        return FirstLevelCityObject(
+            alias, cityobject_id, type, geometry, geographical_extent, attributes, children, extent_geometries)
+
+    parents = cityobject.get("parents")
+    if not parents:
+        raise AttributeError("cityobject does not have 'parents' attribute")
+    return SecondLevelCityObject(
+        alias, cityobject_id, type, parents, geometry, geographical_extent, attributes, children, extent_geometries)
@@ -0,0 +1,28 @@
+from itertools import chain
+from typing import Any, Dict, List
+
+
+def group_families(cityobjects: Dict[str, Any]) -> List[List[str]]:
+    """
+    Group the CityObjects linked by "parents" or "children", keeping their order.
+
+    :param cityobjects: CityObjects by identifier, as the "CityObjects" member of the CityJSON file.
+    :return: List of families, each a list of CityObject identifiers.
+    """
+    roots: Dict[str, str] = {}
+
+    def find(id: str) -> str:
+        roots.setdefault(id, id)
+        while roots[id] != id:
+            roots[id] = roots[roots[id]]
+            id = roots[id]
+        return id
+
+    for cityobject_id, cityobject in cityobjects.items():
+        for related_id in chain(cityobject.get("parents", []), cityobject.get("children", [])):
+            roots[find(related_id)] = find(cityobject_id)
+
+    families: Dict[str, List[str]] = {}
+    for cityobject_id in cityobjects:
+        families.setdefault(find(cityobject_id), []).append(cityobject_id)
+    return list(families.values())
@@ -1,6 +1,6 @@
-import json
 from typing import List, Dict, Any, Optional, Union
 from Cityobjects.Geometry.geometry import Geometry
+from Cityobjects.Geometry.extentGeometries import ExtentGeometries
 from Metadata.geographicalExtent import GeographicalExtent
 
 
@@ -22,7 +22,7 @@ class FirstLevelCityObject:
                    "WaterBody",
                    "Waterway"]
 
-    def __init__(self, alias: str, id: str, type: str, geometry: Optional[List[Geometry]], geographical_extent: Optional[GeographicalExtent] = None, attributes: Optional[Union[Dict[str, Any], str]] = None, children: Optional[List[str]] = None):
+    def __init__(self, alias: str, id: str, type: str, geometry: Optional[List[Geometry]], geographical_extent: Optional[GeographicalExtent] = None, attributes: Optional[Union[Dict[str, Any], str]] = None, children: Optional[List[str]] = None, extent_geometries: Optional[ExtentGeometries] = None):
         """
         Initialize the FirstLevelCityObject with the given parameters.
 
@@ -33,6 +33,7 @@ class FirstLevelCityObject:
         :param geographical_extent: GeographicalExtent object or None.
         :param attributes: Dictionary of attributes or None.
         :param children: List of children identifiers or None.
+        :param extent_geometries: ExtentGeometries object enclosing the geometries, or None.
         """
         self.alias = alias
         self.id = id
@@ -45,8 +46,9 @@ class FirstLevelCityObject:
             geographical_extent)
         self.attributes = attributes
         self.children = children
-        self.geometry = [geom.to_json()
-                         for geom in geometry] if geometry else None
+        # The geometries are only converted in to_json
+        self.geometry = geometry if geometry else None
+        self.extent_geometries = extent_geometries
 
     def to_json(self) -> Dict[str, Any]:
         """
@@ -55,9 +57,9 @@ class FirstLevelCityObject:
         :return: JSON-LD representation of the FirstLevelCityObject.
         """
 
-        geometry = self.geometry if self.geometry else None
-        geographical_extent_dict = json.loads(
-            self.geographical_extent.to_json()) if self.geographical_extent else None
+        geometry = [geom.to_json() for geom in self.geometry] if self.geometry else None
+        extent_geometries = self.extent_geometries.to_json() if self.extent_geometries else None
+        geographical_extent_dict = self.geographical_extent.to_json() if self.geographical_extent else None
 
         # Check if self.attributes is None
         if not self.attributes:
@@ -78,7 +80,8 @@ class FirstLevelCityObject:
                 "@type": "@json",
                 "@value": attributes_dict
             },
-            "cj:hasGeometry": geometry
+            "cj:hasGeometry": geometry,
+            "geosparql:hasGeometry": extent_geometries
         }
 
         # Add "cj:hasChildren" only if there are children
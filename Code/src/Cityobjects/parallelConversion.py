@@ -0,0 +1,146 @@
+import math
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from multiprocessing import shared_memory
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Tuple
+import numpy as np
+from Cityobjects.cityObjectFactory import to_cityobject
+from Cityobjects.serializedCityObject import SerializedCityObject
+from Cityobjects.Geometry.geometryCache import GeometryCache
+
+# State of a worker process, set once by init_worker
+worker_alias: Optional[str] = None
+worker_real_vertices: Optional[np.ndarray] = None
+worker_shared_memory: Optional[shared_memory.SharedMemory] = None
+worker_geometry_cache: Optional[GeometryCache] = None
+worker_compact_coordinates = False
+worker_include_wkt = True
+worker_include_3d_boundaries = True
+worker_vertex_references = False
+worker_include_envelope = False
+worker_include_convex_hull = False
+
+# Upper bound of city objects sent to a worker at once
+max_batch_size = 1000
+# Number of batches per worker converted ahead of the batch being written
+max_pending_batches = 2
+
+
+def init_worker(alias: str, shared_memory_name: str, shape: Tuple[int, ...], geometry_cache_size: int = 0, vertices_key: Hashable = None, compact_coordinates: bool = False, include_wkt: bool = True, include_3d_boundaries: bool = True, vertex_references: bool = False, include_envelope: bool = False, include_convex_hull: bool = False):
+    """
+    Initialize a worker process with a view on the transformed vertices in shared memory.
+
+    :param alias: Alias for the city objects.
+    :param shared_memory_name: Name of the shared memory block holding the transformed vertices.
+    :param shape: Shape of the transformed vertices array.
+    :param geometry_cache_size: Size of the geometry cache of the worker, 0 to disable it.
+    :param vertices_key: Key of the transformed vertices in the geometry cache.
+    :param compact_coordinates: Flag to encode the points of the bounding boxes as JSON literals of coordinate arrays.
+    :param include_wkt: Flag to include the 2D boundaries of the geometries in WKT format.
+    :param include_3d_boundaries: Flag to include the 3D boundaries of the geometries as bounding boxes.
+    :param vertex_references: Flag to refer to the vertices by IRI in the bounding boxes instead of repeating their coordinates.
+    :param include_envelope: Flag to include the 2D envelope of the city objects as an extra geometry.
+    :param include_convex_hull: Flag to include the 2D convex hull of the city objects as an extra geometry.
+    """
+    global worker_alias, worker_real_vertices, worker_shared_memory, worker_geometry_cache, worker_compact_coordinates, \
+        worker_include_wkt, worker_include_3d_boundaries, worker_vertex_references, worker_include_envelope, worker_include_convex_hull
+    worker_alias = alias
+    worker_shared_memory = shared_memory.SharedMemory(name=shared_memory_name)
+    worker_real_vertices = np.ndarray(shape, dtype=np.float64, buffer=worker_shared_memory.buf)
+    worker_geometry_cache = GeometryCache(geometry_cache_size, vertices_key) if geometry_cache_size else None
+    worker_compact_coordinates = compact_coordinates
+    worker_include_wkt = include_wkt
+    worker_include_3d_boundaries = include_3d_boundaries
+    worker_vertex_references = vertex_references
+    worker_include_envelope = include_envelope
+    worker_include_convex_hull = include_convex_hull
+
+
+def convert_batch(batch: List[Tuple[str, Dict[str, Any]]]) -> Tuple[List[Dict[str, Any]], int, int]:
+    """
+    Convert a batch of CityObjects in a worker process.
+
+    :param batch: List of CityObject identifiers and CityObjects.
+    :return: JSON-LD representation of every city object of the batch, in the same order, and the
+        number of geometry cache hits and misses of the batch.
+    """
+    cache = worker_geometry_cache
+    hits, misses = (cache.hits, cache.misses) if cache else (0, 0)
+    converted_batch = [to_cityobject(worker_alias, cityobject_key, cityobject, worker_real_vertices, cache,
+                                     worker_compact_coordinates, worker_include_wkt, worker_include_3d_boundaries,
+                                     worker_vertex_references, worker_include_envelope, worker_include_convex_hull).to_json()
+                       for cityobject_key, cityobject in batch]
+    if cache:
+        hits, misses = cache.hits - hits, cache.misses - misses
+    return converted_batch, hits, misses
+
+
+def iter_batches(cityobjects: Dict[str, Any], batch_size: int) -> Iterator[List[Tuple[str, Dict[str, Any]]]]:
+    """
+    Split the CityObjects into batches, keeping their order.
+
+    :param cityobjects: The "CityObjects" member of the CityJSON file.
+    :param batch_size: Number of CityObjects per batch.
+    :return: Iterator over the batches.
+    """
+    items = iter(cityobjects.items())
+    while batch := list(islice(items, batch_size)):
+        yield batch
+
+
+def convert_cityobjects_parallel(alias: str, cityobjects: Dict[str, Any], real_vertices: np.ndarray, workers: int, geometry_cache: Optional[GeometryCache] = None, compact_coordinates: bool = False, include_wkt: bool = True, include_3d_boundaries: bool = True, vertex_references: bool = False, include_envelope: bool = False, include_convex_hull: bool = False) -> Iterator[SerializedCityObject]:
+    """
+    Convert the CityObjects in a pool of worker processes.
+
+    The transformed vertices are copied once into shared memory, which every worker maps instead of
+    receiving a pickled copy. The city objects are yielded in their original order.
+
+    The workers convert the next batches while the city objects of a batch are written, but at most
+    max_pending_batches per worker, so a slower writer holds back the conversion instead of the converted
+    city objects piling up in memory.
+
+    Every worker keeps its own geometry cache of the size of geometry_cache, whose hit and miss counters
+    add up those of the workers.
+
+    :param alias: Alias for the city objects.
+    :param cityobjects: The "CityObjects" member of the CityJSON file.
+    :param real_vertices: The transformed vertices, see Transform.to_real_vertices.
+    :param workers: Number of worker processes.
+    :param geometry_cache: Geometry cache giving the size and vertices key of the caches of the workers, optional.
+    :param compact_coordinates: Flag to encode the points of the bounding boxes as JSON literals of coordinate arrays.
+    :param include_wkt: Flag to include the 2D boundaries of the geometries in WKT format.
+    :param include_3d_boundaries: Flag to include the 3D boundaries of the geometries as bounding boxes.
+    :param vertex_references: Flag to refer to the vertices by IRI in the bounding boxes instead of repeating their coordinates.
+    :param include_envelope: Flag to include the 2D envelope of the city objects as an extra geometry.
+    :param include_convex_hull: Flag to include the 2D convex hull of the city objects as an extra geometry.
+    :return: Iterator over the converted city objects.
+    """
+    # A few batches per worker keeps them busy without sending every object on its own
+    batch_size = max(1, min(max_batch_size, math.ceil(len(cityobjects) / (workers * 4))))
+
+    real_vertices = np.ascontiguousarray(real_vertices, dtype=np.float64)
+    vertices_memory = shared_memory.SharedMemory(create=True, size=max(real_vertices.nbytes, 1))
+    try:
+        np.ndarray(real_vertices.shape, dtype=np.float64, buffer=vertices_memory.buf)[:] = real_vertices
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                 initargs=(alias, vertices_memory.name, real_vertices.shape,
+                                           geometry_cache.max_size if geometry_cache else 0,
+                                           geometry_cache.vertices_key if geometry_cache else None,
+                                           compact_coordinates, include_wkt, include_3d_boundaries,
+                                           vertex_references, include_envelope, include_convex_hull)) as executor:
+            batches = iter_batches(cityobjects, batch_size)
+            pending = deque(executor.submit(convert_batch, batch) for batch in islice(batches, workers * max_pending_batches))
+            while pending:
+                converted_batch, hits, misses = pending.popleft().result()
+                next_batch = next(batches, None)
+                if next_batch is not None:
+                    pending.append(executor.submit(convert_batch, next_batch))
+                if geometry_cache:
+                    geometry_cache.hits += hits
+                    geometry_cache.misses += misses
+                for data in converted_batch:
+                    yield SerializedCityObject(data)
+    finally:
+        vertices_memory.close()
+        vertices_memory.unlink()
@@ -0,0 +1,22 @@
+from typing import Dict, Any
+
+
+class SerializedCityObject:
+    """
+    A class to represent a city object that has already been converted to its JSON-LD representation,
+    for instance by a worker process.
+
+    Arguments:
+        data (Dict[str, Any]): JSON-LD representation of the city object.
+    """
+
+    def __init__(self, data: Dict[str, Any]):
+        self.data = data
+
+    def to_json(self) -> Dict[str, Any]:
+        """
+        Return the JSON-LD representation of the city object.
+
+        :return: JSON-LD representation of the city object.
+        """
+        return self.data
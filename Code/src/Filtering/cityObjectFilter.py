@@ -0,0 +1,231 @@
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+import numpy as np
+from Cityobjects.Geometry.boundaryIndices import boundary_depths, iter_boundary_indices
+from Tiling.tiling import Extent, get_cityobject_extents
+from Transform.transform import Transform
+
+# Number of city objects whose extents are computed at once for the bbox selector
+extent_batch_size = 1000
+
+
+class CityObjectFilter:
+    """
+    A class to select the city objects and geometries to convert, before any Geometry is built.
+
+    A city object is selected when it matches every given selector: its type is one of types, its identifier
+    one of ids, and its 2D extent, see get_cityobject_extents, intersects bbox. The parents of the selected city
+    objects are selected as well, up to the root, so every "cj:hasParent" link is kept, while the children that are
+    not selected are removed from "children". With lods, the geometries of the other LoDs are removed from the
+    selected city objects, which are kept even without any geometry left.
+
+    The vertices are renumbered to keep only the ones the remaining geometries refer to, unless their indices have to
+    be kept, see apply.
+
+    Arguments:
+        lods (Optional[Set[str]]): LoDs of the geometries to keep, None for all.
+        types (Optional[Set[str]]): Types of the city objects to select, None for all.
+        ids (Optional[Set[str]]): Identifiers of the city objects to select, None for all.
+        bbox (Optional[Extent]): 2D extent (min_x, min_y, max_x, max_y) the city objects to select intersect, None for all.
+    """
+
+    def __init__(self, lods: Optional[Iterable[Union[str, float]]] = None, types: Optional[Iterable[str]] = None,
+                 ids: Optional[Iterable[str]] = None, bbox: Optional[Iterable[float]] = None):
+        self.lods = {str(lod) for lod in lods} if lods is not None else None
+        self.types = set(types) if types is not None else None
+        self.ids = set(ids) if ids is not None else None
+        if bbox is not None:
+            bbox = tuple(float(value) for value in bbox)
+            if len(bbox) != 4 or bbox[0] > bbox[2] or bbox[1] > bbox[3]:
+                raise ValueError("bbox value must be min_x, min_y, max_x, max_y with min_x <= max_x and min_y <= max_y")
+        self.bbox: Optional[Extent] = bbox
+
+    @staticmethod
+    def read_ids_file(path: str) -> List[str]:
+        """
+        Read the identifiers of the city objects to select, one per line.
+
+        :param path: Path of the file.
+        :return: The identifiers, without the empty lines.
+        """
+        with open(path, encoding='utf-8') as ids_file:
+            return [line.strip() for line in ids_file if line.strip()]
+
+    def matches(self, cityobject_id: str, cityobject: Dict[str, Any]) -> bool:
+        """
+        Check the type and identifier selectors, the bbox one is checked by get_selected_ids.
+
+        :param cityobject_id: Identifier of the CityObject.
+        :param cityobject: The CityObject as found in the CityJSON file.
+        :return: True if the CityObject matches them.
+        """
+        return (self.types is None or cityobject["type"] in self.types) and (self.ids is None or cityobject_id in self.ids)
+
+    def intersects(self, extent: Optional[Extent]) -> bool:
+        """
+        Check the bbox selector.
+
+        :param extent: 2D extent of a CityObject, None if it has neither geometry nor geographical extent.
+        :return: True if the extent intersects the bbox.
+        """
+        if self.bbox is None:
+            return True
+        if extent is None:
+            return False
+        return extent[0] <= self.bbox[2] and extent[2] >= self.bbox[0] and extent[1] <= self.bbox[3] and extent[3] >= self.bbox[1]
+
+    def get_selected_ids(self, cityobjects: Dict[str, Any], real_vertices: Optional[np.ndarray]) -> Set[str]:
+        """
+        Get the identifiers of the matching CityObjects and of their ancestors, in a single pass over the CityObjects.
+
+        :param cityobjects: The "CityObjects" member of the CityJSON file.
+        :param real_vertices: The transformed vertices, only needed for the bbox selector.
+        :return: The identifiers of the selected CityObjects.
+        """
+        parents: Dict[str, List[str]] = {}
+        matched: List[str] = []
+        candidates: Dict[str, Any] = {}
+        for cityobject_id, cityobject in cityobjects.items():
+            if cityobject.get("parents"):
+                parents[cityobject_id] = cityobject["parents"]
+            if not self.matches(cityobject_id, cityobject):
+                continue
+            if self.bbox is None:
+                matched.append(cityobject_id)
+                continue
+            candidates[cityobject_id] = cityobject
+            if len(candidates) >= extent_batch_size:
+                matched.extend(self.get_intersecting_ids(candidates, real_vertices))
+                candidates = {}
+        if candidates:
+            matched.extend(self.get_intersecting_ids(candidates, real_vertices))
+
+        selected: Set[str] = set()
+        pending = matched
+        while pending:
+            cityobject_id = pending.pop()
+            if cityobject_id not in selected:
+                selected.add(cityobject_id)
+                pending.extend(parents.get(cityobject_id, []))
+        return selected
+
+    def get_intersecting_ids(self, cityobjects: Dict[str, Any], real_vertices: np.ndarray) -> List[str]:
+        """
+        Get the identifiers of the CityObjects whose 2D extent intersects the bbox.
+
+        :param cityobjects: CityObjects matching the other selectors.
+        :param real_vertices: The transformed vertices.
+        :return: The identifiers.
+        """
+        return [cityobject_id for cityobject_id, extent in get_cityobject_extents(cityobjects, real_vertices).items()
+                if self.intersects(extent)]
+
+    def filter_cityobject(self, cityobject: Dict[str, Any], selected: Set[str]) -> Dict[str, Any]:
+        """
+        Remove the geometries of the other LoDs and the children that are not selected from a CityObject.
+
+        :param cityobject: The CityObject as found in the CityJSON file.
+        :param selected: The identifiers of the selected CityObjects.
+        :return: The filtered CityObject, a shallow copy if anything was removed.
+        """
+        filtered = cityobject
+        if self.lods is not None and "geometry" in cityobject:
+            filtered = dict(cityobject)
+            filtered["geometry"] = [geometry for geometry in cityobject["geometry"] if str(geometry.get("lod")) in self.lods]
+            if not filtered["geometry"]:
+                del filtered["geometry"]
+        if cityobject.get("children") and any(child not in selected for child in cityobject["children"]):
+            filtered = dict(filtered)
+            filtered["children"] = [child for child in cityobject["children"] if child in selected]
+            if not filtered["children"]:
+                del filtered["children"]
+        return filtered
+
+    def apply(self, cityobjects: Dict[str, Any], vertices: Union[List[List[int]], np.ndarray], transform: Transform,
+              renumber: bool = True) -> Tuple[Dict[str, Any], np.ndarray]:
+        """
+        Select the CityObjects and their geometries, and keep only the vertices they refer to.
+
+        The CityObjects are iterated twice, so they can be a CityObjectStream as well.
+
+        :param cityobjects: The "CityObjects" member of the CityJSON file.
+        :param vertices: The "vertices" member of the CityJSON file.
+        :param transform: The transform of the file, to compare the vertices with the bbox.
+        :param renumber: Whether to renumber the vertices, False to keep all of them with their original indices, e.g.
+            when the indices are part of the IRIs of the vertices.
+        :return: The selected CityObjects, in their original order, and their vertices, renumbered if renumber is True.
+        """
+        vertices = np.asarray(vertices, dtype=np.int64).reshape(-1, 3)
+        real_vertices = transform.to_real_vertices(vertices) if self.bbox is not None else None
+        selected = self.get_selected_ids(cityobjects, real_vertices)
+        filtered = {cityobject_id: self.filter_cityobject(cityobject, selected)
+                    for cityobject_id, cityobject in cityobjects.items() if cityobject_id in selected}
+        if not renumber:
+            return filtered, vertices
+        return renumber_vertices(filtered, vertices)
+
+    def filter_features(self, features: Iterable[Dict[str, Any]], transform: Transform) -> Iterator[Dict[str, Any]]:
+        """
+        Apply the filter to every feature of a CityJSONSeq file, leaving out the features without any selected
+        CityObject.
+
+        :param features: The CityJSONFeature objects.
+        :param transform: The transform of the header.
+        :return: Iterator over the filtered features, with their vertices as lists like in the file.
+        """
+        for feature in features:
+            cityobjects, vertices = self.apply(feature["CityObjects"], feature["vertices"], transform)
+            if cityobjects:
+                yield {**feature, "CityObjects": cityobjects, "vertices": vertices.tolist()}
+
+
+def iter_geometry_indices(cityobjects: Dict[str, Any]) -> Iterator[int]:
+    """
+    Iterate over the vertex indices of the boundaries of all the geometries of the CityObjects.
+
+    :param cityobjects: The CityObjects.
+    :return: Iterator over the vertex indices, in boundary order.
+    """
+    for cityobject in cityobjects.values():
+        for geometry in cityobject.get("geometry", []):
+            yield from iter_boundary_indices(geometry)
+
+
+def renumber_boundaries(boundaries: List[Any], depth: int, new_indices: Iterator[int]) -> List[Any]:
+    """
+    Rebuild the nesting of the boundaries, replacing every vertex index with the next item of new_indices.
+
+    :param boundaries: The boundaries of a geometry.
+    :param depth: Nesting depth of the vertex indices in the boundaries.
+    :param new_indices: Iterator over the new vertex indices, in boundary order.
+    :return: The renumbered boundaries.
+    """
+    if depth == 1:
+        return [next(new_indices) for _ in boundaries]
+    return [renumber_boundaries(nested, depth - 1, new_indices) for nested in boundaries]
+
+
+def renumber_vertices(cityobjects: Dict[str, Any], vertices: np.ndarray) -> Tuple[Dict[str, Any], np.ndarray]:
+    """
+    Keep only the vertices the geometries of the CityObjects refer to, in their original order, and renumber the
+    boundaries accordingly.
+
+    :param cityobjects: The CityObjects.
+    :param vertices: The vertices, an int64 array of shape (n, 3).
+    :return: The CityObjects with renumbered geometries, and their vertices.
+    """
+    indices = np.fromiter(iter_geometry_indices(cityobjects), dtype=np.intp)
+    used, new_indices = np.unique(indices, return_inverse=True)
+    if len(used) == len(vertices):
+        # Every vertex is used, the indices stay the same
+        return cityobjects, vertices
+    new_indices = iter(new_indices.tolist())
+    renumbered = {}
+    for cityobject_id, cityobject in cityobjects.items():
+        if "geometry" in cityobject:
+            cityobject = dict(cityobject)
+            cityobject["geometry"] = [
+                {**geometry, "boundaries": renumber_boundaries(geometry["boundaries"], boundary_depths[geometry["type"]], new_indices)}
+                if geometry["type"] in boundary_depths else geometry
+                for geometry in cityobject["geometry"]]
+        renumbered[cityobject_id] = cityobject
+    return renumbered, vertices[used]
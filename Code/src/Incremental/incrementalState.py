@@ -0,0 +1,154 @@
+import hashlib
+import json
+import os
+from itertools import chain
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+import numpy as np
+from Cityobjects.serializedCityObject import SerializedCityObject
+from Cityobjects.Geometry.boundaryIndices import boundary_depths
+
+# Version of the state file format, a state of another version is not reused
+state_version = 1
+
+# Removes the vertex indices from JSON boundaries, leaving their nesting
+digits_table = str.maketrans("", "", "0123456789")
+
+
+def hash_cityobject(cityobject: Dict[str, Any], real_vertices: np.ndarray, include_indices: bool = False) -> str:
+    """
+    Hash the content of a CityObject the JSON-LD representation depends on.
+
+    The boundaries are hashed by their nesting and the coordinates of the vertices they refer to, not by
+    the vertex indices, so a file whose vertices were renumbered does not change the hash, unless the
+    JSON-LD representation refers to the vertices by index, see include_indices.
+
+    :param cityobject: The CityObject as found in the CityJSON file.
+    :param real_vertices: The transformed vertices, see Transform.to_real_vertices.
+    :param include_indices: Flag to hash the vertex indices of the boundaries as well, for vertex references.
+    :return: The SHA-256 hash as hexadecimal.
+    """
+    content_hash = hashlib.sha256()
+    members = {key: value for key, value in cityobject.items() if key != "geometry"}
+    content_hash.update(json.dumps(members, sort_keys=True, separators=(",", ":")).encode("utf-8"))
+    for geometry in cityobject.get("geometry", []):
+        geometry_members = {key: value for key, value in geometry.items() if key != "boundaries"}
+        content_hash.update(json.dumps(geometry_members, sort_keys=True, separators=(",", ":")).encode("utf-8"))
+        boundaries = geometry.get("boundaries", [])
+        boundaries_json = json.dumps(boundaries, separators=(",", ":"))
+        content_hash.update((boundaries_json if include_indices else boundaries_json.translate(digits_table)).encode("utf-8"))
+        indices = boundaries
+        for _ in range(boundary_depths.get(geometry["type"], 1) - 1):
+            indices = chain.from_iterable(indices)
+        content_hash.update(real_vertices[np.fromiter(indices, dtype=np.intp)].tobytes())
+    return content_hash.hexdigest()
+
+
+class IncrementalState:
+    """
+    A class to keep the content hash and the JSON-LD representation of every city object of the last
+    conversion, to convert only the new and changed city objects of the next one.
+
+    The state is saved as JSON lines: a header with the options of the conversion, then one line per
+    city object with its identifier, hash and JSON-LD representation.
+
+    Arguments:
+        options (Dict[str, Any]): Options the JSON-LD representation depends on, e.g. the base URL.
+        entries (Dict[str, Tuple[Optional[str], Optional[Dict[str, Any]]]]): Hash and JSON-LD representation of every
+            city object, both None for a city object that cannot be reused.
+    """
+
+    def __init__(self, options: Dict[str, Any], entries: Optional[Dict[str, Tuple[Optional[str], Optional[Dict[str, Any]]]]] = None):
+        self.options = options
+        self.entries = entries if entries is not None else {}
+
+    @staticmethod
+    def load(path: str, options: Dict[str, Any]) -> 'IncrementalState':
+        """
+        Load the state of the last conversion.
+
+        A missing state gives an empty state. With a state saved with other options, every city object is
+        converted again, the previous ones being reported as changed or removed.
+
+        :param path: Path of the state file.
+        :param options: Options of the current conversion.
+        :return: The state.
+        """
+        if not os.path.exists(path):
+            return IncrementalState(options)
+        with open(path, encoding='utf-8') as state_file:
+            header = json.loads(next(state_file, "{}"))
+            reusable = header.get("version") == state_version and header.get("options") == options
+            if not reusable:
+                print("The incremental state was saved with other options, every city object is converted")
+            entries = {}
+            for line in state_file:
+                cityobject_id, content_hash, data = json.loads(line)
+                entries[cityobject_id] = (content_hash, data) if reusable else (None, None)
+        return IncrementalState(options, entries)
+
+    def save(self, path: str):
+        """
+        Save the state, replacing the previous one only once it is completely written.
+
+        :param path: Path of the state file.
+        """
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, 'w', encoding='utf-8') as state_file:
+            state_file.write(json.dumps({"version": state_version, "options": self.options}) + "\n")
+            for cityobject_id, (content_hash, data) in self.entries.items():
+                state_file.write(json.dumps([cityobject_id, content_hash, data], ensure_ascii=False) + "\n")
+        os.replace(temporary_path, path)
+
+    def get_diff(self, hashes: Dict[str, str]) -> Dict[str, List[str]]:
+        """
+        Compare the hashes of the current city objects with the state.
+
+        :param hashes: Hash of every current city object, see hash_cityobject.
+        :return: Identifiers of the "added", "changed", "removed" and "unchanged" city objects.
+        """
+        diff: Dict[str, List[str]] = {"added": [], "changed": [], "removed": [], "unchanged": []}
+        for cityobject_id, content_hash in hashes.items():
+            entry = self.entries.get(cityobject_id)
+            if entry is None:
+                diff["added"].append(cityobject_id)
+            elif entry[0] != content_hash:
+                diff["changed"].append(cityobject_id)
+            else:
+                diff["unchanged"].append(cityobject_id)
+        diff["removed"] = [cityobject_id for cityobject_id in self.entries if cityobject_id not in hashes]
+        return diff
+
+    def merge(self, hashes: Dict[str, str], converted: Iterable[Any]) -> Iterator[SerializedCityObject]:
+        """
+        Produce the city objects in the order of hashes, reusing the JSON-LD representation of the unchanged
+        ones and taking the others from converted, while recording them as the new state.
+
+        :param hashes: Hash of every current city object, in the output order.
+        :param converted: The converted new and changed city objects, in the same order.
+        :return: Iterator over the city objects.
+        """
+        previous_entries = self.entries
+        self.entries = {}
+        converted = iter(converted)
+        for cityobject_id, content_hash in hashes.items():
+            entry = previous_entries.get(cityobject_id)
+            if entry is not None and entry[0] == content_hash:
+                data = entry[1]
+            else:
+                data = next(converted).to_json()
+            self.entries[cityobject_id] = (content_hash, data)
+            yield SerializedCityObject(data)
+
+
+def write_diff(path: str, base_url: str, diff: Dict[str, List[str]]):
+    """
+    Write the IRIs of the added, changed and removed city objects as JSON.
+
+    :param path: Path to save the diff to file.
+    :param base_url: Base URL the city object identifiers are relative to.
+    :param diff: The diff, see IncrementalState.get_diff.
+    """
+    data = {key: [f"{base_url}{cityobject_id}" for cityobject_id in diff[key]] for key in ["added", "changed", "removed"]}
+    data["unchanged"] = len(diff["unchanged"])
+    with open(path, 'w', encoding='utf-8') as diff_file:
+        json.dump(data, diff_file, indent=4, ensure_ascii=False)
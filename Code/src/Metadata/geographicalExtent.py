@@ -1,5 +1,4 @@
-import json
-from typing import List, Optional, Union
+from typing import Any, Dict, List, Optional, Union
 
 
 class GeographicalExtent:
@@ -42,7 +41,7 @@ class GeographicalExtent:
             raise TypeError(
                 "Geographical Extent should be either a list of 6 floats or None")
 
-    def to_json(self) -> str:
+    def to_json(self) -> Dict[str, Any]:
         """
         Convert the GeographicalExtent object to a JSON-LD representation.
 
@@ -75,4 +74,4 @@ class GeographicalExtent:
                 "@type": "xsd:float"
             },
         }
-        return json.dumps(data, ensure_ascii=False)
+        return data
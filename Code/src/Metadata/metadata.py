@@ -1,4 +1,3 @@
-import json
 from typing import List, Optional, Dict, Any, Union
 from Metadata.geographicalExtent import GeographicalExtent
 from Metadata.pointOfContact import PointOfContact
@@ -23,6 +22,34 @@ class Metadata:
         self.reference_system = reference_system
         self.title = title
 
+    @staticmethod
+    def to_metadata(metadata_values: Optional[Dict[str, Any]]) -> Optional['Metadata']:
+        """
+        Convert the "metadata" member of a CityJSON file to a Metadata object.
+
+        :param metadata_values: Dictionary of the CityJSON metadata or None.
+        :return: Metadata object or None.
+        """
+        if metadata_values is None:
+            return None
+
+        param_key_mapping = {
+            "geographical_extent": "geographicalExtent",
+            "identifier": "identifier",
+            "point_of_contact": "pointOfContact",
+            "reference_date": "referenceDate",
+            "reference_system": "referenceSystem",
+            "title": "title",
+        }
+
+        constructor_args = {
+            param: metadata_values[key]
+            for param, key in param_key_mapping.items()
+            if key in metadata_values and metadata_values[key] is not None
+        }
+
+        return Metadata(**constructor_args)
+
     @staticmethod
     def to_point_of_contact(point_of_contact: Optional[Dict[str, Any]]) -> Optional[PointOfContact]:
         """
@@ -52,8 +79,8 @@ class Metadata:
 
         :return: JSON-LD representation of the Metadata object.
         """
-        geographical_extent_dict = json.loads(self.geographical_extent.to_json()) if self.geographical_extent else None
-        point_of_contact_dict = json.loads(self.point_of_contact.to_json()) if self.point_of_contact else None
+        geographical_extent_dict = self.geographical_extent.to_json() if self.geographical_extent else None
+        point_of_contact_dict = self.point_of_contact.to_json() if self.point_of_contact else None
         data = {
             "@type": "cj:Metadata",
             "cj:hasGeographicalExtent": geographical_extent_dict,
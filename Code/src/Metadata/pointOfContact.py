@@ -1,5 +1,4 @@
-import json
-from typing import Optional
+from typing import Any, Dict, Optional
 
 class PointOfContact:
     def __init__(self, contact_name: str, email_address: str, role: Optional[str] = None, website: Optional[str] = None,
@@ -25,7 +24,7 @@ class PointOfContact:
         self.phone = phone
         self.organization = organization
 
-    def to_json(self) -> str:
+    def to_json(self) -> Dict[str, Any]:
         """
         Convert the PointOfContact object to a JSON-LD representation.
 
@@ -44,4 +43,4 @@ class PointOfContact:
         }
         # Filter out None values
         filtered_data = {key: value for key, value in data.items() if value is not None}
-        return json.dumps(filtered_data, ensure_ascii=False)
+        return filtered_data
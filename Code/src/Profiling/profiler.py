@@ -0,0 +1,227 @@
+import cProfile
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from Cityobjects.serializedCityObject import SerializedCityObject
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows, the peak resident memory is then not reported
+    resource = None
+
+
+def get_max_rss() -> Optional[int]:
+    """
+    Get the peak resident memory of the process so far.
+
+    :return: The peak resident memory in bytes, or None if it is not available on this platform.
+    """
+    if resource is None:
+        return None
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+
+
+def open_statm():
+    """
+    Open the memory statistics of the process, to read its current resident memory with get_current_rss.
+
+    :return: The file, or None if it is not available on this platform.
+    """
+    try:
+        return open("/proc/self/statm", "rb", buffering=0)
+    except OSError:
+        return None
+
+
+def get_current_rss(statm_file) -> Optional[int]:
+    """
+    Get the current resident memory of the process.
+
+    :param statm_file: The memory statistics of the process, see open_statm, or None.
+    :return: The resident memory in bytes, or None if it is not available on this platform.
+    """
+    if statm_file is None:
+        return None
+    # The second field is the number of resident pages
+    return int(os.pread(statm_file.fileno(), 256, 0).split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def null_stage(name: str):
+    """
+    Stand-in for Profiler.stage when profiling is turned off.
+
+    :param name: Name of the stage.
+    :return: A context manager doing nothing.
+    """
+    return nullcontext()
+
+
+class Profiler:
+    """
+    A class to measure the stages of a conversion: wall time, CPU time, resident memory increase and number
+    of times every stage was entered, plus item counts.
+
+    Stages can be nested, e.g. the conversion of the city objects happens while the output is written.
+    The time of a stage excludes the time of the stages nested in it, so the stage times add up to the
+    total. Optionally every stage is also profiled with cProfile, to dump the statistics of the hottest one.
+
+    The resident memory increase of a stage is measured from the current resident memory when it starts: to the
+    peak resident memory of the process when the stage raised it, to the resident memory at its end otherwise, as
+    a stage staying under an earlier peak does not have its own peak recorded. It is the largest of all the calls
+    of the stage, includes the stages nested in it, and is None where the current resident memory is not available,
+    e.g. outside Linux.
+
+    Arguments:
+        enable_cprofile (bool): Flag to profile every stage with cProfile.
+    """
+
+    def __init__(self, enable_cprofile: bool = False):
+        self.enable_cprofile = enable_cprofile
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self.statm_file = open_statm()
+        self.counts: Dict[str, Dict[str, int]] = {}
+        self.profiles: Dict[str, cProfile.Profile] = {}
+        # One entry per open stage: [name, wall time and CPU time it was last resumed at]
+        self.stack: List[List[Any]] = []
+        self.start_wall = time.perf_counter()
+        self.start_cpu = time.process_time()
+
+    def _pause(self, entry: List[Any]):
+        name, start_wall, start_cpu = entry
+        stage = self.stages[name]
+        stage["wall_seconds"] += time.perf_counter() - start_wall
+        stage["cpu_seconds"] += time.process_time() - start_cpu
+        if self.enable_cprofile:
+            self.profiles[name].disable()
+
+    def _resume(self, entry: List[Any]):
+        if self.enable_cprofile:
+            self.profiles[entry[0]].enable()
+        entry[1] = time.perf_counter()
+        entry[2] = time.process_time()
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Measure a stage, pausing the stage it is nested in.
+
+        :param name: Name of the stage, measures of the same name add up.
+        """
+        stage = self.stages.setdefault(name, {"wall_seconds": 0.0, "cpu_seconds": 0.0, "calls": 0, "rss_increase_bytes": None})
+        stage["calls"] += 1
+        if self.enable_cprofile and name not in self.profiles:
+            self.profiles[name] = cProfile.Profile()
+        if self.stack:
+            self._pause(self.stack[-1])
+        entry = [name, 0.0, 0.0]
+        self.stack.append(entry)
+        start_rss = get_current_rss(self.statm_file)
+        start_max_rss = get_max_rss()
+        self._resume(entry)
+        try:
+            yield
+        finally:
+            self._pause(self.stack.pop())
+            if start_rss is not None:
+                max_rss = get_max_rss()
+                end_rss = max_rss if max_rss is not None and max_rss > start_max_rss else get_current_rss(self.statm_file)
+                stage["rss_increase_bytes"] = max(stage["rss_increase_bytes"] or 0, end_rss - start_rss)
+            if self.stack:
+                self._resume(self.stack[-1])
+
+    def count(self, category: str, key: str, number: int = 1):
+        """
+        Add to an item count.
+
+        :param category: Category of the count, e.g. "geometry_type".
+        :param key: Counted item, e.g. "Solid".
+        :param number: Number to add.
+        """
+        counts = self.counts.setdefault(category, {})
+        counts[key] = counts.get(key, 0) + number
+
+    def count_cityobject(self, data: Dict[str, Any]):
+        """
+        Count a converted city object per type and its geometries per type and LoD.
+
+        :param data: JSON-LD representation of the city object.
+        """
+        self.count("cityobject_type", data["cj:type"])
+        for geometry in data.get("cj:hasGeometry", []):
+            self.count("geometry_type", geometry["cj:type"])
+            self.count("geometry_lod", str(geometry["cj:lod"]))
+
+    def profile_cityobjects(self, cityobjects: Iterable[Any]) -> Iterator[SerializedCityObject]:
+        """
+        Measure the conversion of the city objects, as "cityobjects", and of their JSON-LD representation,
+        as "to_json", while they are consumed, and count them from their JSON-LD representation, so a
+        streamed file is not parsed again to count them.
+
+        :param cityobjects: Iterable over the city objects, converted lazily.
+        :return: Iterator over the converted city objects.
+        """
+        iterator = iter(cityobjects)
+        while True:
+            with self.stage("cityobjects"):
+                cityobj = next(iterator, None)
+            if cityobj is None:
+                return
+            with self.stage("to_json"):
+                data = cityobj.to_json()
+            self.count_cityobject(data)
+            yield SerializedCityObject(data)
+
+    def get_hottest_stage(self) -> Optional[str]:
+        """
+        Get the stage that took the most wall time.
+
+        :return: Name of the stage, or None if no stage was measured.
+        """
+        if not self.stages:
+            return None
+        return max(self.stages, key=lambda name: self.stages[name]["wall_seconds"])
+
+    def to_json(self) -> Dict[str, Any]:
+        """
+        Build the report of the measures.
+
+        :return: The report.
+        """
+        return {
+            "stages": self.stages,
+            "total": {
+                "wall_seconds": time.perf_counter() - self.start_wall,
+                "cpu_seconds": time.process_time() - self.start_cpu
+            },
+            "max_rss_bytes": get_max_rss(),
+            "hottest_stage": self.get_hottest_stage(),
+            "counts": self.counts
+        }
+
+    def write_report(self, path: str, **details: Any):
+        """
+        Write the report of the measures as JSON.
+
+        :param path: Path to save the report to file.
+        :param details: Other members of the report, e.g. the input file.
+        """
+        with open(path, 'w', encoding='utf-8') as report_file:
+            json.dump({**details, **self.to_json()}, report_file, indent=4)
+
+    def dump_stats(self, path: str) -> Optional[str]:
+        """
+        Dump the cProfile statistics of the hottest stage, to be read with pstats.
+
+        :param path: Path to save the statistics to file.
+        :return: Name of the dumped stage, or None if no stage was profiled.
+        """
+        name = self.get_hottest_stage()
+        if name is None or name not in self.profiles:
+            return None
+        self.profiles[name].dump_stats(path)
+        return name
@@ -0,0 +1,30 @@
+import json
+from typing import Any, Dict, List, Tuple
+
+# Top level members of a CityJSON file the conversion does not support
+unsupported_members = ["extensions", "appearance", "geometry_templates"]
+
+
+def read_cityjson(input_file_path: str) -> Tuple[str, Dict[str, Any]]:
+    """
+    Read a CityJSON file once and parse it.
+
+    The raw text is returned with the parsed content so it can be handed to the validator as is,
+    without serializing the parsed content again.
+
+    :param input_file_path: Path to the CityJSON file.
+    :return: The raw text of the file and its parsed content.
+    """
+    with open(input_file_path, 'rb') as file:
+        file_content_str = file.read().decode('utf-8')
+    return file_content_str, json.loads(file_content_str)
+
+
+def get_unsupported_members(file_content_json: Dict[str, Any]) -> List[str]:
+    """
+    Get the top level members of a CityJSON file the conversion does not support.
+
+    :param file_content_json: The parsed CityJSON file, or the header of a CityJSONSeq file.
+    :return: List of the unsupported members found.
+    """
+    return [member for member in unsupported_members if member in file_content_json]
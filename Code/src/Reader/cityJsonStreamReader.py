@@ -0,0 +1,161 @@
+import mmap
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Tuple
+import numpy as np
+
+
+def import_ijson() -> Any:
+    """
+    Import the ijson package, only needed to stream CityJSON files.
+
+    :return: The ijson module.
+    """
+    try:
+        import ijson
+    except ImportError:
+        raise ImportError("Streaming a CityJSON file needs the ijson package, install it with: pip install ijson")
+    return ijson
+
+
+@contextmanager
+def open_mapped(input_file_path: str) -> Iterator[mmap.mmap]:
+    """
+    Open a file memory-mapped for reading, so it is parsed from the page cache without being copied into memory.
+
+    :param input_file_path: Path to the file.
+    :return: Context manager giving the mapped file.
+    """
+    with open(input_file_path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        yield mapped
+
+
+class CityObjectStream:
+    """
+    A class standing for the "CityObjects" member of a streamed CityJSON file: the city objects are parsed
+    one at a time from the file every time they are iterated, instead of being kept in memory.
+
+    Arguments:
+        input_file_path (str): Path to the CityJSON file.
+        count (int): Number of city objects, counted while the header was read.
+    """
+
+    def __init__(self, input_file_path: str, count: int):
+        self.input_file_path = input_file_path
+        self.count = count
+
+    def __len__(self) -> int:
+        return self.count
+
+    def items(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Parse the city objects in the order of the file.
+
+        :return: Iterator over the identifier and the content of every city object.
+        """
+        ijson = import_ijson()
+        with open_mapped(self.input_file_path) as mapped:
+            yield from ijson.kvitems(mapped, "CityObjects", use_float=True)
+
+    def values(self) -> Iterator[Dict[str, Any]]:
+        """
+        Parse the city objects in the order of the file.
+
+        :return: Iterator over the content of every city object.
+        """
+        return (cityobject for _, cityobject in self.items())
+
+    def __iter__(self) -> Iterator[str]:
+        return (cityobject_id for cityobject_id, _ in self.items())
+
+
+def read_cityjson_stream(input_file_path: str) -> Dict[str, Any]:
+    """
+    Read a CityJSON file incrementally, for files too large to be parsed at once.
+
+    The file is parsed event by event from a memory map. The vertices are read straight into an int64
+    array of shape (n, 3) and the city objects are skipped, only counted: they are parsed one at a time
+    when the "CityObjects" member, a CityObjectStream, is iterated. The other members, e.g. the transform
+    and metadata, are parsed as usual.
+
+    :param input_file_path: Path to the CityJSON file.
+    :return: The parsed content of the file, with the vertices as an array and the city objects as a CityObjectStream.
+    """
+    ijson = import_ijson()
+    file_content_json: Dict[str, Any] = {}
+    with open_mapped(input_file_path) as mapped:
+        events = ijson.parse(mapped, use_float=True)
+        for prefix, event, value in events:
+            if prefix != "" or event != "map_key":
+                continue
+            if value == "vertices":
+                coordinates = np.fromiter(iter_vertex_coordinates(events), dtype=np.int64)
+                file_content_json["vertices"] = coordinates.reshape(-1, 3)
+            elif value == "CityObjects":
+                file_content_json["CityObjects"] = CityObjectStream(input_file_path, skip_value(events))
+            else:
+                file_content_json[value] = build_value(ijson, events)
+    return file_content_json
+
+
+def iter_vertex_coordinates(events: Iterator[Tuple[str, str, Any]]) -> Iterator[int]:
+    """
+    Consume the parsing events of the "vertices" member.
+
+    :param events: The parsing events, positioned at the start of the member.
+    :return: Iterator over the coordinates of the vertices, x, y and z of every vertex in order.
+    """
+    coordinate_count = 0
+    for prefix, event, value in events:
+        if prefix == "vertices.item.item" and event == "number" and isinstance(value, int):
+            coordinate_count += 1
+            yield value
+        elif prefix == "vertices.item" and event == "end_array":
+            if coordinate_count != 3:
+                raise ValueError("Each vertex should be a list of 3 integers")
+            coordinate_count = 0
+        elif prefix == "vertices" and event == "end_array":
+            return
+        elif event != "start_array" or prefix == "vertices.item.item":
+            raise ValueError("Each vertex should be a list of 3 integers")
+
+
+def skip_value(events: Iterator[Tuple[str, str, Any]]) -> int:
+    """
+    Consume the parsing events of a member without building it.
+
+    :param events: The parsing events, positioned at the start of the member.
+    :return: Number of keys of the member if it is an object, e.g. the number of city objects.
+    """
+    depth = 0
+    key_count = 0
+    for _, event, _ in events:
+        if event in ("start_map", "start_array"):
+            depth += 1
+        elif event in ("end_map", "end_array"):
+            depth -= 1
+        elif event == "map_key" and depth == 1:
+            key_count += 1
+        if depth == 0:
+            return key_count
+    return key_count
+
+
+def build_value(ijson: Any, events: Iterator[Tuple[str, str, Any]]) -> Any:
+    """
+    Consume the parsing events of a member, building its value.
+
+    :param ijson: The ijson module.
+    :param events: The parsing events, positioned at the start of the member.
+    :return: The value of the member.
+    """
+    builder = ijson.ObjectBuilder()
+    depth = 0
+    for _, event, value in events:
+        builder.event(event, value)
+        if event in ("start_map", "start_array"):
+            depth += 1
+        elif event in ("end_map", "end_array"):
+            depth -= 1
+        if depth == 0:
+            break
+    return builder.value
@@ -0,0 +1,153 @@
+import copy
+import json
+import math
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import pyshacl
+from rdflib import Graph
+from Cityobjects.cityObjectFamilies import group_families
+from Cityobjects.serializedCityObject import SerializedCityObject
+from Vertices.vertices import Vertices
+from cityJson import CityJSON
+
+# Shapes graph of a worker process, parsed once by init_worker, and the path it was parsed from
+worker_shapes_graph: Optional[Graph] = None
+worker_shapes_path: Optional[str] = None
+
+# Upper bound of city objects validated in one shard, pyshacl slows down more than linearly above it
+max_shard_size = 20
+
+# Upper bound of vertices validated in one shard
+max_vertex_shard_size = 1000
+
+# Number of shards per worker submitted ahead of the shard whose report is collected
+max_pending_shards = 2
+
+results_pattern = re.compile(r"^Results \((\d+)\):\n", re.MULTILINE)
+
+
+def init_worker(shacl_file_path: str):
+    """
+    Initialize a worker process by parsing the shapes graph, unless it was already parsed by this process, e.g.
+    for another file of a batch conversion.
+
+    :param shacl_file_path: Path to the SHACL shapes file.
+    """
+    global worker_shapes_graph, worker_shapes_path
+    if worker_shapes_graph is None or worker_shapes_path != shacl_file_path:
+        worker_shapes_graph = Graph().parse(shacl_file_path, format="turtle")
+        worker_shapes_path = shacl_file_path
+
+
+def validate_shard(shard: Dict[str, Any]) -> Tuple[bool, int, str]:
+    """
+    Validate a shard against the shapes graph of the worker.
+
+    :param shard: JSON-LD document of the shard.
+    :return: Whether the shard conforms, the number of results and the text of the results.
+    """
+    conforms, _, results_text = pyshacl.validate(
+        data_graph=json.dumps(shard, ensure_ascii=False),
+        shacl_graph=worker_shapes_graph,
+        ont_graph=None,
+        data_graph_format="json-ld",
+        depth=999
+    )
+    match = results_pattern.search(results_text)
+    if not match:
+        return conforms, 0, ""
+    return conforms, int(match.group(1)), results_text[match.end():]
+
+
+def iter_shards(cityjson_obj: CityJSON, shard_size: int) -> Iterator[Dict[str, Any]]:
+    """
+    Split the JSON-LD representation of a CityJSON object into shards of whole families of city objects and of
+    consecutive vertices.
+
+    The first shard is the CityJSON document with the transform, metadata, first vertices and first city objects, so
+    its size does not depend on the size of the file while the shapes of the CityJSON node still find every property
+    they require. The other shards hold the remaining vertices, or vertex blocks, and city objects as a "@graph" and
+    are validated through the target classes of the shapes.
+
+    :param cityjson_obj: CityJSON object to split.
+    :param shard_size: Number of city objects per shard, exceeded only to keep a family together.
+    :return: Iterator over the JSON-LD documents of the shards.
+    """
+    cityobjects = {cityobject["@id"]: cityobject for cityobject in (cityobj.to_json() for cityobj in cityjson_obj.cityobjects)}
+    # A parent is validated together with its children, as the shapes check the nodes they refer to
+    links = {
+        cityobject_id: {
+            "parents": [cityobject["cj:hasParent"]["@id"]] if "cj:hasParent" in cityobject else [],
+            "children": [child["@id"] for child in cityobject.get("cj:hasChildren", [])]
+        }
+        for cityobject_id, cityobject in cityobjects.items()
+    }
+    shards: List[List[Dict[str, Any]]] = [[]]
+    for family in group_families(links):
+        if shards[-1] and len(shards[-1]) + len(family) > shard_size:
+            shards.append([])
+        shards[-1].extend(cityobjects[cityobject_id] for cityobject_id in family)
+
+    vertices = cityjson_obj.vertices
+    header = copy.copy(cityjson_obj)
+    header.cityobjects = [SerializedCityObject(data) for data in shards[0]]
+    if vertices is not None:
+        head_size = max_vertex_shard_size if vertices.encoding == "list" else vertices.block_size
+        header.vertices = Vertices(vertices.vertices[:head_size], vertices.vertex_prefix, vertices.encoding, vertices.block_size)
+    yield header.to_json()
+
+    context = cityjson_obj.get_context()
+    if vertices is not None:
+        if vertices.encoding == "list":
+            for chunk in islice(vertices.iter_json(max_vertex_shard_size), 1, None):
+                yield {"@context": context, "@graph": chunk}
+        else:
+            blocks = islice(vertices.iter_blocks(), 1, None)
+            blocks_per_shard = max(1, max_vertex_shard_size // vertices.block_size)
+            while chunk := list(islice(blocks, blocks_per_shard)):
+                yield {"@context": context, "@graph": chunk}
+    for shard in shards[1:]:
+        yield {"@context": context, "@graph": shard}
+
+
+def validate_cityjson(cityjson_obj: CityJSON, shacl_file_path: str, workers: int = 1) -> Tuple[bool, str]:
+    """
+    Validate a CityJSON object against the SHACL shapes, shard by shard.
+
+    Validating shards of a few city objects instead of the whole graph keeps the time linear in
+    the number of city objects. The shards are validated in a pool of worker processes, each parsing the
+    shapes graph once, and their reports are merged into one. The shards are built as they are submitted, at most
+    max_pending_shards per worker ahead, so the JSON-LD of the whole document is never held at once.
+
+    :param cityjson_obj: CityJSON object to validate, with a list of city objects.
+    :param shacl_file_path: Path to the SHACL shapes file.
+    :param workers: Number of worker processes.
+    :return: Whether the CityJSON object conforms and the text of the merged validation report.
+    """
+    cityobjects_count = len(cityjson_obj.cityobjects)
+    shard_size = max(1, min(max_shard_size, math.ceil(cityobjects_count / (workers * 4))))
+    shards = iter_shards(cityjson_obj, shard_size)
+
+    if workers > 1:
+        reports = []
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(shacl_file_path,)) as executor:
+            pending = deque(executor.submit(validate_shard, shard) for shard in islice(shards, workers * max_pending_shards))
+            while pending:
+                reports.append(pending.popleft().result())
+                next_shard = next(shards, None)
+                if next_shard is not None:
+                    pending.append(executor.submit(validate_shard, next_shard))
+    else:
+        init_worker(shacl_file_path)
+        reports = [validate_shard(shard) for shard in shards]
+
+    conforms = all(shard_conforms for shard_conforms, _, _ in reports)
+    results_count = sum(count for _, count, _ in reports)
+    results_text = "".join(text for _, _, text in reports)
+    report_text = f"Validation Report\nConforms: {conforms}\n"
+    if results_count:
+        report_text += f"Results ({results_count}):\n{results_text}"
+    return conforms, report_text
@@ -0,0 +1,250 @@
+import json
+import tempfile
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+from cjvalpy import cjvalpy
+from Cityobjects.cityObjectFactory import to_cityobject
+from Cityobjects.firstLevelCityObject import FirstLevelCityObject
+from Cityobjects.SecondLevelCityObject import SecondLevelCityObject
+from Filtering.cityObjectFilter import CityObjectFilter
+from Metadata.metadata import Metadata
+from Reader.cityJsonReader import get_unsupported_members
+from Transform.transform import Transform
+from Vertices.vertices import Vertices
+from Writer.backgroundWriter import open_output
+from Writer.jsonldWriter import JsonLdWriter
+from Writer.rdfWriter import RdfWriter, rdf_format_values
+from cityJson import CityJSON
+
+seq_format_values = ["array", "lines"]
+
+
+def read_cityjson_seq(input_file_path: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Read a CityJSONSeq file line by line.
+
+    :param input_file_path: Path to the CityJSONSeq file.
+    :return: Iterator over the raw line and its parsed content, the first one being the CityJSON header.
+    """
+    with open(input_file_path, encoding='utf-8') as file:
+        for line in file:
+            line = line.strip()
+            if line:
+                yield line, json.loads(line)
+
+
+def convert_feature(alias: str, feature: Dict[str, Any], transform: Transform, compact_coordinates: bool = False, include_wkt: bool = True, include_3d_boundaries: bool = True, include_envelope: bool = False, include_convex_hull: bool = False) -> List[Union[FirstLevelCityObject, SecondLevelCityObject]]:
+    """
+    Convert the CityObjects of a CityJSONFeature.
+
+    :param alias: Alias for the city objects.
+    :param feature: The CityJSONFeature.
+    :param transform: The transform of the header.
+    :param compact_coordinates: Flag to encode the points of the bounding boxes as JSON literals of coordinate arrays.
+    :param include_wkt: Flag to include the 2D boundaries of the geometries in WKT format.
+    :param include_3d_boundaries: Flag to include the 3D boundaries of the geometries as bounding boxes.
+    :param include_envelope: Flag to include the 2D envelope of the city objects as an extra geometry.
+    :param include_convex_hull: Flag to include the 2D convex hull of the city objects as an extra geometry.
+    :return: List of city objects of the feature.
+    """
+    real_vertices = transform.to_real_vertices(feature["vertices"])
+    return [to_cityobject(alias, cityobject_key, cityobject, real_vertices, compact_coordinates=compact_coordinates,
+                          include_wkt=include_wkt, include_3d_boundaries=include_3d_boundaries,
+                          include_envelope=include_envelope, include_convex_hull=include_convex_hull)
+            for cityobject_key, cityobject in feature["CityObjects"].items()]
+
+
+def iter_features(header_line: str, lines: Iterator[Tuple[str, Dict[str, Any]]]) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over the valid CityJSONFeatures, each validated together with the header.
+
+    :param header_line: The raw CityJSON header line.
+    :param lines: Iterator over the remaining raw lines and their parsed content.
+    :return: Iterator over the valid features.
+    """
+    for line_number, (line, feature) in enumerate(lines, start=2):
+        val = cjvalpy.CJValidator([header_line, line])
+        if feature.get("type") == "CityJSONFeature" and val.validate():
+            yield feature
+        else:
+            print(f"Line {line_number} is not a valid CityJSONFeature and is skipped")
+
+
+def convert_cityjson_seq(input_file_path: str, output_file_path: str, base_url: str, alias: str, city_id: str, seq_format: str, formatted: bool, output_format: str = "jsonld", compact_coordinates: bool = False, include_wkt: bool = True, include_3d_boundaries: bool = True, include_envelope: bool = False, include_convex_hull: bool = False, cityobject_filter: Optional[CityObjectFilter] = None) -> bool:
+    """
+    Convert a CityJSONSeq file to JSON-LD feature by feature.
+
+    Every converted CityObject is written right away, so the memory used depends on the largest feature
+    and not on the whole city.
+
+    With the "array" format a single JSON-LD document is written, streaming the city objects into
+    "cj:hasCityObjects". The vertices of the features are concatenated into "cj:hasVertices", which is
+    written after the city objects so the input is only read once.
+
+    With the "lines" format the output has one JSON-LD document per line: the CityJSON header first, then
+    one document per feature adding its city objects to the same CityJSON node. The features keep their own
+    local vertices, so no "cj:hasVertices" list is written.
+
+    With an RDF output format, one of rdf_format_values, the triples of the "array" document are written
+    directly instead and seq_format is not used.
+
+    :param input_file_path: Path to the input CityJSONSeq file.
+    :param output_file_path: Path to the output file.
+    :param base_url: Base URL for the CityJSON file.
+    :param alias: Alias of the base URL.
+    :param city_id: Identifier for the CityJSON file.
+    :param seq_format: Output format, one of seq_format_values.
+    :param formatted: Flag to enable formatting the output, only used with the "array" format.
+    :param output_format: "jsonld" or one of rdf_format_values.
+    :param compact_coordinates: Flag to encode the points of the bounding boxes as JSON literals of coordinate arrays.
+    :param include_wkt: Flag to include the 2D boundaries of the geometries in WKT format.
+    :param include_3d_boundaries: Flag to include the 3D boundaries of the geometries as bounding boxes.
+    :param include_envelope: Flag to include the 2D envelope of the city objects as an extra geometry.
+    :param include_convex_hull: Flag to include the 2D convex hull of the city objects as an extra geometry.
+    :param cityobject_filter: Filter of the city objects and geometries of every feature, optional.
+    :return: True if the file was converted, False otherwise.
+    """
+    if seq_format not in seq_format_values:
+        raise ValueError(f"seq_format value must be one of {', '.join(seq_format_values)}")
+
+    lines = read_cityjson_seq(input_file_path)
+    header_line, header = next(lines, (None, None))
+
+    if header is None or header.get("type") != "CityJSON" or not cjvalpy.CJValidator([header_line]).validate():
+        print("The provided file is not a valid cityjsonseq file")
+        return False
+
+    unsupported = get_unsupported_members(header)
+    for member in unsupported:
+        print(f"This current version does not support cityjson files with {member}")
+    if unsupported:
+        return False
+
+    transform_obj = Transform(scale=header["transform"]["scale"], translate=header["transform"]["translate"])
+    cityjson_obj = CityJSON(base_url, alias, city_id, header["version"], transform_obj,
+                            Vertices(vertices=[]), [], Metadata.to_metadata(header.get("metadata")))
+
+    features = iter_features(header_line, lines)
+    if cityobject_filter is not None:
+        features = cityobject_filter.filter_features(features, transform_obj)
+    if output_format in rdf_format_values:
+        write_rdf(output_file_path, cityjson_obj, features, output_format, compact_coordinates, include_wkt, include_3d_boundaries, include_envelope, include_convex_hull)
+    elif seq_format == "lines":
+        write_jsonld_lines(output_file_path, cityjson_obj, features, compact_coordinates, include_wkt, include_3d_boundaries, include_envelope, include_convex_hull)
+    else:
+        write_jsonld_array(output_file_path, cityjson_obj, features, formatted, compact_coordinates, include_wkt, include_3d_boundaries, include_envelope, include_convex_hull)
+    return True
+
+
+def write_jsonld_lines(path: str, cityjson_obj: CityJSON, features: Iterator[Dict[str, Any]], compact_coordinates: bool = False, include_wkt: bool = True, include_3d_boundaries: bool = True, include_envelope: bool = False, include_convex_hull: bool = False):
+    """
+    Write the header and every feature as a JSON-LD document on its own line.
+
+    :param path: Path to save the JSON-LD lines to file.
+    :param cityjson_obj: CityJSON object holding the header.
+    :param features: Iterator over the CityJSONFeatures.
+    :param compact_coordinates: Flag to encode the points of the bounding boxes as JSON literals of coordinate arrays.
+    :param include_wkt: Flag to include the 2D boundaries of the geometries in WKT format.
+    :param include_3d_boundaries: Flag to include the 3D boundaries of the geometries as bounding boxes.
+    :param include_envelope: Flag to include the 2D envelope of the city objects as an extra geometry.
+    :param include_convex_hull: Flag to include the 2D convex hull of the city objects as an extra geometry.
+    """
+    context = cityjson_obj.get_context()
+    header = cityjson_obj.to_json()
+    del header["cj:hasVertices"]
+    del header["cj:hasCityObjects"]
+
+    with open_output(path) as jsonl_file:
+        jsonl_file.write(json.dumps(header, ensure_ascii=False) + "\n")
+        for feature in features:
+            data = {
+                "@context": context,
+                "@id": cityjson_obj.id,
+                "cj:hasCityObjects": [cityobj.to_json() for cityobj in convert_feature(cityjson_obj.alias, feature, cityjson_obj.transform, compact_coordinates, include_wkt, include_3d_boundaries, include_envelope, include_convex_hull)]
+            }
+            jsonl_file.write(json.dumps(data, ensure_ascii=False) + "\n")
+
+
+def write_jsonld_array(path: str, cityjson_obj: CityJSON, features: Iterator[Dict[str, Any]], formatted: bool, compact_coordinates: bool = False, include_wkt: bool = True, include_3d_boundaries: bool = True, include_envelope: bool = False, include_convex_hull: bool = False):
+    """
+    Write a single JSON-LD document, streaming the city objects of every feature into "cj:hasCityObjects".
+
+    The feature vertices are spilled to a temporary file while the city objects are written, and copied
+    into "cj:hasVertices" afterwards.
+
+    :param path: Path to save the JSON-LD to file.
+    :param cityjson_obj: CityJSON object holding the header.
+    :param features: Iterator over the CityJSONFeatures.
+    :param formatted: Flag indicating whether the content is written as formatted or not.
+    :param compact_coordinates: Flag to encode the points of the bounding boxes as JSON literals of coordinate arrays.
+    :param include_wkt: Flag to include the 2D boundaries of the geometries in WKT format.
+    :param include_3d_boundaries: Flag to include the 3D boundaries of the geometries as bounding boxes.
+    :param include_envelope: Flag to include the 2D envelope of the city objects as an extra geometry.
+    :param include_convex_hull: Flag to include the 2D convex hull of the city objects as an extra geometry.
+    """
+    with open_output(path) as json_file, tempfile.TemporaryFile('w+', encoding='utf-8') as vertices_file:
+        writer = JsonLdWriter(json_file, formatted)
+        writer.begin_object()
+        writer.write_value(cityjson_obj.get_context(), "@context")
+        writer.write_value(cityjson_obj.id, "@id")
+        writer.write_value("cj:CityJSON", "@type")
+        writer.write_value(cityjson_obj.type, "cj:type")
+        writer.write_value(cityjson_obj.version, "cj:version")
+
+        writer.begin_array("cj:hasCityObjects")
+        for feature in features:
+            writer.write_values(cityobj.to_json() for cityobj in convert_feature(cityjson_obj.alias, feature, cityjson_obj.transform, compact_coordinates, include_wkt, include_3d_boundaries, include_envelope, include_convex_hull))
+            vertices_file.write(json.dumps(feature["vertices"]) + "\n")
+        writer.end_array()
+
+        vertices_file.seek(0)
+        writer.begin_object("cj:hasVertices")
+        writer.begin_array("@list")
+        for line in vertices_file:
+            writer.write_values(Vertices(vertices=json.loads(line)).to_json()["@list"])
+        writer.end_array()
+        writer.end_object()
+
+        writer.write_value(cityjson_obj.transform.to_json(), "cj:hasTransform")
+        if cityjson_obj.metadata:
+            writer.write_value(cityjson_obj.metadata.to_json(), "cj:hasMetadata")
+        writer.end_object()
+
+
+def write_rdf(path: str, cityjson_obj: CityJSON, features: Iterator[Dict[str, Any]], output_format: str, compact_coordinates: bool = False, include_wkt: bool = True, include_3d_boundaries: bool = True, include_envelope: bool = False, include_convex_hull: bool = False):
+    """
+    Write the triples of the "array" JSON-LD document, streaming the city objects of every feature.
+
+    As with write_jsonld_array, the feature vertices are spilled to a temporary file while the city
+    objects are written, and written as the "cj:hasVertices" collection afterwards.
+
+    :param path: Path to save the triples to file.
+    :param cityjson_obj: CityJSON object holding the header.
+    :param features: Iterator over the CityJSONFeatures.
+    :param output_format: One of rdf_format_values.
+    :param compact_coordinates: Flag to encode the points of the bounding boxes as JSON literals of coordinate arrays.
+    :param include_wkt: Flag to include the 2D boundaries of the geometries in WKT format.
+    :param include_3d_boundaries: Flag to include the 3D boundaries of the geometries as bounding boxes.
+    :param include_envelope: Flag to include the 2D envelope of the city objects as an extra geometry.
+    :param include_convex_hull: Flag to include the 2D convex hull of the city objects as an extra geometry.
+    """
+    with open_output(path) as rdf_file, tempfile.TemporaryFile('w+', encoding='utf-8') as vertices_file:
+        writer = RdfWriter(rdf_file, output_format, cityjson_obj.get_context(), cityjson_obj.id)
+        subject = writer.write_node({
+            "@id": cityjson_obj.id,
+            "@type": "cj:CityJSON",
+            "cj:type": cityjson_obj.type,
+            "cj:version": cityjson_obj.version
+        })
+
+        for feature in features:
+            for cityobj in convert_feature(cityjson_obj.alias, feature, cityjson_obj.transform, compact_coordinates, include_wkt, include_3d_boundaries, include_envelope, include_convex_hull):
+                writer.write_property(subject, "cj:hasCityObjects", cityobj.to_json())
+            vertices_file.write(json.dumps(feature["vertices"]) + "\n")
+
+        vertices_file.seek(0)
+        writer.write_list(subject, writer.iri_term(writer.expand_iri("cj:hasVertices")),
+                          (vertex for line in vertices_file for chunk in Vertices(vertices=json.loads(line)).iter_json(1000) for vertex in chunk))
+
+        writer.write_property(subject, "cj:hasTransform", cityjson_obj.transform.to_json())
+        if cityjson_obj.metadata:
+            writer.write_property(subject, "cj:hasMetadata", cityjson_obj.metadata.to_json())
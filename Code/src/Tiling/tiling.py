@@ -0,0 +1,266 @@
+import json
+import math
+from itertools import chain
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from Cityobjects.Geometry.boundaryIndices import iter_boundary_indices
+from Cityobjects.cityObjectFamilies import group_families
+
+# 2D extent as (min_x, min_y, max_x, max_y)
+Extent = Tuple[float, float, float, float]
+
+# Identifier of the tile of the city objects without any geometry or geographical extent in their family
+unlocated_tile_id = "unlocated"
+
+
+class Tile:
+    """
+    A class to represent a tile of the output, holding whole families of city objects.
+
+    Attributes:
+        id (str): Identifier of the tile, used in its file name.
+        bounds (Optional[Extent]): Bounds of the grid cell or quadtree node, None for the unlocated tile.
+        cityobject_ids (List[str]): Identifiers of the city objects of the tile, in their original order.
+        extent (Optional[Extent]): Union of the extents of the city objects, which may overhang the bounds.
+    """
+
+    def __init__(self, id: str, bounds: Optional[Extent]):
+        self.id = id
+        self.bounds = bounds
+        self.cityobject_ids: List[str] = []
+        self.extent: Optional[Extent] = None
+
+    def add(self, cityobject_ids: List[str], extent: Optional[Extent]):
+        """
+        Add a family of city objects to the tile.
+
+        :param cityobject_ids: Identifiers of the city objects of the family.
+        :param extent: Extent of the family.
+        """
+        self.cityobject_ids.extend(cityobject_ids)
+        self.extent = union_extents([self.extent, extent])
+
+    def to_json(self, file_name: str) -> Dict[str, Any]:
+        """
+        Convert the Tile object to its entry in the manifest.
+
+        :param file_name: Name of the file the tile is written to.
+        :return: Entry of the tile in the manifest.
+        """
+        return {
+            "id": self.id,
+            "file": file_name,
+            "bounds": list(self.bounds) if self.bounds else None,
+            "extent": list(self.extent) if self.extent else None,
+            "cityobjects": len(self.cityobject_ids)
+        }
+
+
+def union_extents(extents: Iterable[Optional[Extent]]) -> Optional[Extent]:
+    """
+    Get the union of 2D extents.
+
+    :param extents: Extents, None ones are ignored.
+    :return: The union, or None if there is no extent.
+    """
+    extents = [extent for extent in extents if extent is not None]
+    if not extents:
+        return None
+    return (min(extent[0] for extent in extents), min(extent[1] for extent in extents),
+            max(extent[2] for extent in extents), max(extent[3] for extent in extents))
+
+
+def get_cityobject_extents(cityobjects: Dict[str, Any], real_vertices: np.ndarray) -> Dict[str, Optional[Extent]]:
+    """
+    Get the 2D extent of every CityObject.
+
+    The "geographicalExtent" of a CityObject is used when present. Otherwise the extent is computed from the
+    vertices of its geometries, for all the city objects at once with a single fancy index and reductions.
+
+    :param cityobjects: The "CityObjects" member of the CityJSON file.
+    :param real_vertices: The transformed vertices, see Transform.to_real_vertices.
+    :return: Extent of every CityObject, None if it has neither geometry nor geographical extent.
+    """
+    extents: Dict[str, Optional[Extent]] = {}
+    computed_ids: List[str] = []
+    computed_indices: List[List[int]] = []
+    for cityobject_id, cityobject in cityobjects.items():
+        geographical_extent = cityobject.get("geographicalExtent")
+        if geographical_extent:
+            min_x, min_y, _, max_x, max_y, _ = geographical_extent
+            extents[cityobject_id] = (min_x, min_y, max_x, max_y)
+            continue
+        indices = []
+        for geometry in cityobject.get("geometry", []):
+            indices.extend(iter_boundary_indices(geometry))
+        if indices:
+            computed_ids.append(cityobject_id)
+            computed_indices.append(indices)
+        else:
+            extents[cityobject_id] = None
+
+    if computed_ids:
+        lengths = np.fromiter((len(indices) for indices in computed_indices), dtype=np.intp, count=len(computed_ids))
+        indices = np.fromiter(chain.from_iterable(computed_indices), dtype=np.intp, count=int(lengths.sum()))
+        starts = np.zeros(len(computed_ids), dtype=np.intp)
+        np.cumsum(lengths[:-1], out=starts[1:])
+        coordinates = real_vertices[indices, :2]
+        minimums = np.minimum.reduceat(coordinates, starts).tolist()
+        maximums = np.maximum.reduceat(coordinates, starts).tolist()
+        for cityobject_id, (min_x, min_y), (max_x, max_y) in zip(computed_ids, minimums, maximums):
+            extents[cityobject_id] = (min_x, min_y, max_x, max_y)
+
+    return {cityobject_id: extents[cityobject_id] for cityobject_id in cityobjects}
+
+
+def get_center(extent: Extent) -> Tuple[float, float]:
+    """
+    Get the center of a 2D extent.
+
+    :param extent: The extent.
+    :return: The x and y of the center.
+    """
+    return (extent[0] + extent[2]) / 2, (extent[1] + extent[3]) / 2
+
+
+def to_grid_tiles(families: List[Tuple[List[str], Extent]], bounds: Extent, tile_size: float) -> List[Tile]:
+    """
+    Assign every family to the cell of a regular grid holding the center of its extent.
+
+    :param families: Families with their extent.
+    :param bounds: Extent of all the families, the grid starts at its minimum corner.
+    :param tile_size: Width and height of the cells, in the units of the coordinate reference system.
+    :return: The non-empty tiles, row by row.
+    """
+    tiles: Dict[Tuple[int, int], Tile] = {}
+    for cityobject_ids, extent in families:
+        center_x, center_y = get_center(extent)
+        column = int(math.floor((center_x - bounds[0]) / tile_size))
+        row = int(math.floor((center_y - bounds[1]) / tile_size))
+        if (row, column) not in tiles:
+            tiles[(row, column)] = Tile(f"{column}_{row}", (
+                bounds[0] + column * tile_size, bounds[1] + row * tile_size,
+                bounds[0] + (column + 1) * tile_size, bounds[1] + (row + 1) * tile_size))
+        tiles[(row, column)].add(cityobject_ids, extent)
+    return [tiles[key] for key in sorted(tiles)]
+
+
+def to_quadtree_tiles(families: List[Tuple[List[str], Extent]], bounds: Extent, max_tiles: int) -> List[Tile]:
+    """
+    Assign every family to a leaf of a quadtree by the center of its extent.
+
+    The leaf with the most city objects is split in four until another split could exceed max_tiles, so
+    dense areas get smaller tiles. The tiles are named by their quadtree path, the root being "0" and the
+    quadrants of a node adding 0 (south-west), 1 (south-east), 2 (north-west) or 3 (north-east).
+
+    :param families: Families with their extent.
+    :param bounds: Extent of all the families, the bounds of the root.
+    :param max_tiles: Maximum number of tiles.
+    :return: The non-empty tiles, in quadtree order.
+    """
+    # Leaves as [id, bounds, families, number of city objects, splittable]
+    leaves = [["0", bounds, families, sum(len(ids) for ids, _ in families), True]]
+    while len(leaves) + 3 <= max_tiles:
+        splittable = [leaf for leaf in leaves if leaf[4]]
+        if not splittable:
+            break
+        leaf = max(splittable, key=lambda leaf: leaf[3])
+        id, (min_x, min_y, max_x, max_y), leaf_families, _, _ = leaf
+        mid_x, mid_y = (min_x + max_x) / 2, (min_y + max_y) / 2
+        quadrants: List[List[Tuple[List[str], Extent]]] = [[], [], [], []]
+        for family in leaf_families:
+            center_x, center_y = get_center(family[1])
+            quadrants[(center_x >= mid_x) + 2 * (center_y >= mid_y)].append(family)
+        if max(len(quadrant) for quadrant in quadrants) == len(leaf_families):
+            # All the families would stay together, e.g. a single family or identical centers
+            leaf[4] = False
+            continue
+        quadrant_bounds = [(min_x, min_y, mid_x, mid_y), (mid_x, min_y, max_x, mid_y),
+                           (min_x, mid_y, mid_x, max_y), (mid_x, mid_y, max_x, max_y)]
+        index = leaves.index(leaf)
+        leaves[index:index + 1] = [[id + str(quadrant), quadrant_bounds[quadrant], quadrants[quadrant],
+                                    sum(len(ids) for ids, _ in quadrants[quadrant]), len(quadrants[quadrant]) > 1]
+                                   for quadrant in range(4) if quadrants[quadrant]]
+
+    tiles = []
+    for id, leaf_bounds, leaf_families, _, _ in leaves:
+        tile = Tile(id, leaf_bounds)
+        for cityobject_ids, extent in leaf_families:
+            tile.add(cityobject_ids, extent)
+        tiles.append(tile)
+    return tiles
+
+
+def to_tiles(cityobjects: Dict[str, Any], real_vertices: np.ndarray, tile_size: Optional[float] = None, max_tiles: Optional[int] = None) -> List[Tile]:
+    """
+    Split the CityObjects into spatial tiles, on a regular grid or a quadtree, keeping families together.
+
+    A family, a CityObject with its parents and children, is placed by the center of the union of the
+    extents of its members. Families without any extent go to a tile of their own, unlocated_tile_id.
+
+    :param cityobjects: The "CityObjects" member of the CityJSON file.
+    :param real_vertices: The transformed vertices, see Transform.to_real_vertices.
+    :param tile_size: Size of the cells of a regular grid.
+    :param max_tiles: Maximum number of tiles of a quadtree, used if tile_size is not given.
+    :return: The non-empty tiles, the city objects of every tile in their original order.
+    """
+    if tile_size is not None and tile_size <= 0:
+        raise ValueError("tile_size value must be positive")
+    if tile_size is None and (max_tiles is None or max_tiles < 1):
+        raise ValueError("max_tiles value must be at least 1")
+
+    extents = get_cityobject_extents(cityobjects, real_vertices)
+    order = {cityobject_id: index for index, cityobject_id in enumerate(cityobjects)}
+
+    located_families = []
+    unlocated_tile = Tile(unlocated_tile_id, None)
+    for family in group_families(cityobjects):
+        extent = union_extents(extents[cityobject_id] for cityobject_id in family)
+        if extent is None:
+            unlocated_tile.add(family, None)
+        else:
+            located_families.append((family, extent))
+
+    tiles = []
+    if located_families:
+        bounds = union_extents(extent for _, extent in located_families)
+        if tile_size is not None:
+            tiles = to_grid_tiles(located_families, bounds, tile_size)
+        else:
+            tiles = to_quadtree_tiles(located_families, bounds, max_tiles)
+    if unlocated_tile.cityobject_ids:
+        tiles.append(unlocated_tile)
+
+    for tile in tiles:
+        tile.cityobject_ids.sort(key=order.__getitem__)
+    return tiles
+
+
+def write_manifest(path: str, id: str, header_file_name: str, tiles: List[Tile], tile_file_names: List[str], output_format: str,
+                   tile_size: Optional[float] = None, max_tiles: Optional[int] = None):
+    """
+    Write the manifest of the tiles as JSON.
+
+    :param path: Path to save the manifest to file.
+    :param id: IRI of the CityJSON, shared by the header and all the tiles.
+    :param header_file_name: Name of the file of the header, holding the vertices, transform and metadata.
+    :param tiles: The tiles.
+    :param tile_file_names: Name of the file of every tile.
+    :param output_format: Output format of the files.
+    :param tile_size: Size of the cells of the grid, if tiled on a grid.
+    :param max_tiles: Maximum number of tiles of the quadtree, if tiled on a quadtree.
+    """
+    manifest = {
+        "id": id,
+        "output_format": output_format,
+        "scheme": "grid" if tile_size is not None else "quadtree",
+        "tile_size": tile_size,
+        "max_tiles": max_tiles if tile_size is None else None,
+        "bounds": union_extents(tile.bounds for tile in tiles),
+        "header": header_file_name,
+        "tiles": [tile.to_json(file_name) for tile, file_name in zip(tiles, tile_file_names)]
+    }
+    # Filter out None values
+    manifest = {key: value for key, value in manifest.items() if value is not None}
+    with open(path, 'w', encoding='utf-8') as manifest_file:
+        json.dump(manifest, manifest_file, indent=4)
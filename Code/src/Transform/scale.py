@@ -1,4 +1,3 @@
-import json
 from typing import Dict, Any
 
 class Scale:
@@ -14,7 +13,7 @@ class Scale:
         self.y = y
         self.z = z
 
-    def to_json(self) -> str:
+    def to_json(self) -> Dict[str, Any]:
         """
         Convert the Scale object to a JSON-LD representation.
 
@@ -35,5 +34,5 @@ class Scale:
                 "@type": "xsd:float"
             }
         }
-        return json.dumps(data, ensure_ascii=False)
+        return data
 
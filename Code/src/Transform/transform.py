@@ -1,4 +1,4 @@
-import json
+import numpy as np
 from typing import Union, List, Dict, Any, Optional
 from Transform.scale import Scale
 from Transform.translate import Translate
@@ -52,14 +52,26 @@ class Transform:
         else:
             raise TypeError("Translate should be either a Translate object or a list of 3 floats")
 
+    def to_real_vertices(self, vertices: Union[List[List[int]], np.ndarray]) -> np.ndarray:
+        """
+        Apply the transform to all the vertices at once.
+
+        :param vertices: List of vertex coordinates, or an array of shape (n, 3).
+        :return: Array of shape (n, 3) with the real-world coordinates of the vertices.
+        """
+        vertices_array = np.asarray(vertices, dtype=np.float64).reshape(-1, 3)
+        scale = np.array([self.scale.x, self.scale.y, self.scale.z], dtype=np.float64)
+        translate = np.array([self.translate.x, self.translate.y, self.translate.z], dtype=np.float64)
+        return vertices_array * scale + translate
+
     def to_json(self) -> Dict[str, Any]:
         """
         Convert the Transform object to a JSON-LD representation.
 
         :return: JSON-LD representation of the Transform object.
         """
-        scale_dict = json.loads(self.scale.to_json())
-        translate_dict = json.loads(self.translate.to_json())
+        scale_dict = self.scale.to_json()
+        translate_dict = self.translate.to_json()
         data = {
             "@type": "cj:Transform",
             "cj:hasScale": scale_dict,
@@ -1,4 +1,3 @@
-import json
 from typing import Dict, Any
 
 
@@ -15,7 +14,7 @@ class Translate:
         self.y = y
         self.z = z
 
-    def to_json(self) -> str:
+    def to_json(self) -> Dict[str, Any]:
         """
         Convert the Translate object to a JSON-LD representation.
 
@@ -36,4 +35,4 @@ class Translate:
                 "@type": "xsd:float"
             }
         }
-        return json.dumps(data, ensure_ascii=False)
+        return data
@@ -0,0 +1,214 @@
+import base64
+import gzip
+import http.client
+import io
+import queue
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, Optional
+from urllib.parse import quote, unquote, urlsplit
+from Cityobjects.serializedCityObject import SerializedCityObject
+from Writer.rdfWriter import RdfWriter
+
+# Responses after which a batch is sent again, the others are errors
+retry_status_codes = {408, 429, 500, 502, 503, 504}
+
+
+class GraphStoreUploader:
+    """
+    A class to upload the triples of a conversion to a SPARQL Graph Store Protocol endpoint, such as the
+    /data endpoint of a Fuseki dataset, while the city objects are still being converted.
+
+    The triples are sent as gzipped N-Triples in batches of city objects to the named graph of the CityJSON
+    IRI. The first batch, with the CityJSON node, its vertices, transform and metadata, replaces the graph
+    (PUT), the next ones are added to it (POST) once it succeeded, so uploading the same file again does not
+    duplicate its triples. Every blank node stays in the batch of the node it belongs to, the vertices
+    collection is therefore sent as a whole with the first batch.
+
+    The batches are sent by a fixed number of threads, each keeping its own keep-alive connection, through a
+    bounded queue, so the conversion waits for the upload instead of buffering the whole output. A batch
+    failing with a network error or a transient status (see retry_status_codes) is sent again after an
+    exponential backoff.
+
+    Arguments:
+        url (str): URL of the Graph Store Protocol endpoint, optionally with the user and password for basic authentication.
+        graph (str): IRI of the named graph to upload to.
+        context (Dict[str, str]): The prefixes of the JSON-LD context, see CityJSON.get_context.
+        batch_size (int): Number of city objects per batch.
+        concurrency (int): Number of batches sent at the same time.
+        retries (int): Number of times a batch is sent again before the upload fails.
+        backoff (float): Seconds to wait before the first retry, doubled for every next one.
+        timeout (float): Seconds to wait for the endpoint to respond to a batch.
+        compress (bool): Flag to gzip the request bodies.
+    """
+
+    def __init__(self, url: str, graph: str, context: Dict[str, str], batch_size: int = 500, concurrency: int = 2,
+                 retries: int = 5, backoff: float = 1.0, timeout: float = 120.0, compress: bool = True):
+        if batch_size < 1:
+            raise ValueError("batch_size value must be at least 1")
+        if concurrency < 1:
+            raise ValueError("concurrency value must be at least 1")
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError("url value must be an http or https URL")
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port
+        separator = "&" if parts.query else "?"
+        self.target = f"{parts.path or '/'}{'?' + parts.query if parts.query else ''}{separator}graph={quote(graph, safe='')}"
+        self.headers = {"Content-Type": "application/n-triples; charset=utf-8"}
+        if compress:
+            self.headers["Content-Encoding"] = "gzip"
+        if parts.username is not None:
+            credentials = f"{unquote(parts.username)}:{unquote(parts.password or '')}"
+            self.headers["Authorization"] = "Basic " + base64.b64encode(credentials.encode("utf-8")).decode("ascii")
+        self.context = context
+        self.batch_size = batch_size
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.compress = compress
+
+        self.buffer = io.StringIO()
+        self.writer = RdfWriter(self.buffer, "nt", context)
+        self.batch_cityobjects = 0
+        self.batches: queue.Queue = queue.Queue(maxsize=2 * concurrency)
+        # Set once the graph is replaced by the first batch, or the upload failed
+        self.graph_replaced = threading.Event()
+        self.error: Optional[BaseException] = None
+        self.lock = threading.Lock()
+        self.stats = {"batches": 0, "cityobjects": 0, "bytes": 0, "retries": 0}
+        self.threads = [threading.Thread(target=self._send_batches, daemon=True) for _ in range(concurrency)]
+        for thread in self.threads:
+            thread.start()
+
+    def _connect(self) -> http.client.HTTPConnection:
+        if self.scheme == "https":
+            return http.client.HTTPSConnection(self.host, self.port, timeout=self.timeout)
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def _send_batches(self):
+        """
+        Send the batches of the queue until the end of the upload, on a connection kept for the whole upload.
+        """
+        connection = self._connect()
+        try:
+            while True:
+                batch = self.batches.get()
+                if batch is None:
+                    return
+                method, body, cityobject_count = batch
+                if method == "POST":
+                    self.graph_replaced.wait()
+                if self.error is None:
+                    try:
+                        connection = self._send(connection, method, body)
+                        with self.lock:
+                            self.stats["batches"] += 1
+                            self.stats["cityobjects"] += cityobject_count
+                            self.stats["bytes"] += len(body)
+                    except BaseException as error:
+                        with self.lock:
+                            if self.error is None:
+                                self.error = error
+                if method == "PUT":
+                    self.graph_replaced.set()
+        finally:
+            connection.close()
+
+    def _send(self, connection: http.client.HTTPConnection, method: str, body: bytes) -> http.client.HTTPConnection:
+        """
+        Send a batch, again after a network error or a transient status.
+
+        :param connection: The connection of the thread.
+        :param method: "PUT" to replace the graph, "POST" to add to it.
+        :param body: The request body.
+        :return: The connection to use for the next batch, a new one if the given one failed.
+        """
+        attempt = 0
+        while True:
+            try:
+                connection.request(method, self.target, body, self.headers)
+                response = connection.getresponse()
+                # The response is read completely to reuse the connection
+                response_body = response.read()
+            except (OSError, http.client.HTTPException) as error:
+                failure = f"{type(error).__name__}: {error}"
+                connection.close()
+                connection = self._connect()
+            else:
+                if 200 <= response.status < 300:
+                    return connection
+                failure = f"{response.status} {response.reason}: {response_body[:200].decode('utf-8', 'replace')}"
+                if response.status not in retry_status_codes:
+                    raise ConnectionError(f"The endpoint rejected a batch with {failure}")
+            if attempt >= self.retries:
+                raise ConnectionError(f"A batch could not be uploaded after {attempt + 1} attempts, {failure}")
+            with self.lock:
+                self.stats["retries"] += 1
+            time.sleep(self.backoff * 2 ** attempt)
+            attempt += 1
+
+    def _submit(self, method: str):
+        """
+        Queue the triples written to the buffer as a batch, waiting while the queue is full.
+
+        :param method: "PUT" to replace the graph, "POST" to add to it.
+        """
+        text = self.buffer.getvalue()
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        # After a failed batch the next ones are dropped, the error is raised by close
+        if self.error is not None:
+            self.batch_cityobjects = 0
+            return
+        body = text.encode("utf-8")
+        if self.compress:
+            body = gzip.compress(body, compresslevel=6)
+        self.batches.put((method, body, self.batch_cityobjects))
+        self.batch_cityobjects = 0
+
+    def upload_header(self, citjson: Any) -> str:
+        """
+        Queue the first batch, replacing the graph with the CityJSON node, its vertices, transform and metadata.
+
+        :param citjson: The CityJSON object.
+        :return: The serialized subject of the CityJSON node, see upload_cityobjects.
+        """
+        subject = citjson.write_rdf_node(self.writer)
+        citjson.write_rdf_members(self.writer, subject)
+        self._submit("PUT")
+        return subject
+
+    def upload_cityobjects(self, subject: str, cityobjects: Iterable[Any]) -> Iterator[Any]:
+        """
+        Produce the JSON-LD representation of the city objects, while queuing their triples in batches of batch_size.
+
+        :param subject: The serialized subject of the CityJSON node the city objects belong to.
+        :param cityobjects: The city objects.
+        :return: Iterator over the city objects.
+        """
+        for cityobj in cityobjects:
+            data = cityobj.to_json()
+            self.writer.write_property(subject, "cj:hasCityObjects", data)
+            self.batch_cityobjects += 1
+            if self.batch_cityobjects >= self.batch_size:
+                self._submit("POST")
+            yield SerializedCityObject(data)
+        if self.batch_cityobjects:
+            self._submit("POST")
+
+    def close(self) -> Dict[str, int]:
+        """
+        Wait for the queued batches to be sent and close the connections.
+
+        :return: Number of "batches", "cityobjects", "bytes" sent and "retries".
+        """
+        for _ in self.threads:
+            self.batches.put(None)
+        for thread in self.threads:
+            thread.join()
+        if self.error is not None:
+            raise self.error
+        return self.stats
+
@@ -1,18 +1,20 @@
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 
 class Vertex:
-    def __init__(self, x: int, y: int, z: int):
+    def __init__(self, x: int, y: int, z: int, id: Optional[str] = None):
         """
         Initialize the Vertex object with x, y, and z coordinates.
 
         :param x: X coordinate.
         :param y: Y coordinate.
         :param z: Z coordinate.
+        :param id: IRI of the vertex, for the boundaries to refer to it, or None for a blank node.
         """
         self.x = x
         self.y = y
         self.z = z
+        self.id = id
 
     def to_json(self) -> Dict[str, Any]:
         """
@@ -35,4 +37,6 @@ class Vertex:
                 "@type": "xsd:integer"
             },
         }
+        if self.id is not None:
+            data = {"@id": self.id, **data}
         return data
@@ -0,0 +1,132 @@
+import base64
+import bisect
+import json
+from typing import Any, Dict, Iterable, List, Union
+import numpy as np
+
+# Encodings of the vertices of the CityJSON node: "list" for the cj:hasVertices collection of Vertex nodes,
+# "json" and "base64" for cj:hasVertexBlock nodes holding the coordinates of consecutive vertices as one literal
+vertices_encodings = ["list", "json", "base64"]
+
+# Datatype of the base64 literals, the little-endian signed 64-bit x, y, z of every vertex of the block
+int64_array_datatype = "cj:int64ArrayBase64"
+int64_array_datatype_iri = "https://www.cityjson.org/ont/cityjson.ttl#int64ArrayBase64"
+rdf_json_datatype_iri = "http://www.w3.org/1999/02/22-rdf-syntax-ns#JSON"
+
+
+def encode_vertex_block(vertices: np.ndarray, start_index: int, encoding: str) -> Dict[str, Any]:
+    """
+    Convert consecutive vertices to the JSON-LD representation of a vertex block.
+
+    :param vertices: The vertices of the block, an int64 array of shape (n, 3).
+    :param start_index: Index of the first vertex of the block in the vertices of the CityJSON.
+    :param encoding: "json" for a JSON literal of coordinate arrays, "base64" for a base64 literal of the coordinates.
+    :return: JSON-LD representation of the vertex block.
+    """
+    if encoding == "json":
+        values = {"@type": "@json", "@value": vertices.tolist()}
+    elif encoding == "base64":
+        values = {"@type": int64_array_datatype,
+                  "@value": base64.b64encode(vertices.astype('<i8', copy=False).tobytes()).decode("ascii")}
+    else:
+        raise ValueError(f"encoding value must be one of {vertices_encodings[1:]}")
+    return {
+        "@type": "cj:VertexBlock",
+        "cj:startIndex": {"@value": int(start_index), "@type": "xsd:integer"},
+        "cj:vertexCount": {"@value": len(vertices), "@type": "xsd:integer"},
+        "cj:vertexValues": values
+    }
+
+
+def decode_vertex_values(value: Union[str, List[List[int]]], datatype: str) -> np.ndarray:
+    """
+    Decode the coordinates of a vertex block.
+
+    :param value: The value of cj:vertexValues: the coordinate arrays of a JSON-LD "@json" value, or the lexical
+        form of the literal.
+    :param datatype: The datatype of the literal, "@json", rdf:JSON or cj:int64ArrayBase64, compacted or expanded.
+    :return: The vertices, an int64 array of shape (n, 3).
+    """
+    if datatype in (int64_array_datatype, int64_array_datatype_iri):
+        return np.frombuffer(base64.b64decode(value), dtype='<i8').astype(np.int64).reshape(-1, 3)
+    if datatype in ("@json", "rdf:JSON", rdf_json_datatype_iri):
+        if isinstance(value, str):
+            value = json.loads(value)
+        return np.array(value, dtype=np.int64).reshape(-1, 3)
+    raise ValueError(f"Unknown datatype of vertex values: {datatype}")
+
+
+class VertexBlockIndex:
+    """
+    A class to fetch ranges of vertices by index from the vertex blocks of a CityJSON node, decoding only
+    the blocks overlapping the range instead of materializing all the vertices.
+
+    Arguments:
+        starts (List[int]): Index of the first vertex of every block, sorted.
+        counts (List[int]): Number of vertices of every block.
+        values (List[Tuple[Any, str]]): The undecoded value and datatype of every block.
+    """
+
+    def __init__(self, blocks: Iterable[Dict[str, Any]]):
+        """
+        Index the vertex blocks.
+
+        :param blocks: The JSON-LD representations of the vertex blocks, see encode_vertex_block, in any order.
+        """
+        entries = []
+        for block in blocks:
+            values = block["cj:vertexValues"]
+            entries.append((int(block["cj:startIndex"]["@value"]), int(block["cj:vertexCount"]["@value"]),
+                            (values["@value"], values["@type"])))
+        entries.sort(key=lambda entry: entry[0])
+        self.starts = [entry[0] for entry in entries]
+        self.counts = [entry[1] for entry in entries]
+        self.values = [entry[2] for entry in entries]
+
+    def __len__(self) -> int:
+        return self.starts[-1] + self.counts[-1] if self.starts else 0
+
+    def get_range(self, start: int, stop: int) -> np.ndarray:
+        """
+        Get the vertices from index start to stop (excluded).
+
+        :param start: Index of the first vertex.
+        :param stop: Index after the last vertex.
+        :return: The vertices, an int64 array of shape (stop - start, 3).
+        """
+        if start < 0 or stop > len(self) or start > stop:
+            raise ValueError(f"Vertex range {start}:{stop} is out of the {len(self)} vertices")
+        parts = []
+        block = max(bisect.bisect_right(self.starts, start) - 1, 0)
+        while block < len(self.starts) and self.starts[block] < stop:
+            block_start = self.starts[block]
+            if block_start + self.counts[block] > start:
+                vertices = decode_vertex_values(*self.values[block])
+                parts.append(vertices[max(start - block_start, 0):stop - block_start])
+            block += 1
+        if not parts:
+            return np.empty((0, 3), dtype=np.int64)
+        vertices = np.concatenate(parts)
+        if len(vertices) != stop - start:
+            raise ValueError(f"Vertex blocks do not cover the vertex range {start}:{stop}")
+        return vertices
+
+    def get_vertices(self, indices: Iterable[int]) -> np.ndarray:
+        """
+        Get the vertices at the given indices, decoding every block needed once.
+
+        :param indices: Indices of the vertices.
+        :return: The vertices, an int64 array of shape (n, 3).
+        """
+        indices = np.fromiter(indices, dtype=np.int64)
+        vertices = np.empty((len(indices), 3), dtype=np.int64)
+        blocks = np.searchsorted(self.starts, indices, side="right") - 1
+        for block in np.unique(blocks):
+            if block < 0 or block >= len(self.starts):
+                raise ValueError("Vertex index is out of the vertex blocks")
+            selected = blocks == block
+            offsets = indices[selected] - self.starts[block]
+            if offsets.max() >= self.counts[block]:
+                raise ValueError("Vertex index is out of the vertex blocks")
+            vertices[selected] = decode_vertex_values(*self.values[block])[offsets]
+        return vertices
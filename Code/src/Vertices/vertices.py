@@ -1,40 +1,125 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional, Union
+import numpy as np
 from Vertices.vertex import Vertex
+from Vertices.vertexBlocks import encode_vertex_block, vertices_encodings
+
+# Term of the JSON-LD context prefixing the IRIs of the vertices, see CityJSON.get_context
+vertex_term = "v"
 
 class Vertices:
-    def __init__(self, vertices: List[List[int]]):
+    def __init__(self, vertices: Union[List[List[int]], np.ndarray], vertex_prefix: Optional[str] = None, encoding: str = "list", block_size: int = 1000):
         """
         Initialize the Vertices object with a list of vertex coordinates.
 
-        :param vertices: List of vertex coordinates.
+        :param vertices: List of vertex coordinates, or an array of shape (n, 3).
+        :param vertex_prefix: Prefix of the IRIs of the vertices, followed by their index, see get_vertex_prefix, or None
+            for blank nodes.
+        :param encoding: "list" for the collection of Vertex nodes of "cj:hasVertices", "json" or "base64" for the
+            vertex blocks of "cj:hasVertexBlock", see Vertices.vertexBlocks.
+        :param block_size: Number of vertices per vertex block.
         """
+        if encoding not in vertices_encodings:
+            raise ValueError(f"encoding value must be one of {vertices_encodings}")
+        if block_size < 1:
+            raise ValueError("block_size value must be at least 1")
         self.vertices = self.to_vertices(vertices)
+        self.vertex_prefix = vertex_prefix
+        self.encoding = encoding
+        self.block_size = block_size
+
+    @staticmethod
+    def get_vertex_prefix() -> str:
+        """
+        Get the prefix of the IRIs of the vertices, "v:" giving "v:1234" for the vertex at index 1234.
+
+        The term is bound to the namespace of the vertices of the CityJSON in the context, see get_vertex_namespace,
+        so vertices of different CityJSON files with the same base URL get different IRIs.
 
-    def to_vertices(self, vertices: List[List[int]]) -> List[Vertex]:
+        :return: The prefix.
         """
-        Convert a list of vertex coordinates to a list of Vertex objects.
+        return f"{vertex_term}:"
 
-        :param vertices: List of vertex coordinates.
-        :return: List of Vertex objects.
+    @staticmethod
+    def get_vertex_namespace(cityjson_iri: str) -> str:
         """
-        vertices_list = []
-        if isinstance(vertices, list):
-            for vertex in vertices:
-                if isinstance(vertex, list) and len(vertex) == 3 and all(isinstance(coordinate, int) for coordinate in vertex):
-                    vertices_list.append(Vertex(vertex[0], vertex[1], vertex[2]))
-                else:
-                    raise ValueError("Each vertex should be a list of 3 integers")
-            return vertices_list
-        else:
+        Get the namespace of the IRIs of the vertices of a CityJSON, e.g. "https://example.com/city/v/" giving
+        "https://example.com/city/v/1234" for the vertex at index 1234.
+
+        :param cityjson_iri: IRI of the CityJSON.
+        :return: The namespace.
+        """
+        return f"{cityjson_iri}/v/"
+
+    def to_vertices(self, vertices: Union[List[List[int]], np.ndarray]) -> np.ndarray:
+        """
+        Convert a list of vertex coordinates to an int64 array of shape (n, 3).
+
+        The coordinates are checked in a single pass over the array instead of vertex by vertex.
+
+        :param vertices: List of vertex coordinates, or an array of shape (n, 3).
+        :return: Array of vertex coordinates.
+        """
+        if not isinstance(vertices, (list, np.ndarray)):
             raise TypeError("Vertices should be a list of lists of 3 integers")
+        if len(vertices) == 0:
+            return np.empty((0, 3), dtype=np.int64)
+
+        try:
+            vertices_array = np.asarray(vertices)
+        except ValueError:
+            # Vertices of different lengths
+            raise ValueError("Each vertex should be a list of 3 integers")
+        if vertices_array.ndim != 2 or vertices_array.shape[1] != 3 or not np.issubdtype(vertices_array.dtype, np.integer):
+            raise ValueError("Each vertex should be a list of 3 integers")
+        return vertices_array.astype(np.int64, copy=False)
+
+    def __len__(self) -> int:
+        return len(self.vertices)
 
-    def to_json(self) -> Dict[str, Any]:
+    def get_property(self) -> str:
         """
-        Convert the Vertices object to a JSON-LD representation.
+        Get the property of the CityJSON node holding the vertices, depending on the encoding.
+
+        :return: "cj:hasVertices" for the list encoding, "cj:hasVertexBlock" for the others.
+        """
+        return "cj:hasVertices" if self.encoding == "list" else "cj:hasVertexBlock"
+
+    def to_json(self) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        """
+        Convert the Vertices object to a JSON-LD representation: the "@list" of the vertices, or the vertex
+        blocks with the json and base64 encodings.
 
         :return: JSON-LD representation of the Vertices object.
         """
+        if self.encoding != "list":
+            return list(self.iter_blocks())
         data = {
-            "@list": [vertex.to_json() for vertex in self.vertices]
+            "@list": [vertex for chunk in self.iter_json(10000) for vertex in chunk]
         }
         return data
+
+    def iter_blocks(self) -> Iterator[Dict[str, Any]]:
+        """
+        Convert the Vertices object to the JSON-LD representations of its vertex blocks, block by block.
+
+        :return: Iterator over the vertex blocks, see encode_vertex_block.
+        """
+        for start in range(0, len(self.vertices), self.block_size):
+            yield encode_vertex_block(self.vertices[start:start + self.block_size], start, self.encoding)
+
+    def iter_json(self, chunk_size: int) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Convert the Vertices object to the items of its JSON-LD "@list", chunk by chunk.
+
+        Only the vertices of the current chunk are converted to Python objects.
+
+        :param chunk_size: Number of vertices per chunk.
+        :return: Iterator over lists of JSON-LD representations of the vertices.
+        """
+        prefix = self.vertex_prefix
+        for start in range(0, len(self.vertices), chunk_size):
+            chunk = self.vertices[start:start + chunk_size].tolist()
+            if prefix is None:
+                yield [Vertex(x, y, z).to_json() for x, y, z in chunk]
+            else:
+                yield [Vertex(x, y, z, f"{prefix}{index}").to_json() for index, (x, y, z) in enumerate(chunk, start)]
@@ -0,0 +1,115 @@
+import gzip
+import os
+import queue
+import threading
+from typing import List, Optional, Tuple
+
+# Extension of the output files compressed with gzip
+compressed_extension = ".gz"
+
+
+class BackgroundWriter:
+    """
+    A class to write text to a file from a background thread, so the city objects are converted and
+    serialized while the previous output is encoded, compressed and written.
+
+    The text is gathered in chunks handed to the thread through a bounded queue: when the disk or the
+    compression is slower than the conversion, writing waits for a free slot instead of buffering the
+    whole output. The written bytes are the UTF-8 encoding of the text, gzipped when compress is set.
+
+    Arguments:
+        path (str): Path of the file to write.
+        compress (bool): Flag to gzip the file.
+        chunk_size (int): Number of characters gathered before a chunk is handed to the thread.
+        max_chunks (int): Number of chunks waiting to be written before writing blocks.
+    """
+
+    def __init__(self, path: str, compress: bool = False, chunk_size: int = 1 << 20, max_chunks: int = 8):
+        self.file = gzip.open(path, 'wb', compresslevel=6) if compress else open(path, 'wb')
+        self.chunk_size = chunk_size
+        self.pending: List[str] = []
+        self.pending_size = 0
+        self.chunks: queue.Queue = queue.Queue(maxsize=max_chunks)
+        self.error: Optional[BaseException] = None
+        self.thread = threading.Thread(target=self._write_chunks, daemon=True)
+        self.thread.start()
+
+    def _write_chunks(self):
+        while (chunk := self.chunks.get()) is not None:
+            # After a failure the remaining chunks are dropped, the error is raised by the next write or close
+            if self.error is None:
+                try:
+                    self.file.write(chunk.encode('utf-8'))
+                except BaseException as error:
+                    self.error = error
+
+    def _flush(self):
+        if self.error is not None:
+            raise self.error
+        self.chunks.put("".join(self.pending))
+        self.pending = []
+        self.pending_size = 0
+
+    def write(self, text: str) -> int:
+        """
+        Write text, handing it to the background thread once a chunk is complete.
+
+        :param text: The text.
+        :return: Number of characters written.
+        """
+        self.pending.append(text)
+        self.pending_size += len(text)
+        if self.pending_size >= self.chunk_size:
+            self._flush()
+        return len(text)
+
+    def close(self):
+        """
+        Write the remaining text, wait for the background thread and close the file.
+        """
+        try:
+            if self.pending:
+                self._flush()
+        finally:
+            self.chunks.put(None)
+            self.thread.join()
+            self.file.close()
+        if self.error is not None:
+            raise self.error
+
+    def __enter__(self) -> 'BackgroundWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+            return
+        # The original exception is raised rather than a failure to write the partial output
+        try:
+            self.close()
+        except BaseException:
+            pass
+
+
+def open_output(path: str) -> BackgroundWriter:
+    """
+    Open an output file for writing in the background, compressed with gzip if its name ends with ".gz".
+
+    :param path: Path of the output file.
+    :return: The writer.
+    """
+    return BackgroundWriter(path, path.endswith(compressed_extension))
+
+
+def split_output_path(path: str) -> Tuple[str, str]:
+    """
+    Split the path of an output file into its stem and its extension, keeping ".gz" with the extension so
+    files derived from it are compressed as well, e.g. "city.jsonld.gz" gives "city" and ".jsonld.gz".
+
+    :param path: Path of the output file.
+    :return: The stem and the extension.
+    """
+    if path.endswith(compressed_extension):
+        stem, extension = os.path.splitext(path[:-len(compressed_extension)])
+        return stem, extension + compressed_extension
+    return os.path.splitext(path)
@@ -0,0 +1,128 @@
+import json
+from typing import Any, Iterable, List, Optional, TextIO
+
+
+class JsonLdWriter:
+    """
+    A class to write a JSON-LD document incrementally to a file handle.
+
+    Members and array items are written as soon as they are produced, so the document never has to be
+    held in memory as a whole. The written bytes are identical to json.dump with ensure_ascii=False,
+    either compact or with an indent of 4 when formatted.
+
+    Arguments:
+        file (TextIO): The file handle to write to.
+        formatted (bool): Flag indicating whether the content is written as formatted or not.
+    """
+
+    indent = 4
+
+    def __init__(self, file: TextIO, formatted: bool):
+        self.file = file
+        self.formatted = formatted
+        # One entry per open container: [is_object, number of entries written]
+        self.stack: List[List[Any]] = []
+
+    def _newline(self, depth: int) -> str:
+        return "\n" + " " * (self.indent * depth)
+
+    def _dumps(self, value: Any) -> str:
+        """
+        Serialize a value the same way json.dump would at the current depth.
+
+        :param value: The JSON value.
+        :return: The serialized value.
+        """
+        if not self.formatted:
+            return json.dumps(value, ensure_ascii=False)
+        # Strings never contain raw newlines once encoded, so only structural newlines are indented
+        return json.dumps(value, indent=self.indent, ensure_ascii=False).replace("\n", self._newline(len(self.stack)))
+
+    def _separator(self) -> str:
+        """
+        Return what has to precede the next entry of the innermost container and count the entry.
+
+        :return: The separator.
+        """
+        if not self.stack:
+            return ""
+        container = self.stack[-1]
+        container[1] += 1
+        if self.formatted:
+            return ("," if container[1] > 1 else "") + self._newline(len(self.stack))
+        return ", " if container[1] > 1 else ""
+
+    def _prefix(self, key: Optional[str]) -> str:
+        """
+        Return the separator and, inside an object, the member name preceding the next entry.
+
+        :param key: Member name, required inside an object and not allowed inside an array.
+        :return: The prefix.
+        """
+        in_object = bool(self.stack) and self.stack[-1][0]
+        if in_object and key is None:
+            raise ValueError("A key is required to write a member of an object")
+        if not in_object and key is not None:
+            raise ValueError("A key can only be used inside an object")
+        prefix = self._separator()
+        if key is not None:
+            prefix += json.dumps(key, ensure_ascii=False) + ": "
+        return prefix
+
+    def _begin(self, bracket: str, is_object: bool, key: Optional[str]):
+        self.file.write(self._prefix(key) + bracket)
+        self.stack.append([is_object, 0])
+
+    def _end(self, bracket: str, is_object: bool):
+        if not self.stack or self.stack[-1][0] != is_object:
+            raise ValueError("Closing bracket does not match the open container")
+        _, count = self.stack.pop()
+        if self.formatted and count:
+            self.file.write(self._newline(len(self.stack)) + bracket)
+        else:
+            self.file.write(bracket)
+
+    def begin_object(self, key: Optional[str] = None):
+        """
+        Open an object, as a member of the enclosing object when a key is given.
+
+        :param key: Member name of the object.
+        """
+        self._begin("{", True, key)
+
+    def end_object(self):
+        """
+        Close the innermost open object.
+        """
+        self._end("}", True)
+
+    def begin_array(self, key: Optional[str] = None):
+        """
+        Open an array, as a member of the enclosing object when a key is given.
+
+        :param key: Member name of the array.
+        """
+        self._begin("[", False, key)
+
+    def end_array(self):
+        """
+        Close the innermost open array.
+        """
+        self._end("]", False)
+
+    def write_value(self, value: Any, key: Optional[str] = None):
+        """
+        Write a complete JSON value, as a member of the enclosing object when a key is given.
+
+        :param value: The JSON value.
+        :param key: Member name of the value.
+        """
+        self.file.write(self._prefix(key) + self._dumps(value))
+
+    def write_values(self, values: Iterable[Any]):
+        """
+        Write a chunk of values into the innermost open array with a single write.
+
+        :param values: The JSON values.
+        """
+        self.file.write("".join(self._prefix(None) + self._dumps(value) for value in values))
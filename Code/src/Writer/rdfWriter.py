@@ -0,0 +1,278 @@
+import json
+import math
+import re
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Optional, TextIO
+
+rdf_format_values = ["nt", "nq", "ttl"]
+
+RDF = "http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+XSD = "http://www.w3.org/2001/XMLSchema#"
+
+# Characters that have to be escaped inside an IRI reference
+iri_escape_pattern = re.compile(r'[\x00-\x20<>"{}|^`\\]')
+# Prefixes and local names that can be written as a prefixed name in Turtle without escaping
+turtle_prefix_pattern = re.compile(r'^[A-Za-z]([A-Za-z0-9_.-]*[A-Za-z0-9_-])?$')
+turtle_local_pattern = re.compile(r'^[A-Za-z0-9_]([A-Za-z0-9_.-]*[A-Za-z0-9_-])?$')
+
+literal_escapes = {"\\": "\\\\", '"': '\\"', "\n": "\\n", "\r": "\\r"}
+
+
+class RdfWriter:
+    """
+    A class to write the triples of a JSON-LD representation directly to a file handle, as
+    N-Triples, N-Quads or Turtle.
+
+    The JSON-LD produced by the to_json methods is turned into the same triples a JSON-LD processor
+    expands it to: compact IRIs are expanded with the context, nested objects without "@id" become
+    blank nodes, "@list" becomes an RDF collection and "@json" values become rdf:JSON literals. Only
+    the JSON-LD features used by the conversion are supported. Blank node labels are numbered in the
+    order they are written, so the same input always gives the same output.
+
+    Arguments:
+        file (TextIO): The file handle to write to.
+        output_format (str): One of rdf_format_values.
+        context (Dict[str, str]): The prefixes of the JSON-LD context, see CityJSON.get_context.
+        graph (Optional[str]): IRI of the named graph the quads are written to, used with "nq".
+    """
+
+    def __init__(self, file: TextIO, output_format: str, context: Dict[str, str], graph: Optional[str] = None):
+        if output_format not in rdf_format_values:
+            raise ValueError(f"output_format value must be one of {', '.join(rdf_format_values)}")
+        self.file = file
+        self.output_format = output_format
+        self.context = context
+        self.blank_node_count = 0
+        self.prefixes: Dict[str, str] = {}
+        self.end = " .\n"
+        if output_format == "nq":
+            if graph is None:
+                raise ValueError("A graph IRI is required to write N-Quads")
+            self.end = f" {self.iri_term(self.expand_iri(graph))} .\n"
+        if output_format == "ttl":
+            self.prefixes = {prefix: iri for prefix, iri in context.items() if turtle_prefix_pattern.match(prefix)}
+            self.file.write("".join(f"@prefix {prefix}: {self.iri_term(iri)} .\n"
+                                    for prefix, iri in self.prefixes.items()) + "\n")
+
+    def expand_iri(self, value: str) -> Optional[str]:
+        """
+        Expand a compact IRI with the prefixes of the context.
+
+        :param value: A compact IRI, an absolute IRI or a term.
+        :return: The absolute IRI, or None if the value is a term the context does not define.
+        """
+        prefix, colon, suffix = value.partition(":")
+        if not colon:
+            return None
+        if prefix in self.context and not suffix.startswith("//"):
+            return self.context[prefix] + suffix
+        return value
+
+    def iri_term(self, iri: str) -> str:
+        """
+        Serialize an IRI, as a prefixed name in Turtle when possible.
+
+        :param iri: An absolute IRI.
+        :return: The serialized IRI.
+        """
+        for prefix, namespace in self.prefixes.items():
+            if iri.startswith(namespace) and turtle_local_pattern.match(iri[len(namespace):]):
+                return f"{prefix}:{iri[len(namespace):]}"
+        return "<" + iri_escape_pattern.sub(lambda match: f"\\u{ord(match.group()):04X}", iri) + ">"
+
+    def literal_term(self, value: str, datatype: Optional[str] = None) -> str:
+        """
+        Serialize a literal.
+
+        :param value: The lexical form of the literal.
+        :param datatype: The absolute IRI of the datatype, None for a plain string.
+        :return: The serialized literal.
+        """
+        term = '"' + "".join(literal_escapes.get(char, char) for char in value) + '"'
+        if datatype and datatype != XSD + "string":
+            term += "^^" + self.iri_term(datatype)
+        return term
+
+    def new_blank_node(self) -> str:
+        """
+        Create a new blank node label.
+
+        :return: The serialized blank node.
+        """
+        self.blank_node_count += 1
+        return f"_:b{self.blank_node_count - 1}"
+
+    def write_triple(self, subject: str, predicate: str, object: str):
+        """
+        Write a triple of serialized terms.
+
+        :param subject: The serialized subject.
+        :param predicate: The serialized predicate.
+        :param object: The serialized object.
+        """
+        self.file.write(f"{subject} {predicate} {object}{self.end}")
+
+    def write_node(self, data: Dict[str, Any]) -> str:
+        """
+        Write the triples of a JSON-LD node object and of every node nested in it.
+
+        :param data: The JSON-LD node object.
+        :return: The serialized subject of the node.
+        """
+        subject = self.iri_term(self.expand_iri(data["@id"])) if "@id" in data else self.new_blank_node()
+        for key, value in data.items():
+            if key == "@type":
+                types = value if isinstance(value, list) else [value]
+                for type in types:
+                    self.write_triple(subject, self.iri_term(RDF + "type"), self.iri_term(self.expand_iri(type)))
+            elif not key.startswith("@"):
+                self.write_property(subject, key, value)
+        return subject
+
+    def write_property(self, subject: str, key: str, value: Any):
+        """
+        Write the triples of a property of a node.
+
+        :param subject: The serialized subject of the node.
+        :param key: The compact IRI of the property.
+        :param value: The JSON-LD value of the property.
+        """
+        predicate = self.expand_iri(key)
+        if predicate is None:
+            return
+        predicate = self.iri_term(predicate)
+        if isinstance(value, dict) and "@list" in value:
+            self.write_list(subject, predicate, value["@list"])
+            return
+        for item in value if isinstance(value, list) else [value]:
+            object = self.to_term(item)
+            if object is not None:
+                self.write_triple(subject, predicate, object)
+
+    def write_list(self, subject: str, predicate: str, items: Iterable[Any]):
+        """
+        Write an RDF collection, item by item, so the items can be produced while writing.
+
+        :param subject: The serialized subject the collection belongs to.
+        :param predicate: The serialized predicate linking the subject to the collection.
+        :param items: The JSON-LD values of the collection.
+        """
+        first = self.iri_term(RDF + "first")
+        rest = self.iri_term(RDF + "rest")
+        previous_cell = None
+        for item in items:
+            object = self.to_term(item)
+            if object is None:
+                continue
+            cell = self.new_blank_node()
+            if previous_cell is None:
+                self.write_triple(subject, predicate, cell)
+            else:
+                self.write_triple(previous_cell, rest, cell)
+            self.write_triple(cell, first, object)
+            previous_cell = cell
+        nil = self.iri_term(RDF + "nil")
+        if previous_cell is None:
+            self.write_triple(subject, predicate, nil)
+        else:
+            self.write_triple(previous_cell, rest, nil)
+
+    def to_term(self, value: Any) -> Optional[str]:
+        """
+        Serialize a JSON-LD value, writing the triples of a nested node first.
+
+        :param value: A JSON-LD value object, node object or native value.
+        :return: The serialized term, or None if the value does not produce one.
+        """
+        if value is None:
+            return None
+        if isinstance(value, dict):
+            if "@value" in value:
+                return self.value_term(value["@value"], value.get("@type"))
+            if set(value) == {"@id"}:
+                return self.iri_term(self.expand_iri(value["@id"]))
+            return self.write_node(value)
+        return self.value_term(value, None)
+
+    def value_term(self, value: Any, type: Optional[str]) -> Optional[str]:
+        """
+        Serialize the value of a value object the way JSON-LD converts it to a literal.
+
+        :param value: The "@value" of the value object.
+        :param type: The "@type" of the value object, or None.
+        :return: The serialized literal, or None for a null value.
+        """
+        if type == "@json":
+            return self.literal_term(self.canonical_json(value), RDF + "JSON")
+        if value is None:
+            return None
+        datatype = self.expand_iri(type) if type else None
+        if isinstance(value, bool):
+            return self.literal_term("true" if value else "false", datatype or XSD + "boolean")
+        if isinstance(value, float) and (not value.is_integer() or abs(value) >= 1e21 or datatype == XSD + "double"):
+            return self.literal_term(self.canonical_double(value), datatype or XSD + "double")
+        if isinstance(value, (int, float)):
+            return self.literal_term(str(int(value)), datatype or XSD + "integer")
+        return self.literal_term(value, datatype)
+
+    @staticmethod
+    def canonical_double(value: float) -> str:
+        """
+        Format a number in the canonical lexical form of xsd:double used by JSON-LD, e.g. 1.0E-3.
+
+        :param value: The number.
+        :return: The lexical form.
+        """
+        mantissa, exponent = f"{value:.15e}".split("e")
+        mantissa = mantissa.rstrip("0")
+        if mantissa.endswith("."):
+            mantissa += "0"
+        return f"{mantissa}E{int(exponent)}"
+
+    @staticmethod
+    def canonical_number(value: Any) -> str:
+        """
+        Format a number the way JavaScript does, as required by the JSON canonicalization scheme.
+
+        :param value: The number.
+        :return: The formatted number.
+        """
+        if isinstance(value, int) or (math.isfinite(value) and value.is_integer() and abs(value) < 1e21):
+            return str(int(value))
+        if not math.isfinite(value):
+            raise ValueError("JSON numbers must be finite")
+        sign, digits, exponent = Decimal(repr(value)).normalize().as_tuple()
+        digits = "".join(map(str, digits))
+        point = exponent + len(digits)
+        if 0 < point <= 21:
+            number = digits[:point] + "." + digits[point:] if point < len(digits) else digits + "0" * (point - len(digits))
+        elif -6 < point <= 0:
+            number = "0." + "0" * -point + digits
+        else:
+            number = digits[0] + ("." + digits[1:] if len(digits) > 1 else "") + f"e{'+' if point > 0 else '-'}{abs(point - 1)}"
+        return ("-" if sign else "") + number
+
+    @classmethod
+    def canonical_json(cls, value: Any) -> str:
+        """
+        Serialize a JSON value in its canonical form, the lexical form of an rdf:JSON literal.
+
+        :param value: The JSON value.
+        :return: The canonical JSON.
+        """
+        if isinstance(value, dict):
+            return "{" + ",".join(json.dumps(key, ensure_ascii=False) + ":" + cls.canonical_json(value[key])
+                                  for key in sorted(value, key=lambda key: key.encode("utf-16-be"))) + "}"
+        if isinstance(value, list):
+            return "[" + ",".join(cls.canonical_json(item) for item in value) + "]"
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return cls.canonical_number(value)
+        return json.dumps(value, ensure_ascii=False)
+
+    def write_document(self, data: Dict[str, Any]):
+        """
+        Write the triples of a whole JSON-LD document.
+
+        :param data: The JSON-LD document.
+        """
+        self.write_node({key: value for key, value in data.items() if key != "@context"})
@@ -1,11 +1,13 @@
 from urllib.parse import urlparse
-from typing import List, Dict, Any, Optional
+from typing import Iterable, Dict, Any, Optional
 from Transform.transform import Transform
-from Vertices.vertices import Vertices
+from Vertices.vertices import Vertices, vertex_term
 from Metadata.metadata import Metadata
+from Writer.jsonldWriter import JsonLdWriter
+from Writer.rdfWriter import RdfWriter
 
 class CityJSON:
-    def __init__(self, base_url: str, alias: str, id: str, version: str, transform: Transform, vertices: Vertices, cityobjects: List[Any], metadata: Optional[Metadata] = None):
+    def __init__(self, base_url: str, alias: str, id: str, version: str, transform: Optional[Transform], vertices: Optional[Vertices], cityobjects: Iterable[Any], metadata: Optional[Metadata] = None, vertex_references: bool = False):
         """
         Initialize the CityJson object with the given parameters.
 
@@ -13,10 +15,12 @@ class CityJSON:
         :param alias: Alias for the CityJSON.
         :param id: Unique identifier for the CityJSON.
         :param version: Version of the CityJSON.
-        :param transform: Transform object for the CityJSON.
-        :param vertices: Vertices object for the CityJSON.
-        :param cityobjects: List of city objects.
+        :param transform: Transform object for the CityJSON, None to leave it out of a document holding only city objects.
+        :param vertices: Vertices object for the CityJSON, None to leave them out of a document holding only city objects.
+        :param cityobjects: List of city objects, or an iterable producing them while the CityJson object is written.
         :param metadata: Metadata object for the CityJSON, optional.
+        :param vertex_references: Flag to bind the prefix of the IRIs of the vertices in the context, for city objects
+            referring to the vertices by IRI, see Vertices.get_vertex_prefix.
         """
         self.base_url = base_url
         self.alias = alias
@@ -29,6 +33,7 @@ class CityJSON:
         self.vertices = vertices
         self.cityobjects = cityobjects
         self.metadata = metadata
+        self.vertex_references = vertex_references
 
     @staticmethod
     def is_url(url: str) -> bool:
@@ -44,28 +49,40 @@ class CityJSON:
         except ValueError:
             return False
 
+    def get_context(self) -> Dict[str, str]:
+        """
+        Get the JSON-LD context of the CityJson object.
+
+        :return: JSON-LD context with the prefixes used in the representation.
+        """
+        context = {
+            "rdf": "http://www.w3.org/1999/02/22-rdf-syntax-ns#",
+            "rdfs": "http://www.w3.org/2000/01/rdf-schema#",
+            "cj": "https://www.cityjson.org/ont/cityjson.ttl#",
+            "xsd": "http://www.w3.org/2001/XMLSchema#",
+            "geosparql": "http://www.opengis.net/ont/geosparql#",
+            self.alias: self.base_url
+        }
+        if self.vertex_references:
+            context[vertex_term] = Vertices.get_vertex_namespace(self.id)
+        return context
+
     def to_json(self) -> Dict[str, Any]:
         """
         Convert the CityJson object to a JSON-LD representation.
 
         :return: JSON-LD representation of the CityJson object.
         """
+        vertices_property = self.vertices.get_property() if self.vertices is not None else "cj:hasVertices"
         data = {
-            "@context": {
-                "rdf": "http://www.w3.org/1999/02/22-rdf-syntax-ns#",
-                "rdfs": "http://www.w3.org/2000/01/rdf-schema#",
-                "cj": "https://www.cityjson.org/ont/cityjson.ttl#",
-                "xsd": "http://www.w3.org/2001/XMLSchema#",
-                "geosparql": "http://www.opengis.net/ont/geosparql#",
-                self.alias: self.base_url
-            },
+            "@context": self.get_context(),
             "@id": self.id,
             "@type": "cj:CityJSON",
             "cj:type": self.type,
             "cj:version": self.version,
-            "cj:hasVertices": self.vertices.to_json(),
+            vertices_property: self.vertices.to_json() if self.vertices is not None else None,
             "cj:hasCityObjects": [cityobj.to_json() for cityobj in self.cityobjects],
-            "cj:hasTransform": self.transform.to_json(),
+            "cj:hasTransform": self.transform.to_json() if self.transform is not None else None,
             "cj:hasMetadata": self.metadata.to_json() if self.metadata else None
         }
 
@@ -74,3 +91,91 @@ class CityJSON:
 
         return filtered_data
 
+    def write_json(self, writer: JsonLdWriter, chunk_size: int = 1000):
+        """
+        Write the JSON-LD representation of the CityJson object incrementally.
+
+        The vertices are written in chunks and every city object as soon as it is produced, giving
+        the same document as to_json without building it in memory.
+
+        :param writer: JsonLdWriter to write to.
+        :param chunk_size: Number of vertices converted and written at once.
+        """
+        writer.begin_object()
+        writer.write_value(self.get_context(), "@context")
+        writer.write_value(self.id, "@id")
+        writer.write_value("cj:CityJSON", "@type")
+        writer.write_value(self.type, "cj:type")
+        writer.write_value(self.version, "cj:version")
+
+        if self.vertices is not None and self.vertices.encoding != "list":
+            writer.begin_array(self.vertices.get_property())
+            for block in self.vertices.iter_blocks():
+                writer.write_value(block)
+            writer.end_array()
+        elif self.vertices is not None:
+            writer.begin_object("cj:hasVertices")
+            writer.begin_array("@list")
+            for chunk in self.vertices.iter_json(chunk_size):
+                writer.write_values(chunk)
+            writer.end_array()
+            writer.end_object()
+
+        writer.begin_array("cj:hasCityObjects")
+        for cityobj in self.cityobjects:
+            writer.write_value(cityobj.to_json())
+        writer.end_array()
+
+        if self.transform is not None:
+            writer.write_value(self.transform.to_json(), "cj:hasTransform")
+        if self.metadata:
+            writer.write_value(self.metadata.to_json(), "cj:hasMetadata")
+        writer.end_object()
+
+    def write_rdf(self, writer: RdfWriter, chunk_size: int = 1000):
+        """
+        Write the triples of the CityJson object incrementally.
+
+        The triples are the ones the JSON-LD representation expands to, written without building the
+        document: the vertices collection chunk by chunk and every city object as soon as it is produced.
+
+        :param writer: RdfWriter to write to.
+        :param chunk_size: Number of vertices converted and written at once.
+        """
+        subject = self.write_rdf_node(writer)
+        for cityobj in self.cityobjects:
+            writer.write_property(subject, "cj:hasCityObjects", cityobj.to_json())
+        self.write_rdf_members(writer, subject, chunk_size)
+
+    def write_rdf_node(self, writer: RdfWriter) -> str:
+        """
+        Write the triples of the CityJson node itself, without its city objects, vertices, transform and metadata.
+
+        :param writer: RdfWriter to write to.
+        :return: The serialized subject of the CityJson node.
+        """
+        return writer.write_node({
+            "@id": self.id,
+            "@type": "cj:CityJSON",
+            "cj:type": self.type,
+            "cj:version": self.version
+        })
+
+    def write_rdf_members(self, writer: RdfWriter, subject: str, chunk_size: int = 1000):
+        """
+        Write the triples of the vertices, transform and metadata of the CityJson node.
+
+        :param writer: RdfWriter to write to.
+        :param subject: The serialized subject of the CityJson node, see write_rdf_node.
+        :param chunk_size: Number of vertices converted and written at once.
+        """
+        if self.vertices is not None and self.vertices.encoding != "list":
+            for block in self.vertices.iter_blocks():
+                writer.write_property(subject, self.vertices.get_property(), block)
+        elif self.vertices is not None:
+            writer.write_list(subject, writer.iri_term(writer.expand_iri("cj:hasVertices")),
+                              (vertex for chunk in self.vertices.iter_json(chunk_size) for vertex in chunk))
+        if self.transform is not None:
+            writer.write_property(subject, "cj:hasTransform", self.transform.to_json())
+        if self.metadata:
+            writer.write_property(subject, "cj:hasMetadata", self.metadata.to_json())
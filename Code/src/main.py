@@ -1,17 +1,35 @@
 import argparse
 import json
 import os
-from cjio import cityjson
+import sys
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional
+import numpy as np
 from cjvalpy import cjvalpy
-import pyshacl
 from jsonpath_ng import parse
-from Cityobjects.firstLevelCityObject import FirstLevelCityObject
-from Cityobjects.SecondLevelCityObject import SecondLevelCityObject
-from Cityobjects.Geometry.geometry import Geometry
+from Reader.cityJsonReader import read_cityjson, get_unsupported_members
+from Reader.cityJsonStreamReader import read_cityjson_stream
+from Filtering.cityObjectFilter import CityObjectFilter
+from Cityobjects.cityObjectFactory import to_cityobject
+from Cityobjects.parallelConversion import convert_cityobjects_parallel
+from Cityobjects.Geometry.geometryCache import GeometryCache
 from Vertices.vertices import Vertices
+from Vertices.vertexBlocks import vertices_encodings
 from Metadata.metadata import Metadata
 from Transform.transform import Transform
-from cityJSON import CityJSON
+from SHACL.shaclValidation import validate_cityjson
+from Stream.cityJsonSeq import convert_cityjson_seq, seq_format_values
+from Writer.jsonldWriter import JsonLdWriter
+from Writer.rdfWriter import RdfWriter, rdf_format_values
+from Writer.backgroundWriter import open_output, split_output_path
+from Profiling.profiler import Profiler, null_stage
+from Tiling.tiling import Tile, to_tiles, write_manifest
+from Incremental.incrementalState import IncrementalState, hash_cityobject, write_diff
+from Upload.graphStoreUpload import GraphStoreUploader
+from Batch.batchConversion import convert_batch
+from cityJson import CityJSON
+
+output_format_values = ["jsonld"] + rdf_format_values
 
 
 def extract_alias_from_base_url(url: str) -> str:
@@ -28,32 +46,173 @@ def extract_alias_from_base_url(url: str) -> str:
         raise ValueError("Invalid base URL")
 
 
-def write_jsonld_to_file(path: str, citjson: object, formatted: bool):
+def convert_cityobjects(alias: str, cityobjects: Dict[str, Any], real_vertices: np.ndarray, workers: int = 1, geometry_cache: Optional[GeometryCache] = None, compact_coordinates: bool = False, include_wkt: bool = True, include_3d_boundaries: bool = True, vertex_references: bool = False, include_envelope: bool = False, include_convex_hull: bool = False) -> Iterator[Any]:
+    """
+    Convert the CityObjects lazily, in worker processes when more than one worker is requested.
+
+    :param alias: Alias for the city objects.
+    :param cityobjects: The "CityObjects" member of the CityJSON file.
+    :param real_vertices: The transformed vertices, see Transform.to_real_vertices.
+    :param workers: Number of worker processes.
+    :param geometry_cache: Cache of converted geometries, optional.
+    :param compact_coordinates: Flag to encode the points of the bounding boxes as JSON literals of coordinate arrays.
+    :param include_wkt: Flag to include the 2D boundaries of the geometries in WKT format.
+    :param include_3d_boundaries: Flag to include the 3D boundaries of the geometries as bounding boxes.
+    :param vertex_references: Flag to refer to the vertices by IRI in the bounding boxes instead of repeating their coordinates.
+    :param include_envelope: Flag to include the 2D envelope of the city objects as an extra geometry.
+    :param include_convex_hull: Flag to include the 2D convex hull of the city objects as an extra geometry.
+    :return: Iterator over the converted city objects, in their original order.
+    """
+    if workers > 1:
+        return convert_cityobjects_parallel(alias, cityobjects, real_vertices, workers, geometry_cache, compact_coordinates,
+                                            include_wkt, include_3d_boundaries, vertex_references, include_envelope,
+                                            include_convex_hull)
+    return (to_cityobject(alias, cityobject_key, cityobject, real_vertices, geometry_cache, compact_coordinates,
+                          include_wkt, include_3d_boundaries, vertex_references, include_envelope, include_convex_hull)
+            for cityobject_key, cityobject in cityobjects.items())
+
+
+def write_jsonld_to_file(path: str, citjson: CityJSON, formatted: bool):
     """
     Write the cityJSON object to file
 
+    The document is written incrementally, so the city objects can still be produced while writing.
+    A partially written file is removed if the conversion fails.
+
     :path: Path to save the cityJSON-LD to file.
     :cityjson: The content to be saved to file.
     :enable_format: Flag indicating whether the content to be saved as formatted or not.
     """
 
-    with open(path, 'w', encoding='utf-8') as json_file:
-        if formatted:
-            json.dump(citjson.to_json(), json_file, indent=4, ensure_ascii=False)
-        else:
-            json.dump(citjson.to_json(), json_file, ensure_ascii=False)
+    try:
+        with open_output(path) as json_file:
+            citjson.write_json(JsonLdWriter(json_file, formatted))
+    except BaseException:
+        if os.path.exists(path):
+            os.remove(path)
+        raise
 
 
-def main(input_file_path: str, output_file_path: str, base_url: str, city_id: str, enable_shacl: bool, formatted: bool):
+def write_rdf_to_file(path: str, citjson: CityJSON, output_format: str):
+    """
+    Write the triples of the cityJSON object to file
+
+    The triples are written incrementally, without building the JSON-LD document. With "nq" they are
+    placed in a named graph named after the CityJSON IRI. A partially written file is removed if the
+    conversion fails.
+
+    :path: Path to save the triples to file.
+    :cityjson: The content to be saved to file.
+    :output_format: One of rdf_format_values.
+    """
+
+    try:
+        with open_output(path) as rdf_file:
+            citjson.write_rdf(RdfWriter(rdf_file, output_format, citjson.get_context(), citjson.id))
+    except BaseException:
+        if os.path.exists(path):
+            os.remove(path)
+        raise
+
+
+def write_to_file(path: str, citjson: CityJSON, formatted: bool, output_format: str):
+    """
+    Write the cityJSON object to file in the requested output format
+
+    :path: Path to save the output to file.
+    :cityjson: The content to be saved to file.
+    :enable_format: Flag indicating whether the JSON-LD is saved as formatted or not.
+    :output_format: One of output_format_values.
+    """
+    if output_format in rdf_format_values:
+        write_rdf_to_file(path, citjson, output_format)
+    else:
+        write_jsonld_to_file(path, citjson, formatted)
+
+
+def write_tiles_to_files(path: str, citjson: CityJSON, tiles: List[Tile], formatted: bool, output_format: str,
+                         tile_size: Optional[float] = None, max_tiles: Optional[int] = None) -> str:
+    """
+    Write the cityJSON object to one file per tile, plus a header file and a manifest
+
+    The header file holds the CityJSON node with the vertices, transform and metadata, and every tile
+    file the same CityJSON node with the city objects of the tile only, so the files can be loaded in
+    parallel into one graph. The files are named after path with the tile identifier as suffix.
+
+    :path: Path of the output, the files are placed next to it.
+    :cityjson: The content to be saved to file, its city objects produced in the order of the tiles.
+    :tiles: The tiles, see to_tiles.
+    :enable_format: Flag indicating whether the JSON-LD is saved as formatted or not.
+    :output_format: One of output_format_values.
+    :tile_size: Size of the cells of the grid, if tiled on a grid.
+    :max_tiles: Maximum number of tiles of the quadtree, if tiled on a quadtree.
+    :return: Path of the manifest.
+    """
+    stem, extension = split_output_path(path)
+    header_path = f"{stem}_header{extension}"
+    write_to_file(header_path, CityJSON(citjson.base_url, citjson.alias, citjson.id, citjson.version, citjson.transform,
+                                        citjson.vertices, [], citjson.metadata, citjson.vertex_references), formatted, output_format)
+
+    cityobjects = iter(citjson.cityobjects)
+    tile_file_names = []
+    for tile in tiles:
+        tile_path = f"{stem}_{tile.id}{extension}"
+        write_to_file(tile_path, CityJSON(citjson.base_url, citjson.alias, citjson.id, citjson.version, None, None,
+                                          islice(cityobjects, len(tile.cityobject_ids)), None, citjson.vertex_references),
+                      formatted, output_format)
+        tile_file_names.append(os.path.basename(tile_path))
+
+    manifest_path = f"{stem}_manifest.json"
+    write_manifest(manifest_path, citjson.id, os.path.basename(header_path), tiles, tile_file_names, output_format,
+                   tile_size, max_tiles)
+    return manifest_path
+
+
+def main(input_file_path: str, output_file_path: str, base_url: str, city_id: str, enable_shacl: bool, formatted: bool, seq_format: str = "array", workers: int = 1, output_format: str = "jsonld", geometry_cache_size: int = 0, profile_path: Optional[str] = None, profile_stats_path: Optional[str] = None, compact_coordinates: bool = False, tile_size: Optional[float] = None, max_tiles: Optional[int] = None, incremental_state_path: Optional[str] = None, upload_url: Optional[str] = None, upload_batch_size: int = 500, upload_concurrency: int = 2, include_wkt: bool = True, include_3d_boundaries: bool = True, vertex_references: bool = False, vertices_encoding: str = "list", vertex_block_size: int = 1000, stream: bool = False, include_envelope: bool = False, include_convex_hull: bool = False, lods: Optional[List[str]] = None, types: Optional[List[str]] = None, ids_file_path: Optional[str] = None, bbox: Optional[List[float]] = None):
     """
     Main function to process the CityJSON file and convert it to JSON-LD.
 
+    CityJSONSeq input files (.jsonl) are converted feature by feature, see convert_cityjson_seq.
+
     :param input_file_path: Path to the input CityJSON file.
     :param output_file_path: Path to the output JSON file.
     :param base_url: Base URL for the CityJSON file.
     :param city_id: Identifier for the CityJSON file.
     :param enable_shacl: Flag to enable SHACL validation.
     :param formatted: Flag to enable formatting the output.
+    :param seq_format: Output format for CityJSONSeq input files, one of seq_format_values.
+    :param workers: Number of worker processes converting the city objects.
+    :param output_format: Output format, one of output_format_values.
+    :param geometry_cache_size: Number of converted geometries kept for reuse, 0 to disable the geometry cache.
+    :param profile_path: Path to save the JSON report of the profiled stages to file, optional.
+    :param profile_stats_path: Path to save the cProfile statistics of the hottest stage to file, optional.
+    :param compact_coordinates: Flag to encode the points of the bounding boxes as JSON literals of coordinate arrays
+        ("cj:hasCoordinates") instead of one "cj:Point" node per coordinate.
+    :param tile_size: Size of the cells of a grid to split the output into tiles, see write_tiles_to_files, optional.
+    :param max_tiles: Maximum number of tiles of a quadtree to split the output into, used if tile_size is not given, optional.
+    :param incremental_state_path: Path of the state of the last conversion, to convert only the new and changed city
+        objects and write the diff next to the output, optional.
+    :param upload_url: URL of a SPARQL Graph Store Protocol endpoint to upload the triples to while they are written,
+        see GraphStoreUploader, optional.
+    :param upload_batch_size: Number of city objects per uploaded batch.
+    :param upload_concurrency: Number of batches uploaded at the same time.
+    :param include_wkt: Flag to include the 2D boundaries of the geometries in WKT format ("geosparql:asWKT").
+    :param include_3d_boundaries: Flag to include the 3D boundaries of the geometries as bounding boxes ("cj:hasBoundingBox").
+    :param vertex_references: Flag to give the vertices IRIs, see Vertices.get_vertex_prefix, and refer to them in the bounding
+        boxes ("cj:hasVertex") instead of repeating their coordinates.
+    :param vertices_encoding: Encoding of the vertices of the CityJSON node, one of vertices_encodings, see Vertices.
+    :param vertex_block_size: Number of vertices per vertex block of the json and base64 encodings.
+    :param stream: Flag to parse the file incrementally, see read_cityjson_stream, and convert the city objects while they
+        are parsed, for files too large to be parsed at once. The file is then not validated against the CityJSON schema.
+    :param include_envelope: Flag to include the 2D envelope of the city objects as an extra geometry ("geosparql:hasGeometry"
+        to a "cj:Envelope"), see ExtentGeometries.
+    :param include_convex_hull: Flag to include the 2D convex hull of the city objects as an extra geometry
+        ("geosparql:hasGeometry" to a "cj:ConvexHull").
+    :param lods: LoDs of the geometries to convert, see CityObjectFilter, optional.
+    :param types: Types of the city objects to convert, with their parents, optional.
+    :param ids_file_path: Path of a file with the identifiers of the city objects to convert, one per line, optional.
+    :param bbox: 2D extent (min_x, min_y, max_x, max_y) the city objects to convert intersect, optional.
+    :return: Whether the output was written.
     """
     if not os.path.isabs(input_file_path):
         input_file_path = os.path.join(
@@ -67,140 +226,244 @@ def main(input_file_path: str, output_file_path: str, base_url: str, city_id: st
     cityjson_shacl_shapefile = os.path.join(
         os.path.dirname(__file__), 'SHACL', 'cityjsonShapes.ttl')
 
-    with open(input_file_path) as file:
-        file_content_json = json.load(file)
-        file_content_str = json.dumps(file_content_json)
-        val = cjvalpy.CJValidator([file_content_str])
-        valid_city_json_file = val.validate()
-
-        has_extension = "extensions" in file_content_json
-        has_appearance = "appearance" in file_content_json
-        has_geometry_templates = "geometry_templates" in file_content_json
-
-        if valid_city_json_file and not has_appearance and not has_extension and not has_geometry_templates:
-            cityjson_data = cityjson.load(input_file_path)
-            has_metadata = cityjson_data.has_metadata()
-
-            metadata_obj = None
-            if has_metadata:
-                metadata_values = cityjson_data.get_metadata()
-                param_key_mapping = {
-                    "geographical_extent": "geographicalExtent",
-                    "identifier": "identifier",
-                    "point_of_contact": "pointOfContact",
-                    "reference_date": "referenceDate",
-                    "reference_system": "referenceSystem",
-                    "title": "title",
-                }
-
-                constructor_args = {
-                    param: metadata_values[key]
-                    for param, key in param_key_mapping.items()
-                    if key in metadata_values and metadata_values[key] is not None
-                }
-
-                metadata_obj = Metadata(**constructor_args)
+    cityobject_filter = None
+    if lods or types or ids_file_path or bbox:
+        cityobject_filter = CityObjectFilter(
+            lods, types, CityObjectFilter.read_ids_file(ids_file_path) if ids_file_path else None, bbox)
+
+    written = False
+
+    # Without profiling the stages are not measured at all
+    profiler = Profiler(profile_stats_path is not None) if profile_path or profile_stats_path else None
+    stage = profiler.stage if profiler else null_stage
+
+    try:
+        if input_file_path.endswith(".jsonl"):
+            if enable_shacl:
+                print("SHACL validation is not supported for cityjsonseq files")
+            if tile_size or max_tiles:
+                print("Tiling is not supported for cityjsonseq files")
+            if incremental_state_path:
+                print("Incremental conversion is not supported for cityjsonseq files")
+            if upload_url:
+                print("Upload is not supported for cityjsonseq files")
+            if vertex_references:
+                print("Vertex references are not supported for cityjsonseq files")
+            if vertices_encoding != "list":
+                print("Vertex blocks are not supported for cityjsonseq files")
+            if workers > 1:
+                print("Multiple workers are not supported for cityjsonseq files, the features are converted one at a time")
+            if stream:
+                print("Streaming is not needed for cityjsonseq files, they are always converted feature by feature")
+            alias = extract_alias_from_base_url(base_url)
+            with stage("cityjsonseq"):
+                converted = convert_cityjson_seq(
+                    input_file_path, output_file_path, base_url, alias, city_id, seq_format, formatted, output_format, compact_coordinates,
+                    include_wkt, include_3d_boundaries, include_envelope, include_convex_hull, cityobject_filter)
+            if converted:
+                print(f"Output written to: {output_file_path}")
+            return converted
+
+        if stream:
+            if tile_size or max_tiles:
+                print("Tiling is not supported for streamed files")
+                tile_size = max_tiles = None
+            if incremental_state_path:
+                print("Incremental conversion is not supported for streamed files")
+                incremental_state_path = None
+            # The schema validator needs the whole text of the file
+            print("CityJSON schema validation is skipped for streamed files")
+            with stage("read"):
+                try:
+                    file_content_json = read_cityjson_stream(input_file_path)
+                except ImportError as error:
+                    print(error)
+                    return False
+            valid_city_json_file = all(member in file_content_json for member in ("version", "transform", "CityObjects", "vertices"))
+        else:
+            with stage("read"):
+                file_content_str, file_content_json = read_cityjson(input_file_path)
+            with stage("validate"):
+                val = cjvalpy.CJValidator([file_content_str])
+                valid_city_json_file = val.validate()
+            # The raw text is only needed by the validator
+            del file_content_str, val
+
+        unsupported = get_unsupported_members(file_content_json)
+
+        if valid_city_json_file and not unsupported:
+            metadata_obj = Metadata.to_metadata(file_content_json.get("metadata"))
 
             transform_values = file_content_json["transform"]
             scale = transform_values["scale"]
             translate = transform_values["translate"]
             transform_obj = Transform(scale=scale, translate=translate)
 
-            vertices = file_content_json["vertices"]
-            vertices_obj = Vertices(vertices=vertices)
+            alias = extract_alias_from_base_url(base_url)
+
+            if cityobject_filter is not None:
+                # Only the selected city objects, geometries and their vertices are converted
+                with stage("filter"):
+                    # The IRIs of the vertex references are their indices, which have to match a conversion without filter
+                    file_content_json['CityObjects'], file_content_json['vertices'] = cityobject_filter.apply(
+                        file_content_json['CityObjects'], file_content_json['vertices'], transform_obj,
+                        renumber=not vertex_references)
+                print(f"{len(file_content_json['CityObjects'])} city objects selected")
+
+            with stage("vertices"):
+                vertices_obj = Vertices(vertices=file_content_json.pop("vertices"),
+                                        vertex_prefix=Vertices.get_vertex_prefix() if vertex_references else None,
+                                        encoding=vertices_encoding, block_size=vertex_block_size)
+                real_vertices = transform_obj.to_real_vertices(vertices_obj.vertices)
             version_value = file_content_json["version"]
 
-            cityobjects = cityjson_data.get_cityobjects()
-            cityobjects_keys = cityobjects.keys()
-            cityobject_arry = []
+            geometry_cache = GeometryCache(geometry_cache_size, GeometryCache.get_vertices_key(
+                scale, translate)) if geometry_cache_size else None
+
+            tiles = None
+            if tile_size or max_tiles:
+                with stage("tiling"):
+                    tiles = to_tiles(file_content_json['CityObjects'], real_vertices, tile_size, max_tiles)
+                    # Convert the city objects tile by tile
+                    file_content_json['CityObjects'] = {cityobject_id: file_content_json['CityObjects'][cityobject_id]
+                                                        for tile in tiles for cityobject_id in tile.cityobject_ids}
+
+            state = None
+            if incremental_state_path:
+                with stage("incremental"):
+                    state = IncrementalState.load(
+                        incremental_state_path, {"base_url": base_url, "compact_coordinates": compact_coordinates,
+                                                 "include_wkt": include_wkt, "include_3d_boundaries": include_3d_boundaries,
+                                                 "vertex_references": vertex_references, "include_envelope": include_envelope,
+                                                 "include_convex_hull": include_convex_hull})
+                    hashes = {cityobject_id: hash_cityobject(cityobject, real_vertices, vertex_references)
+                              for cityobject_id, cityobject in file_content_json['CityObjects'].items()}
+                    diff = state.get_diff(hashes)
+                print(f"Incremental conversion: {len(diff['added'])} added, {len(diff['changed'])} changed, "
+                      f"{len(diff['removed'])} removed, {len(diff['unchanged'])} unchanged city objects")
+
+            # The city objects are converted while the output is written
+            if state is not None:
+                # Only the new and changed city objects are converted, the others are taken from the state
+                cityobjects = file_content_json['CityObjects']
+                converted_ids = set(diff["added"]) | set(diff["changed"])
+                cityobject_arry = state.merge(hashes, convert_cityobjects(
+                    alias, {cityobject_id: cityobjects[cityobject_id] for cityobject_id in hashes if cityobject_id in converted_ids},
+                    real_vertices, workers, geometry_cache, compact_coordinates, include_wkt, include_3d_boundaries,
+                    vertex_references, include_envelope, include_convex_hull))
+            else:
+                cityobject_arry = convert_cityobjects(
+                    alias, file_content_json['CityObjects'], real_vertices, workers, geometry_cache, compact_coordinates,
+                    include_wkt, include_3d_boundaries, vertex_references, include_envelope, include_convex_hull)
 
-            alias = extract_alias_from_base_url(base_url)
+            if profiler:
+                profiler.count("items", "vertices", len(vertices_obj))
+                profiler.count("items", "cityobjects", len(file_content_json['CityObjects']))
+                cityobject_arry = profiler.profile_cityobjects(cityobject_arry)
 
-            for cityobject_key in cityobjects_keys:
-                cityobject = cityobjects[cityobject_key]
-                type = cityobject.type
-                geographicalExtent = cityobject.geographicalExtent if hasattr(
-                    cityobject, 'geographicalExtent') else None
-                attributes = cityobject.attributes if hasattr(
-                    cityobject, 'attributes') else None
-                children = cityobject.children if hasattr(
-                    cityobject, 'children') else None
-                if 'geometry' in file_content_json['CityObjects'][cityobject_key]:
-                    geometry = []
-                    for geom in file_content_json['CityObjects'][cityobject_key]['geometry']:
-                        cityobject_geometry = Geometry(
-                            geom['type'], geom['lod'], geom['boundaries'], vertices, scale, translate)
-                        geometry.append(cityobject_geometry)
-                else:
-                    geometry = None
-                if cityobject.type in FirstLevelCityObject.type_values:
-                    co = FirstLevelCityObject(
-                        alias, cityobject_key, type, geometry, geographicalExtent, attributes, children)
-                else:
-                    parents = cityobject.parents if hasattr(
-                        cityobject, 'parents') else None
-                    if not parents:
-                        raise AttributeError(
-                            "cityobject does not have 'parents' attribute")
-                    co = SecondLevelCityObject(
-                        alias, cityobject_key, type, parents, geometry, geographicalExtent, attributes, children)
-                cityobject_arry.append(co)
+            # SHACL validation needs the whole document before it is written
+            if enable_shacl:
+                cityobject_arry = list(cityobject_arry)
 
             cityjson_obj = CityJSON(
-                base_url, alias, city_id, version_value, transform_obj, vertices_obj, cityobject_arry, metadata_obj)
+                base_url, alias, city_id, version_value, transform_obj, vertices_obj, cityobject_arry, metadata_obj,
+                vertex_references)
 
             if enable_shacl:
-                data_graph_str = json.dumps(
-                    cityjson_obj.to_json(), indent=4, ensure_ascii=False)
-                validation_result = pyshacl.validate(
-                    data_graph=data_graph_str,
-                    shacl_graph=cityjson_shacl_shapefile,
-                    ont_graph=None,
-                    data_graph_format="json-ld",
-                    depth=999
-                )
-
-                conforms, results_graph, results_text = validation_result
-
-                if conforms:
-                    write_jsonld_to_file(output_file_path, cityjson_obj, formatted)
-                    print(f"JSON written to: {output_file_path}")
-                else:
+                with stage("shacl"):
+                    conforms, results_text = validate_cityjson(
+                        cityjson_obj, cityjson_shacl_shapefile, workers)
+
+                if not conforms:
                     print("Data does not conform to SHACL shapes. Validation errors:")
                     print(results_text)
-            else:
-                write_jsonld_to_file(output_file_path, cityjson_obj, formatted)
-                print(f"JSON written to: {output_file_path}")
+
+            if not enable_shacl or conforms:
+                uploader = None
+                if upload_url:
+                    # The triples are uploaded in batches while the city objects are converted and written
+                    uploader = GraphStoreUploader(upload_url, cityjson_obj.id, cityjson_obj.get_context(),
+                                                  upload_batch_size, upload_concurrency)
+                    subject = uploader.upload_header(cityjson_obj)
+                    cityjson_obj.cityobjects = uploader.upload_cityobjects(subject, cityjson_obj.cityobjects)
+
+                with stage("write"):
+                    if tiles is not None:
+                        manifest_path = write_tiles_to_files(
+                            output_file_path, cityjson_obj, tiles, formatted, output_format, tile_size, max_tiles)
+                        print(f"{len(tiles)} tiles written, manifest written to: {manifest_path}")
+                    else:
+                        write_to_file(output_file_path, cityjson_obj, formatted, output_format)
+                        print(f"Output written to: {output_file_path}")
+                    written = True
+
+                if uploader is not None:
+                    with stage("upload"):
+                        try:
+                            stats = uploader.close()
+                            print(f"{stats['cityobjects']} city objects uploaded in {stats['batches']} batches "
+                                  f"({stats['retries']} retries) to the graph: {cityjson_obj.id}")
+                        except ConnectionError as error:
+                            print(f"Upload failed: {error}")
+
+                if state is not None:
+                    # The state is only replaced once the output is written
+                    state.save(incremental_state_path)
+                    diff_path = f"{split_output_path(output_file_path)[0]}_diff.json"
+                    write_diff(diff_path, base_url, diff)
+                    print(f"Diff written to: {diff_path}")
+
+            if geometry_cache:
+                stats = geometry_cache.get_stats()
+                print(f"Geometry cache: {stats['hits']} hits, {stats['misses']} misses")
+                if profiler:
+                    for key, value in stats.items():
+                        profiler.count("geometry_cache", key, value)
 
         else:
-            if has_extension:
-                print(
-                    "This current version does not support cityjson files with extensions")
-            if has_appearance:
-                print(
-                    "This current version does not support cityjson files with appearance")
-            if has_geometry_templates:
+            for member in unsupported:
                 print(
-                    "This current version does not support cityjson files with geometry_templates")
+                    f"This current version does not support cityjson files with {member}")
             if not valid_city_json_file:
                 print("The provided file is not a valid cityjson file")
 
+    finally:
+        if profiler:
+            if profile_stats_path:
+                dumped_stage = profiler.dump_stats(profile_stats_path)
+                if dumped_stage:
+                    print(f"Profile statistics of the {dumped_stage} stage written to: {profile_stats_path}")
+            if profile_path:
+                profiler.write_report(profile_path, input_file=input_file_path, output_format=output_format, workers=workers)
+                print(f"Profile report written to: {profile_path}")
+
+    return written
+
 
 if __name__ == "__main__":
+    # "cj2jld batch" converts the files of a directory or glob pattern with the same options
+    batch = len(sys.argv) > 1 and sys.argv[1] == "batch"
     parser = argparse.ArgumentParser(
-        prog='cj2jld',
-        description='Convert CityJSON file to JSON-LD.',
+        prog='cj2jld batch' if batch else 'cj2jld',
+        description='Convert the CityJSON files of a directory or glob pattern to JSON-LD in a pool of worker processes, each loading the modules and the SHACL shapes once, reporting the status and wall time of every file; a file that fails does not stop the others.' if batch else 'Convert CityJSON file to JSON-LD.',
         epilog='This tool is a prototype developed for a master\'s thesis project of the same name. Thank you for using cj2jld!'
     )
 
-    parser.add_argument(
-        '-i', '--input-file', help='Input CityJSON file path relative or absolute. If relative, the file should be in the data folder inside the src folder. (required)', required=True)
-    parser.add_argument(
-        '-o', '--output-file', help='Output JSON file path relative or absolute. If relative, the file will be placed in the output folder inside the src folder. (required)', required=True)
+    if batch:
+        parser.add_argument(
+            '-i', '--input-file', help='Input directory, whose .json and .jsonl files are converted, or glob pattern, e.g. "tiles/*.city.json", relative or absolute. If relative, it is taken from the data folder inside the src folder. (required)', required=True)
+        parser.add_argument(
+            '-o', '--output-file', help='Output folder relative or absolute, every output is named after its input file. If relative, the folder will be placed in the output folder inside the src folder. (required)', required=True)
+    else:
+        parser.add_argument(
+            '-i', '--input-file', help='Input CityJSON file path relative or absolute. If relative, the file should be in the data folder inside the src folder. (required)', required=True)
+        parser.add_argument(
+            '-o', '--output-file', help='Output JSON file path relative or absolute. If relative, the file will be placed in the output folder inside the src folder. Ending with .gz, the output is compressed with gzip while it is written. (required)', required=True)
     parser.add_argument(
         '-b', '--base-url', help='The base URL (required)', required=True)
 
-    id_group = parser.add_mutually_exclusive_group(required=True)
+    # In batch mode the identifier of every file is its name without extension
+    id_group = parser.add_mutually_exclusive_group(required=not batch)
     id_group.add_argument(
         '-id', help='Give the ID of the supplied CityJSON file input')
     id_group.add_argument(
@@ -211,12 +474,176 @@ if __name__ == "__main__":
         action='store_true',
         help='To enable pyshacl validation (Warning: could potentially take a significant amount of time with big files; not recommended by default, false)')
 
+    parser.add_argument(
+        '-sf', '--seq-format',
+        choices=seq_format_values,
+        default="array",
+        help='Output format when the input is a CityJSONSeq (.jsonl) file, converted feature by feature: "array" writes one JSON-LD document streaming the city objects, "lines" writes one JSON-LD document per feature (by default, array)')
+
+    parser.add_argument(
+        '-st', '--stream',
+        action='store_true',
+        help='To parse a large CityJSON file incrementally from a memory map with the ijson package (pip install ijson): the transform, metadata and vertices are read first, the vertices straight into a numeric array, then the city objects are parsed one at a time while they are converted and written, so the file is never held in memory as a whole; the file is not validated against the CityJSON schema, and tiling and incremental conversion are not supported (by default, false)')
+
+    parser.add_argument(
+        '-w', '--workers',
+        type=int,
+        default=1,
+        help='Number of worker processes converting the files in parallel, each file with a single process (by default, 1)' if batch else 'Number of worker processes converting the city objects, and validating them with pyshacl, in parallel; the output keeps the original order; not supported for CityJSONSeq files (by default, 1)')
+
+    parser.add_argument(
+        '-of', '--output-format',
+        choices=output_format_values,
+        default="jsonld",
+        help='Output format: "jsonld", or the triples of the JSON-LD written directly as N-Triples ("nt"), N-Quads in a named graph named after the CityJSON IRI ("nq") or Turtle ("ttl"), ready for a bulk loader such as tdb2.tdbloader (by default, jsonld)')
+
+    parser.add_argument(
+        '-gc', '--geometry-cache',
+        type=int,
+        default=0,
+        help='Number of converted geometries kept in an LRU cache, reused for geometries with the same type and boundaries, with its hits and misses printed at the end; not used for CityJSONSeq files, 0 to disable (by default, 0)')
+
+    points_group = parser.add_mutually_exclusive_group()
+    points_group.add_argument(
+        '-cc', '--compact-coordinates',
+        action='store_true',
+        help='To encode the points of every line and ring of the bounding boxes (cj:hasBoundingBox) as one JSON literal of [x, y, z] arrays (cj:hasCoordinates) instead of one cj:Point node per coordinate, for a much smaller output with far fewer triples (by default, false)')
+    points_group.add_argument(
+        '-vr', '--vertex-references',
+        action='store_true',
+        help='To give every vertex of cj:hasVertices an IRI made of the IRI of the CityJSON, "/v/" and its index, written with the "v" prefix of the context, and to encode the points of every line and ring of the bounding boxes as the ordered list of the vertices they refer to (cj:hasVertex) instead of one cj:Point node per coordinate, so vertices shared by several faces are written once; with the city object filters, all the vertices are kept so their IRIs do not change; not supported for CityJSONSeq files (by default, false)')
+
+    parser.add_argument(
+        '-ve', '--vertices-encoding',
+        choices=vertices_encodings,
+        default="list",
+        help='Encoding of the vertices of the CityJSON node: "list" writes the collection of cj:Vertex nodes (cj:hasVertices), "json" and "base64" write cj:VertexBlock nodes (cj:hasVertexBlock) of consecutive vertices with their start index, holding their coordinates as one JSON literal of [x, y, z] arrays, or as one base64 literal of little-endian 64-bit integers (cj:int64ArrayBase64), so a range of vertices is read by index without going through the whole collection; with --vertex-references the vertex IRIs then give the index in the blocks; not supported for CityJSONSeq files (by default, list)')
+
+    parser.add_argument(
+        '-vbs', '--vertex-block-size',
+        type=int,
+        default=1000,
+        help='Number of vertices per vertex block of the json and base64 encodings (by default, 1000)')
+
+    parser.add_argument(
+        '-nw', '--no-wkt',
+        action='store_true',
+        help='To leave out the 2D boundaries of the geometries in WKT format (geosparql:asWKT), which are then not computed at all (by default, false)')
+
+    parser.add_argument(
+        '-n3d', '--no-3d-boundaries',
+        action='store_true',
+        help='To leave out the 3D boundaries of the geometries (cj:hasBoundingBox), which are then not computed at all, for a GeoSPARQL-only output that is much faster to convert and much smaller (by default, false)')
+
+    parser.add_argument(
+        '-env', '--envelope',
+        action='store_true',
+        help='To add to every city object with geometries its 2D envelope, the rectangle enclosing all its geometries, as an extra geometry (geosparql:hasGeometry to a cj:Envelope with geosparql:asWKT), so GeoSPARQL queries can filter on rectangles before using the detailed WKT of the geometries (by default, false)')
+
+    parser.add_argument(
+        '-hull', '--convex-hull',
+        action='store_true',
+        help='To add to every city object with geometries the 2D convex hull of all its geometries as an extra geometry (geosparql:hasGeometry to a cj:ConvexHull with geosparql:asWKT), a closer approximation of its footprint than the envelope (by default, false)')
+
+    parser.add_argument(
+        '-lod', '--lod',
+        nargs='+',
+        metavar='LOD',
+        help='LoDs of the geometries to convert, e.g. 1 2.2: the geometries of the other LoDs are skipped before they are converted, and the city objects are kept even without any geometry left (by default, all)')
+
+    parser.add_argument(
+        '-ty', '--type',
+        nargs='+',
+        metavar='TYPE',
+        help='Types of the city objects to convert, e.g. Building: the other city objects are skipped, except the parents of the selected ones, and the children that are not selected are removed from cj:hasChildren (by default, all)')
+
+    parser.add_argument(
+        '-idf', '--ids-file',
+        metavar='IDS_FILE',
+        help='Path of a file with the identifiers of the city objects to convert, one per line, selected with their parents like --type; combined with the other selectors, the city objects must match all of them (by default, all)')
+
+    parser.add_argument(
+        '-bb', '--bbox',
+        nargs=4,
+        type=float,
+        metavar=('MIN_X', 'MIN_Y', 'MAX_X', 'MAX_Y'),
+        help='2D extent, in the units of the coordinate reference system, the city objects to convert intersect, by their geographicalExtent or else the vertices of their geometries, selected with their parents like --type; only the vertices of the selected geometries are written (by default, all)')
+
+    tile_group = parser.add_mutually_exclusive_group()
+    tile_group.add_argument(
+        '-ts', '--tile-size',
+        type=float,
+        help='To split the output into the tiles of a regular grid of this cell size, in the units of the coordinate reference system: every family of city objects goes to the cell holding the center of its 2D extent, each tile to its own file, with a header file for the vertices, transform and metadata and a manifest of the tile bounds and object counts (by default, no tiling)')
+    tile_group.add_argument(
+        '-tn', '--tiles',
+        type=int,
+        help='To split the output into at most this number of tiles of a quadtree, splitting the tile with the most city objects first, written like with --tile-size (by default, no tiling)')
+
+    parser.add_argument(
+        '-inc', '--incremental',
+        metavar='STATE_FILE',
+        help='Path of a state file keeping a content hash and the JSON-LD of every city object: only the city objects that are new or changed since the last conversion with the same state file are converted, the others are reused, and the IRIs of the added, changed and removed city objects are written to a _diff.json file next to the output; the state file is created or updated (by default, no incremental conversion)')
+
+    parser.add_argument(
+        '-u', '--upload',
+        metavar='URL',
+        help='URL of a SPARQL Graph Store Protocol endpoint, e.g. http://localhost:3030/dataset/data for Fuseki, with user:password@ for basic authentication, to upload the triples to the named graph of the CityJSON IRI while the output is written: the graph is replaced, then the city objects are sent as gzipped N-Triples in batches over keep-alive connections, and a failed batch is retried with an exponential backoff (by default, no upload)')
+
+    parser.add_argument(
+        '-ubs', '--upload-batch-size',
+        type=int,
+        default=500,
+        help='Number of city objects per uploaded batch (by default, 500)')
+
+    parser.add_argument(
+        '-uc', '--upload-concurrency',
+        type=int,
+        default=2,
+        help='Number of batches uploaded at the same time, each over its own connection (by default, 2)')
+
+    parser.add_argument(
+        '-p', '--profile',
+        metavar='REPORT_FILE',
+        help='Path of a JSON report of the conversion stages: wall time, CPU time, resident memory increase per stage and peak resident memory of the process, and item counts per CityObject type and per geometry type and LoD; with more than one worker the cityobjects stage only measures the main process (by default, no profiling)')
+
+    parser.add_argument(
+        '-ps', '--profile-stats',
+        metavar='STATS_FILE',
+        help='Path of a cProfile dump of the stage taking the most wall time, to be read with pstats or snakeviz (by default, no dump)')
+
     parser.add_argument(
         '-f', '--formatted',
         action='store_true',
         help='To enable formatting/beautify the JSON-LD into a human-readable format; not recommended takes too much space by default, false)')
 
-    args = parser.parse_args()
+    args = parser.parse_args(sys.argv[2:] if batch else sys.argv[1:])
+
+    options = dict(
+        enable_shacl=args.enable_pyshacl, formatted=args.formatted, seq_format=args.seq_format, workers=args.workers,
+        output_format=args.output_format, geometry_cache_size=args.geometry_cache, profile_path=args.profile,
+        profile_stats_path=args.profile_stats, compact_coordinates=args.compact_coordinates, tile_size=args.tile_size,
+        max_tiles=args.tiles, incremental_state_path=args.incremental, upload_url=args.upload,
+        upload_batch_size=args.upload_batch_size, upload_concurrency=args.upload_concurrency, include_wkt=not args.no_wkt,
+        include_3d_boundaries=not args.no_3d_boundaries, vertex_references=args.vertex_references,
+        vertices_encoding=args.vertices_encoding, vertex_block_size=args.vertex_block_size, stream=args.stream,
+        include_envelope=args.envelope, include_convex_hull=args.convex_hull, lods=args.lod, types=args.type,
+        ids_file_path=args.ids_file, bbox=args.bbox)
+
+    if batch:
+        if args.id or args.id_path:
+            print("The identifier of every file is its name without extension in batch mode")
+        if args.incremental or args.profile or args.profile_stats:
+            print("The state, profile report and profile statistics paths are folders in batch mode, with one file per input file")
+        input_path = args.input_file
+        if not os.path.isabs(input_path):
+            input_path = os.path.join(os.path.dirname(__file__), 'data', input_path)
+        output_folder = args.output_file
+        if not os.path.isabs(output_folder):
+            output_folder = os.path.join(os.path.dirname(__file__), 'output', output_folder)
+        shacl_file_path = os.path.join(os.path.dirname(__file__), 'SHACL', 'cityjsonShapes.ttl') if args.enable_pyshacl else None
+        counts = convert_batch(input_path, output_folder, args.base_url, args.workers, shacl_file_path, options,
+                               ".jsonld" if args.output_format == "jsonld" else f".{args.output_format}")
+        sys.exit(1 if counts["failed"] else 0)
 
     if args.id:
         city_id = args.id
@@ -232,4 +659,4 @@ if __name__ == "__main__":
         else:
             parser.error("Identifier not found in the JSON file.")
 
-    main(args.input_file, args.output_file, args.base_url, city_id, args.enable_pyshacl, args.formatted)
+    main(args.input_file, args.output_file, args.base_url, city_id, **options)
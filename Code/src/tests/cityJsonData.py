@@ -0,0 +1,118 @@
+import copy
+from typing import Any, Dict, List
+
+from Cityobjects.cityObjectFactory import to_cityobject
+from Cityobjects.Geometry.boundaryIndices import iter_boundary_indices
+from Metadata.metadata import Metadata
+from Transform.transform import Transform
+from Vertices.vertices import Vertices
+from cityJson import CityJSON
+
+
+def make_cityjson(buildings: int) -> Dict[str, Any]:
+    """
+    Make a CityJSON document with a row of buildings 100 m apart, each with a building part, and a generic city
+    object without geometry.
+
+    The buildings have a lod 1 solid and a lod 2 multi surface, the parts a lod 2 multi surface.
+
+    :param buildings: Number of buildings.
+    :return: The CityJSON document.
+    """
+    vertices = []
+
+    def box(x: int, y: int, size: int, height: int):
+        start = len(vertices)
+        for z in (0, height):
+            vertices.extend([[x, y, z], [x + size, y, z], [x + size, y + size, z], [x, y + size, z]])
+        bottom, top = list(range(start, start + 4)), list(range(start + 4, start + 8))
+        sides = [[[bottom[i], bottom[(i + 1) % 4], top[(i + 1) % 4], top[i]]] for i in range(4)]
+        return [[bottom[::-1]], [top]] + sides
+
+    cityobjects = {}
+    for i in range(buildings):
+        x = i * 100000
+        cityobjects[f"B{i}"] = {
+            "type": "Building",
+            "attributes": {"height": 10.5 + i, "name": f"building {i}"},
+            "children": [f"B{i}-part"],
+            "geometry": [{"type": "Solid", "lod": "1", "boundaries": [box(x, 0, 20000, 10000)]},
+                         {"type": "MultiSurface", "lod": "2", "boundaries": box(x, 0, 20000, 12000)}]
+        }
+        cityobjects[f"B{i}-part"] = {
+            "type": "BuildingPart",
+            "parents": [f"B{i}"],
+            "geometry": [{"type": "MultiSurface", "lod": "2", "boundaries": box(x + 5000, 5000, 5000, 15000)}]
+        }
+    cityobjects["G"] = {"type": "GenericCityObject"}
+    return {
+        "type": "CityJSON",
+        "version": "2.0",
+        "transform": {"scale": [0.001, 0.001, 0.001], "translate": [85000.0, 446000.0, 0.0]},
+        "metadata": {"geographicalExtent": [85000.0, 446000.0, 0.0, 85000.0 + buildings * 100.0, 446020.0, 15.0],
+                     "identifier": "test"},
+        "CityObjects": cityobjects,
+        "vertices": vertices
+    }
+
+
+def build_cityjson(data: Dict[str, Any], vertex_references: bool = False, encoding: str = "list", **options) -> CityJSON:
+    """
+    Build the CityJSON object of a CityJSON document, as main.main does.
+
+    :param data: The CityJSON document.
+    :param vertex_references: Flag to refer to the vertices by IRI.
+    :param encoding: Encoding of the vertices.
+    :param options: Other keyword arguments of to_cityobject.
+    :return: The CityJSON object, with a list of city objects.
+    """
+    data = copy.deepcopy(data)
+    transform = Transform(scale=data["transform"]["scale"], translate=data["transform"]["translate"])
+    vertices = Vertices(data["vertices"], Vertices.get_vertex_prefix() if vertex_references else None, encoding)
+    real_vertices = transform.to_real_vertices(vertices.vertices)
+    cityobjects = [to_cityobject("ex", cityobject_id, cityobject, real_vertices, vertex_references=vertex_references, **options)
+                   for cityobject_id, cityobject in data["CityObjects"].items()]
+    return CityJSON("https://example.com/", "ex", "city", data["version"], transform, vertices, cityobjects,
+                    Metadata.to_metadata(data.get("metadata")), vertex_references)
+
+
+def shift_boundaries(boundaries: Any, offset: int) -> Any:
+    """
+    Add an offset to every vertex index of nested boundaries.
+
+    :param boundaries: The boundaries, or a vertex index.
+    :param offset: The offset.
+    :return: The shifted boundaries.
+    """
+    if isinstance(boundaries, int):
+        return boundaries + offset
+    return [shift_boundaries(nested, offset) for nested in boundaries]
+
+
+def make_cityjson_seq(data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Split a CityJSON document into the lines of a CityJSONSeq file: the header, then one feature per family of
+    city objects with its own vertices.
+
+    The vertices of the document have to be used by one family only, in the order of the families, as with
+    make_cityjson, so the vertices of the features concatenated are the vertices of the document.
+
+    :param data: The CityJSON document.
+    :return: The header and the features.
+    """
+    header = {key: value for key, value in data.items() if key not in ("CityObjects", "vertices")}
+    header.update({"CityObjects": {}, "vertices": []})
+    lines = [header]
+    for cityobject_id, cityobject in data["CityObjects"].items():
+        if "parents" in cityobject:
+            continue
+        members = {member_id: copy.deepcopy(data["CityObjects"][member_id]) for member_id in [cityobject_id, *cityobject.get("children", [])]}
+        indices = [index for member in members.values() for geometry in member.get("geometry", [])
+                   for index in iter_boundary_indices(geometry)]
+        offset = min(indices, default=0)
+        for member in members.values():
+            for geometry in member.get("geometry", []):
+                geometry["boundaries"] = shift_boundaries(geometry["boundaries"], -offset)
+        lines.append({"type": "CityJSONFeature", "id": cityobject_id, "CityObjects": members,
+                      "vertices": data["vertices"][offset:max(indices, default=-1) + 1]})
+    return lines
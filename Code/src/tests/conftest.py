@@ -0,0 +1,15 @@
+import os
+import sys
+from typing import Any, Dict
+
+import pytest
+
+# The modules of the converter are imported from the src folder, as main.py does
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cityJsonData import make_cityjson
+
+
+@pytest.fixture
+def cityjson_data() -> Dict[str, Any]:
+    return make_cityjson(6)
@@ -0,0 +1,39 @@
+import gzip
+import pytest
+from Writer.backgroundWriter import BackgroundWriter, open_output
+
+texts = [f'{{"@id": "ex:B{index}", "name": "Gebäude {index}"}}\n' for index in range(1000)]
+
+
+class FailingFile:
+    def write(self, data):
+        raise OSError("No space left on device")
+
+    def close(self):
+        pass
+
+
+@pytest.mark.parametrize("file_name", ["city.jsonld", "city.jsonld.gz"])
+def test_written_bytes_equal_a_direct_write(tmp_path, file_name):
+    path = tmp_path / file_name
+    # Small chunks so the text goes through the thread in many chunks
+    with open_output(str(path)) as writer:
+        writer.chunk_size = 100
+        for text in texts:
+            writer.write(text)
+
+    written = path.read_bytes()
+    if file_name.endswith(".gz"):
+        written = gzip.decompress(written)
+    assert written == "".join(texts).encode('utf-8')
+
+
+def test_error_of_the_writer_thread_is_raised_on_close(tmp_path):
+    writer = BackgroundWriter(str(tmp_path / "city.jsonld"), chunk_size=100)
+    writer.file.close()
+    writer.file = FailingFile()
+    for text in texts[:2]:
+        writer.write(text)
+
+    with pytest.raises(OSError, match="No space left on device"):
+        writer.close()
@@ -0,0 +1,49 @@
+import os
+import time
+from Batch import batchConversion
+
+
+def fake_convert(input_file_path, output_file_path, base_url, city_id, **options):
+    if city_id.startswith("crash"):
+        # Like a worker process killed by the system or a panic of a native library
+        os._exit(1)
+    # Still converting when the other worker process dies
+    time.sleep(0.2)
+    with open(output_file_path, "w") as output_file:
+        output_file.write(city_id)
+    return city_id != "invalid"
+
+
+def fake_init_worker(shacl_file_path=None):
+    batchConversion.worker_convert = fake_convert
+
+
+def write_inputs(folder, names):
+    os.makedirs(folder)
+    for name in names:
+        with open(os.path.join(folder, name), "w") as input_file:
+            # The largest files are submitted first
+            input_file.write("{}" if not name.startswith("crash") else "{}" * 100)
+
+
+def test_convert_batch_survives_a_crashing_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(batchConversion, "init_worker", fake_init_worker)
+    names = ["a.city.json", "b.city.json", "crash.city.json", "c.city.json", "invalid.city.json", "d.city.jsonl"]
+    write_inputs(tmp_path / "input", names)
+
+    counts = batchConversion.convert_batch(str(tmp_path / "input"), str(tmp_path / "output"), "https://example.com/",
+                                           2, None, {}, ".jsonld")
+
+    assert counts == {"converted": 4, "skipped": 1, "failed": 1}
+    assert sorted(os.listdir(tmp_path / "output")) == ["a.jsonld", "b.jsonld", "c.jsonld", "d.jsonld", "invalid.jsonld"]
+
+
+def test_convert_batch_fails_files_with_the_same_stem(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(batchConversion, "init_worker", fake_init_worker)
+    write_inputs(tmp_path / "input", ["a.city.json", "a.city.jsonl", "b.json"])
+
+    counts = batchConversion.convert_batch(str(tmp_path / "input"), str(tmp_path / "output"), "https://example.com/",
+                                           1, None, {}, ".jsonld")
+
+    assert counts == {"converted": 1, "skipped": 0, "failed": 2}
+    assert "same name without extension: a" in capsys.readouterr().out
@@ -0,0 +1,56 @@
+import json
+import pytest
+from rdflib import Graph
+from rdflib.compare import isomorphic
+from cityJsonData import build_cityjson, make_cityjson, make_cityjson_seq
+
+# The features are validated with the schema validator
+pytest.importorskip("cjvalpy")
+from Stream.cityJsonSeq import convert_cityjson_seq
+
+
+def write_seq(path, lines):
+    with open(path, "w", encoding="utf-8") as seq_file:
+        for line in lines:
+            seq_file.write(json.dumps(line) + "\n")
+
+
+def convert(tmp_path, data, seq_format="array", output_format="jsonld", output_name="output.jsonld"):
+    input_path, output_path = str(tmp_path / "city.city.jsonl"), str(tmp_path / output_name)
+    write_seq(input_path, make_cityjson_seq(data))
+    assert convert_cityjson_seq(input_path, output_path, "https://example.com/", "ex", "city", seq_format, False, output_format)
+    with open(output_path, encoding="utf-8") as output_file:
+        return output_file.read()
+
+
+def test_array_format_matches_the_regular_conversion(cityjson_data, tmp_path):
+    expected = build_cityjson(cityjson_data).to_json()
+
+    output = json.loads(convert(tmp_path, cityjson_data))
+
+    # The city objects are converted with the vertices of their feature, whose indices start at 0
+    assert output["cj:hasCityObjects"] == expected["cj:hasCityObjects"]
+    # The vertices of the features concatenated
+    assert output["cj:hasVertices"] == expected["cj:hasVertices"]
+    assert output == expected
+
+
+def test_lines_format_adds_the_features_to_the_header(cityjson_data, tmp_path):
+    expected = build_cityjson(cityjson_data).to_json()
+
+    header, *documents = [json.loads(line) for line in convert(tmp_path, cityjson_data, "lines").splitlines()]
+
+    assert header == {key: value for key, value in expected.items() if key not in ("cj:hasVertices", "cj:hasCityObjects")}
+    assert len(documents) == len(make_cityjson_seq(cityjson_data)) - 1
+    assert all(document["@id"] == expected["@id"] and document["@context"] == expected["@context"] for document in documents)
+    assert [cityobject for document in documents for cityobject in document["cj:hasCityObjects"]] == expected["cj:hasCityObjects"]
+
+
+def test_rdf_output_matches_the_regular_conversion(tmp_path):
+    # Few buildings, as the isomorphism check is slow on many blank nodes
+    data = make_cityjson(2)
+    expected = Graph().parse(data=json.dumps(build_cityjson(data).to_json()), format="json-ld")
+
+    graph = Graph().parse(data=convert(tmp_path, data, output_format="nt", output_name="output.nt"), format="nt")
+
+    assert isomorphic(graph, expected)
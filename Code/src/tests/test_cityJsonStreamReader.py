@@ -0,0 +1,48 @@
+import json
+import pytest
+
+# The files are streamed with the optional ijson package
+pytest.importorskip("ijson")
+from Reader.cityJsonStreamReader import read_cityjson_stream
+
+
+def write_json(tmp_path, data):
+    path = tmp_path / "city.city.json"
+    path.write_text(json.dumps(data), encoding='utf-8')
+    return str(path)
+
+
+def test_streamed_file_matches_json_load(tmp_path, cityjson_data):
+    path = write_json(tmp_path, cityjson_data)
+    with open(path, encoding='utf-8') as file:
+        loaded = json.load(file)
+
+    streamed = read_cityjson_stream(path)
+
+    assert streamed["vertices"].dtype == "int64"
+    assert streamed["vertices"].tolist() == loaded["vertices"]
+    cityobjects = streamed["CityObjects"]
+    assert len(cityobjects) == len(loaded["CityObjects"])
+    assert list(cityobjects.items()) == list(loaded["CityObjects"].items())
+    # The city objects are parsed again every time they are iterated
+    assert list(cityobjects) == list(loaded["CityObjects"])
+    assert {key: value for key, value in streamed.items() if key not in ("vertices", "CityObjects")} == \
+           {key: value for key, value in loaded.items() if key not in ("vertices", "CityObjects")}
+
+
+def test_empty_vertices(tmp_path, cityjson_data):
+    cityjson_data["vertices"] = []
+    cityjson_data["CityObjects"] = {"G": cityjson_data["CityObjects"]["G"]}
+
+    streamed = read_cityjson_stream(write_json(tmp_path, cityjson_data))
+
+    assert streamed["vertices"].shape == (0, 3)
+    assert list(streamed["CityObjects"].items()) == [("G", cityjson_data["CityObjects"]["G"])]
+
+
+@pytest.mark.parametrize("vertices", [[[0, 0, 0], [1, 2.5, 3]], [[0, 0]], [[0, 0, 0, 0]], [[0, [0], 0]]])
+def test_invalid_vertices_are_rejected(tmp_path, cityjson_data, vertices):
+    cityjson_data["vertices"] = vertices
+
+    with pytest.raises(ValueError, match="Each vertex should be a list of 3 integers"):
+        read_cityjson_stream(write_json(tmp_path, cityjson_data))
@@ -0,0 +1,92 @@
+import copy
+import numpy as np
+import pytest
+from Cityobjects.Geometry.boundaryIndices import iter_boundary_indices
+from Filtering.cityObjectFilter import CityObjectFilter
+from Transform.transform import Transform
+
+
+def get_transform(data):
+    return Transform(scale=data["transform"]["scale"], translate=data["transform"]["translate"])
+
+
+def check_renumbered(data, cityobjects, vertices, lods=None):
+    """
+    Check that the geometries refer to the vertices of the same coordinates, and that only these vertices are kept,
+    in their original order.
+    """
+    original_indices = {}
+    for cityobject_id, cityobject in cityobjects.items():
+        original_geometries = [geometry for geometry in data["CityObjects"][cityobject_id].get("geometry", [])
+                               if lods is None or geometry["lod"] in lods]
+        assert len(cityobject.get("geometry", [])) == len(original_geometries)
+        for geometry, original_geometry in zip(cityobject.get("geometry", []), original_geometries):
+            for index, original_index in zip(iter_boundary_indices(geometry), iter_boundary_indices(original_geometry), strict=True):
+                assert original_indices.setdefault(index, original_index) == original_index
+    assert sorted(original_indices) == list(range(len(vertices)))
+    kept = [original_indices[index] for index in range(len(vertices))]
+    assert kept == sorted(kept)
+    assert vertices.tolist() == [data["vertices"][index] for index in kept]
+
+
+def test_type_filter_prunes_the_children_that_are_not_selected(cityjson_data):
+    original = copy.deepcopy(cityjson_data)
+
+    cityobjects, vertices = CityObjectFilter(types=["Building"]).apply(
+        cityjson_data["CityObjects"], cityjson_data["vertices"], get_transform(cityjson_data))
+
+    assert list(cityobjects) == [f"B{i}" for i in range(6)]
+    assert all("children" not in cityobject for cityobject in cityobjects.values())
+    check_renumbered(original, cityobjects, vertices)
+    # The CityObjects of the file are left as they are
+    assert cityjson_data == original
+
+
+def test_selected_children_keep_their_ancestors(cityjson_data):
+    cityjson_data["CityObjects"]["B1-part"]["children"] = ["B1-subpart"]
+    cityjson_data["CityObjects"]["B1-subpart"] = {"type": "BuildingPart", "parents": ["B1-part"]}
+
+    cityobjects, vertices = CityObjectFilter(ids=["B1-subpart", "B4-part"]).apply(
+        cityjson_data["CityObjects"], cityjson_data["vertices"], get_transform(cityjson_data))
+
+    assert list(cityobjects) == ["B1", "B1-part", "B4", "B4-part", "B1-subpart"]
+    assert cityobjects["B1"]["children"] == ["B1-part"]
+    assert cityobjects["B1-part"]["children"] == ["B1-subpart"]
+    assert cityobjects["B4"]["children"] == ["B4-part"]
+    check_renumbered(cityjson_data, cityobjects, vertices)
+
+
+def test_lod_filter_keeps_the_vertices_of_the_selected_geometries(cityjson_data):
+    cityobjects, vertices = CityObjectFilter(lods=[1]).apply(
+        cityjson_data["CityObjects"], cityjson_data["vertices"], get_transform(cityjson_data))
+
+    assert list(cityobjects) == list(cityjson_data["CityObjects"])
+    assert all(geometry["lod"] == "1" for cityobject in cityobjects.values() for geometry in cityobject.get("geometry", []))
+    assert "geometry" not in cityobjects["B0-part"]
+    # The 8 corners of the solid of every building
+    assert len(vertices) == 6 * 8
+    check_renumbered(cityjson_data, cityobjects, vertices, lods=["1"])
+
+
+def test_bbox_filter_selects_the_intersecting_cityobjects(cityjson_data):
+    transform = get_transform(cityjson_data)
+
+    cityobjects, vertices = CityObjectFilter(bbox=[85195, 446000, 85210, 446010]).apply(
+        cityjson_data["CityObjects"], cityjson_data["vertices"], transform)
+
+    assert list(cityobjects) == ["B2", "B2-part"]
+    check_renumbered(cityjson_data, cityobjects, vertices)
+
+
+def test_vertices_are_kept_without_renumbering(cityjson_data):
+    cityobjects, vertices = CityObjectFilter(types=["BuildingPart"]).apply(
+        cityjson_data["CityObjects"], cityjson_data["vertices"], get_transform(cityjson_data), renumber=False)
+
+    assert vertices.tolist() == cityjson_data["vertices"]
+    for cityobject_id, cityobject in cityobjects.items():
+        assert cityobject.get("geometry") == cityjson_data["CityObjects"][cityobject_id].get("geometry")
+
+
+def test_invalid_bbox():
+    with pytest.raises(ValueError):
+        CityObjectFilter(bbox=[1, 0, 0, 1])
@@ -0,0 +1,33 @@
+import numpy as np
+from Cityobjects.Geometry.extentGeometries import ExtentGeometries
+
+real_vertices = np.array([[85000.0, 446000.0, 0.0], [85010.0, 446000.0, 0.0], [85010.0, 446005.0, 0.0],
+                          [85000.0, 446005.0, 0.0], [85000.0, 446000.0, 12.0], [85002.5, 446001.5, 12.0]])
+
+
+def get_wkts(extent_geometries):
+    return {data["@type"][1]: data["geosparql:asWKT"]["@value"] for data in extent_geometries.to_json()}
+
+
+def test_envelope_and_convex_hull_of_a_box():
+    geometries = [{"type": "Solid", "lod": "1", "boundaries": [[[[3, 2, 1, 0]], [[0, 1, 4]]]]},
+                  {"type": "MultiPoint", "lod": "0", "boundaries": [5]}]
+
+    wkts = get_wkts(ExtentGeometries(geometries, real_vertices, envelope=True, convex_hull=True))
+
+    assert wkts == {"cj:Envelope": "POLYGON ((85000 446000, 85010 446000, 85010 446005, 85000 446005, 85000 446000))",
+                    "cj:ConvexHull": "POLYGON ((85000 446000, 85000 446005, 85010 446005, 85010 446000, 85000 446000))"}
+
+
+def test_convex_hull_of_a_triangle_is_not_its_envelope():
+    geometries = [{"type": "MultiSurface", "lod": "2", "boundaries": [[[0, 1, 3]]]}]
+
+    wkts = get_wkts(ExtentGeometries(geometries, real_vertices, envelope=True, convex_hull=True))
+
+    assert wkts == {"cj:Envelope": "POLYGON ((85000 446000, 85010 446000, 85010 446005, 85000 446005, 85000 446000))",
+                    "cj:ConvexHull": "POLYGON ((85000 446000, 85000 446005, 85010 446000, 85000 446000))"}
+
+
+def test_geometries_without_vertices_have_no_extent():
+    assert ExtentGeometries([], real_vertices).to_json() is None
+    assert ExtentGeometries([{"type": "MultiPoint", "lod": "0", "boundaries": [1]}], real_vertices, envelope=False).to_json() is None
@@ -0,0 +1,48 @@
+import copy
+from Cityobjects.cityObjectFactory import to_cityobject
+from Cityobjects.Geometry.geometryCache import GeometryCache
+from Transform.transform import Transform
+
+
+def convert(data, geometry_cache=None):
+    transform = Transform(scale=data["transform"]["scale"], translate=data["transform"]["translate"])
+    real_vertices = transform.to_real_vertices(data["vertices"])
+    return [to_cityobject("ex", cityobject_id, cityobject, real_vertices, geometry_cache).to_json()
+            for cityobject_id, cityobject in data["CityObjects"].items()]
+
+
+def test_repeated_boundaries_are_cache_hits_with_the_same_output(cityjson_data):
+    geometries_count = sum(len(cityobject.get("geometry", [])) for cityobject in cityjson_data["CityObjects"].values())
+    # Every building again, with the same boundaries
+    for cityobject_id in [cityobject_id for cityobject_id in cityjson_data["CityObjects"] if "-" not in cityobject_id and cityobject_id != "G"]:
+        building = copy.deepcopy(cityjson_data["CityObjects"][cityobject_id])
+        del building["children"]
+        cityjson_data["CityObjects"][f"{cityobject_id}-copy"] = building
+    geometry_cache = GeometryCache(100, GeometryCache.get_vertices_key(cityjson_data["transform"]["scale"], cityjson_data["transform"]["translate"]))
+
+    converted = convert(cityjson_data, geometry_cache)
+
+    assert converted == convert(cityjson_data)
+    assert geometry_cache.get_stats() == {"hits": 6 * 2, "misses": geometries_count, "size": geometries_count}
+
+
+def test_least_recently_used_geometries_are_evicted():
+    geometry_cache = GeometryCache(2)
+    keys = [geometry_cache.get_key("MultiPoint", [[index]]) for index in range(3)]
+    geometry_cache.put(keys[0], "POINT (0 0)", {})
+    geometry_cache.put(keys[1], "POINT (1 1)", {})
+    # Used again, so the second one is the least recently used
+    assert geometry_cache.get(keys[0]) == ("POINT (0 0)", {})
+
+    geometry_cache.put(keys[2], "POINT (2 2)", {})
+
+    assert len(geometry_cache.entries) == 2
+    assert geometry_cache.get(keys[1]) is None
+    assert geometry_cache.get(keys[0]) is not None and geometry_cache.get(keys[2]) is not None
+    assert (geometry_cache.hits, geometry_cache.misses) == (3, 1)
+
+
+def test_vertices_key_separates_the_entries():
+    first, second = GeometryCache(10, GeometryCache.get_vertices_key([1, 1, 1], [0, 0, 0])), GeometryCache(10, GeometryCache.get_vertices_key([1, 1, 1], [5, 0, 0]))
+
+    assert first.get_key("MultiPoint", [0, 1]) != second.get_key("MultiPoint", [0, 1])
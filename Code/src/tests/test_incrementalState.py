@@ -0,0 +1,93 @@
+import json
+from Cityobjects.cityObjectFactory import to_cityobject
+from Cityobjects.Geometry.boundaryIndices import iter_boundary_indices
+from Incremental.incrementalState import IncrementalState, hash_cityobject, write_diff
+from Transform.transform import Transform
+
+options = {"base_url": "https://example.com/"}
+
+
+def get_real_vertices(data):
+    transform = Transform(scale=data["transform"]["scale"], translate=data["transform"]["translate"])
+    return transform.to_real_vertices(data["vertices"])
+
+
+def convert(data):
+    real_vertices = get_real_vertices(data)
+    return [to_cityobject("ex", cityobject_id, cityobject, real_vertices).to_json()
+            for cityobject_id, cityobject in data["CityObjects"].items()]
+
+
+def convert_incrementally(data, state_path):
+    """Convert the city objects as main.main does with an incremental state."""
+    state = IncrementalState.load(state_path, options)
+    real_vertices = get_real_vertices(data)
+    hashes = {cityobject_id: hash_cityobject(cityobject, real_vertices) for cityobject_id, cityobject in data["CityObjects"].items()}
+    diff = state.get_diff(hashes)
+    converted_ids = set(diff["added"]) | set(diff["changed"])
+    converted = (to_cityobject("ex", cityobject_id, data["CityObjects"][cityobject_id], real_vertices)
+                 for cityobject_id in hashes if cityobject_id in converted_ids)
+    cityobjects = [cityobject.to_json() for cityobject in state.merge(hashes, converted)]
+    state.save(state_path)
+    return diff, cityobjects
+
+
+def test_incremental_conversion_converts_the_changes_only(cityjson_data, tmp_path):
+    state_path = str(tmp_path / "state.json")
+
+    diff, cityobjects = convert_incrementally(cityjson_data, state_path)
+    assert diff["added"] == list(cityjson_data["CityObjects"]) and not diff["changed"] and not diff["unchanged"]
+    assert cityobjects == convert(cityjson_data)
+
+    diff, cityobjects = convert_incrementally(cityjson_data, state_path)
+    assert diff["unchanged"] == list(cityjson_data["CityObjects"]) and not diff["added"] and not diff["changed"]
+    assert cityobjects == convert(cityjson_data)
+
+    cityjson_data["CityObjects"]["B1"]["attributes"]["height"] = 99.0
+    # A vertex moved without any index changing
+    cityjson_data["vertices"][next(iter_boundary_indices(cityjson_data["CityObjects"]["B2-part"]["geometry"][0]))][2] += 1
+    del cityjson_data["CityObjects"]["B3"]["children"]
+    del cityjson_data["CityObjects"]["B3-part"]
+    cityjson_data["CityObjects"]["N"] = {"type": "GenericCityObject", "attributes": {"name": "new"}}
+
+    diff, cityobjects = convert_incrementally(cityjson_data, state_path)
+    assert diff["added"] == ["N"]
+    assert diff["changed"] == ["B1", "B2-part", "B3"]
+    assert diff["removed"] == ["B3-part"]
+    assert len(diff["unchanged"]) == len(cityjson_data["CityObjects"]) - 4
+    assert cityobjects == convert(cityjson_data)
+
+
+def test_state_with_other_options_converts_everything(cityjson_data, tmp_path):
+    state_path = str(tmp_path / "state.json")
+    convert_incrementally(cityjson_data, state_path)
+
+    state = IncrementalState.load(state_path, dict(options, include_wkt=False))
+    real_vertices = get_real_vertices(cityjson_data)
+    diff = state.get_diff({cityobject_id: hash_cityobject(cityobject, real_vertices)
+                           for cityobject_id, cityobject in cityjson_data["CityObjects"].items()})
+
+    assert diff["changed"] == list(cityjson_data["CityObjects"]) and not diff["unchanged"]
+
+
+def test_hash_depends_on_the_indices_only_with_vertex_references(cityjson_data):
+    cityobject = cityjson_data["CityObjects"]["B0-part"]
+    real_vertices = get_real_vertices(cityjson_data)
+    # The same coordinates at other indices
+    indices = list(iter_boundary_indices(cityobject["geometry"][0]))
+    moved_vertices = real_vertices[[*range(len(real_vertices)), *indices]]
+    new_indices = iter(range(len(real_vertices), len(moved_vertices)))
+    moved = {**cityobject, "geometry": [{**cityobject["geometry"][0], "boundaries": [
+        [[next(new_indices) for _ in ring] for ring in surface] for surface in cityobject["geometry"][0]["boundaries"]]}]}
+
+    assert hash_cityobject(moved, moved_vertices) == hash_cityobject(cityobject, real_vertices)
+    assert hash_cityobject(moved, moved_vertices, True) != hash_cityobject(cityobject, real_vertices, True)
+
+
+def test_write_diff(tmp_path):
+    write_diff(str(tmp_path / "diff.json"), "https://example.com/",
+               {"added": ["a"], "changed": ["b"], "removed": ["c"], "unchanged": ["d", "e"]})
+
+    with open(tmp_path / "diff.json") as diff_file:
+        assert json.load(diff_file) == {"added": ["https://example.com/a"], "changed": ["https://example.com/b"],
+                                        "removed": ["https://example.com/c"], "unchanged": 2}
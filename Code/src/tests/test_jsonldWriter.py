@@ -0,0 +1,60 @@
+import io
+import json
+import pytest
+from Writer.jsonldWriter import JsonLdWriter
+from cityJsonData import build_cityjson
+
+
+def write(value, formatted):
+    output = io.StringIO()
+    writer = JsonLdWriter(output, formatted)
+    writer.write_value(value)
+    return output.getvalue()
+
+
+def dump(value, formatted):
+    output = io.StringIO()
+    json.dump(value, output, ensure_ascii=False, indent=4 if formatted else None)
+    return output.getvalue()
+
+
+@pytest.mark.parametrize("formatted", [False, True])
+@pytest.mark.parametrize("value", [
+    {},
+    [],
+    {"a": [], "b": {}, "c": [{}], "d": [[], [1, [2, {"e": None}]]]},
+    {"text": "ä \"quoted\" \n é", "numbers": [0, -1, 1.5, 1e-07, 123456789012345678], "flags": [True, False, None]}
+])
+def test_write_value_matches_json_dump(value, formatted):
+    assert write(value, formatted) == dump(value, formatted)
+
+
+@pytest.mark.parametrize("formatted", [False, True])
+def test_nested_writes_match_json_dump(formatted):
+    output = io.StringIO()
+    writer = JsonLdWriter(output, formatted)
+    writer.begin_object()
+    writer.write_value("x", "@id")
+    writer.begin_array("empty")
+    writer.end_array()
+    writer.begin_object("nested")
+    writer.begin_array("@list")
+    writer.write_values([1, {"b": 2}])
+    writer.write_values([])
+    writer.write_value([3])
+    writer.end_array()
+    writer.end_object()
+    writer.end_object()
+
+    assert output.getvalue() == dump({"@id": "x", "empty": [], "nested": {"@list": [1, {"b": 2}, [3]]}}, formatted)
+
+
+@pytest.mark.parametrize("formatted", [False, True])
+@pytest.mark.parametrize("vertex_references, encoding", [(False, "list"), (True, "list"), (True, "base64")])
+def test_cityjson_write_json_matches_json_dump(cityjson_data, formatted, vertex_references, encoding):
+    cityjson = build_cityjson(cityjson_data, vertex_references, encoding)
+    output = io.StringIO()
+    # Chunks smaller than the vertices
+    cityjson.write_json(JsonLdWriter(output, formatted), chunk_size=7)
+
+    assert output.getvalue() == dump(cityjson.to_json(), formatted)
@@ -0,0 +1,19 @@
+from Cityobjects.cityObjectFactory import to_cityobject
+from Cityobjects.parallelConversion import convert_cityobjects_parallel
+from Transform.transform import Transform
+from cityJsonData import make_cityjson
+
+
+def test_parallel_conversion_keeps_the_serial_order():
+    data = make_cityjson(20)
+    transform = Transform(scale=data["transform"]["scale"], translate=data["transform"]["translate"])
+    real_vertices = transform.to_real_vertices(data["vertices"])
+
+    serial = [to_cityobject("ex", cityobject_id, cityobject, real_vertices, include_envelope=True).to_json()
+              for cityobject_id, cityobject in data["CityObjects"].items()]
+    parallel = [cityobject.to_json() for cityobject in convert_cityobjects_parallel(
+        "ex", data["CityObjects"], real_vertices, 2, include_envelope=True)]
+
+    assert parallel == serial
+    assert [cityobject["@id"] for cityobject in parallel] == [f"ex:{cityobject_id}" for cityobject_id in data["CityObjects"]]
+
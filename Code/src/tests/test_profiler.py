@@ -0,0 +1,48 @@
+import pytest
+from Profiling.profiler import Profiler, open_statm
+from cityJsonData import build_cityjson
+
+megabyte = 2 ** 20
+
+
+def test_stages_add_up_without_the_nested_stages():
+    profiler = Profiler()
+    with profiler.stage("write"):
+        for _ in range(3):
+            with profiler.stage("cityobjects"):
+                sum(range(10000))
+
+    report = profiler.to_json()
+
+    assert report["stages"]["write"]["calls"] == 1 and report["stages"]["cityobjects"]["calls"] == 3
+    assert sum(stage["wall_seconds"] for stage in report["stages"].values()) <= report["total"]["wall_seconds"]
+
+
+@pytest.mark.skipif(open_statm() is None, reason="The current resident memory is not available on this platform")
+def test_rss_increase_is_measured_per_stage():
+    profiler = Profiler()
+    # Still allocated at the end of the stage, as an earlier test may have raised the peak of the process higher
+    with profiler.stage("large"):
+        data = b"\x01" * (64 * megabyte)
+    del data
+    # Under the peak of the previous stage
+    with profiler.stage("small"):
+        data = b"\x01" * megabyte
+    del data
+
+    stages = profiler.to_json()["stages"]
+    assert stages["large"]["rss_increase_bytes"] >= 60 * megabyte
+    assert stages["small"]["rss_increase_bytes"] < 16 * megabyte
+
+
+def test_city_objects_are_counted_while_they_are_converted(cityjson_data):
+    profiler = Profiler()
+    cityobjects = build_cityjson(cityjson_data).cityobjects
+
+    converted = list(profiler.profile_cityobjects(cityobjects))
+
+    assert len(converted) == len(cityjson_data["CityObjects"])
+    counts = profiler.to_json()["counts"]
+    assert counts["cityobject_type"] == {"Building": 6, "BuildingPart": 6, "GenericCityObject": 1}
+    assert counts["geometry_type"] == {"Solid": 6, "MultiSurface": 12}
+    assert counts["geometry_lod"] == {"1": 6, "2": 12}
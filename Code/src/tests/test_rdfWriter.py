@@ -0,0 +1,45 @@
+import io
+import json
+import pytest
+from rdflib import Dataset, Graph, URIRef
+from rdflib.compare import isomorphic
+from Writer.rdfWriter import RdfWriter
+from cityJsonData import build_cityjson, make_cityjson
+
+
+# Buildings of the test documents, few as the isomorphism check is slow on many blank nodes
+buildings = 2
+
+
+def write_rdf(cityjson, output_format):
+    output = io.StringIO()
+    # Chunks smaller than the vertices
+    cityjson.write_rdf(RdfWriter(output, output_format, cityjson.get_context(), cityjson.id), chunk_size=7)
+    return output.getvalue()
+
+
+@pytest.mark.parametrize("output_format", ["nt", "ttl"])
+@pytest.mark.parametrize("vertex_references, encoding", [(False, "list"), (True, "list"), (True, "json"), (True, "base64")])
+def test_triples_are_isomorphic_to_the_jsonld(output_format, vertex_references, encoding):
+    cityjson = build_cityjson(make_cityjson(buildings), vertex_references, encoding, include_envelope=True, include_convex_hull=True)
+    expected = Graph().parse(data=json.dumps(cityjson.to_json()), format="json-ld")
+
+    graph = Graph().parse(data=write_rdf(cityjson, output_format), format={"nt": "nt", "ttl": "turtle"}[output_format])
+
+    assert len(graph) == len(expected)
+    assert isomorphic(graph, expected)
+
+
+def test_quads_are_in_the_graph_of_the_cityjson():
+    cityjson = build_cityjson(make_cityjson(buildings))
+    expected = Graph().parse(data=json.dumps(cityjson.to_json()), format="json-ld")
+
+    dataset = Dataset()
+    dataset.parse(data=write_rdf(cityjson, "nq"), format="nquads")
+    graph = Graph()
+    for subject, predicate, object, graph_name in dataset.quads():
+        assert graph_name == URIRef(cityjson.id)
+        graph.add((subject, predicate, object))
+
+    assert isomorphic(graph, expected)
+
@@ -0,0 +1,39 @@
+import json
+import os
+import re
+import pyshacl
+import pytest
+from SHACL import shaclValidation
+from cityJsonData import build_cityjson, make_cityjson
+
+shacl_file_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "SHACL", "cityjsonShapes.ttl")
+
+
+def get_results_count(report_text):
+    match = re.search(r"^Results \((\d+)\):", report_text, re.MULTILINE)
+    return int(match.group(1)) if match else 0
+
+
+@pytest.fixture
+def cityjson():
+    # Without building parts, pyshacl failing on parents and children validated in the same graph
+    data = make_cityjson(3)
+    data["CityObjects"] = {cityobject_id: cityobject for cityobject_id, cityobject in data["CityObjects"].items()
+                           if "parents" not in cityobject}
+    for cityobject in data["CityObjects"].values():
+        cityobject.pop("children", None)
+    return build_cityjson(data)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_sharded_validation_reports_the_results_of_the_whole_graph(cityjson, workers, monkeypatch):
+    conforms, _, results_text = pyshacl.validate(data_graph=json.dumps(cityjson.to_json()), shacl_graph=shacl_file_path,
+                                                 data_graph_format="json-ld", depth=999)
+    # The vertices split over several shards as well
+    monkeypatch.setattr(shaclValidation, "max_vertex_shard_size", 10)
+    assert len(list(shaclValidation.iter_shards(cityjson, 1))) > len(cityjson.cityobjects) + 1
+
+    sharded_conforms, report_text = shaclValidation.validate_cityjson(cityjson, shacl_file_path, workers)
+
+    assert sharded_conforms == conforms
+    assert get_results_count(report_text) == get_results_count(results_text)
@@ -0,0 +1,68 @@
+import json
+import pytest
+from Cityobjects.Geometry.boundaryIndices import iter_boundary_indices
+from Tiling.tiling import to_tiles, unlocated_tile_id, write_manifest
+from Transform.transform import Transform
+
+
+def get_real_vertices(data):
+    transform = Transform(scale=data["transform"]["scale"], translate=data["transform"]["translate"])
+    return transform.to_real_vertices(data["vertices"])
+
+
+def get_families(data):
+    return [{cityobject_id, *cityobject.get("children", [])} for cityobject_id, cityobject in data["CityObjects"].items()
+            if "parents" not in cityobject]
+
+
+@pytest.mark.parametrize("tile_size, max_tiles", [(50.0, None), (130.0, None), (None, 1), (None, 3), (None, 100)])
+def test_tiles_keep_families_together(cityjson_data, tile_size, max_tiles):
+    # A building part far from its building, in another cell of the grid
+    for geometry in cityjson_data["CityObjects"]["B0-part"]["geometry"]:
+        for index in iter_boundary_indices(geometry):
+            cityjson_data["vertices"][index][0] += 250000
+
+    tiles = to_tiles(cityjson_data["CityObjects"], get_real_vertices(cityjson_data), tile_size, max_tiles)
+
+    tile_of = {}
+    for tile in tiles:
+        for cityobject_id in tile.cityobject_ids:
+            assert cityobject_id not in tile_of
+            tile_of[cityobject_id] = tile.id
+    assert tile_of.keys() == cityjson_data["CityObjects"].keys()
+    for family in get_families(cityjson_data):
+        assert len({tile_of[cityobject_id] for cityobject_id in family}) == 1
+    assert tile_of["G"] == unlocated_tile_id
+    if max_tiles is not None:
+        assert len(tiles) - 1 <= max_tiles
+    order = list(cityjson_data["CityObjects"])
+    for tile in tiles:
+        assert tile.cityobject_ids == sorted(tile.cityobject_ids, key=order.index)
+
+
+def test_grid_tiles_follow_the_cells(cityjson_data):
+    tiles = to_tiles(cityjson_data["CityObjects"], get_real_vertices(cityjson_data), 100.0)
+
+    # One building with its part per cell, and the city object without geometry
+    assert len(tiles) == 7
+    for tile in tiles[:-1]:
+        assert len(tile.cityobject_ids) == 2
+        min_x, min_y, max_x, max_y = tile.bounds
+        assert min_x <= tile.extent[0] and tile.extent[2] <= max_x
+
+
+def test_manifest_counts_the_cityobjects_of_every_tile(cityjson_data, tmp_path):
+    tiles = to_tiles(cityjson_data["CityObjects"], get_real_vertices(cityjson_data), max_tiles=4)
+    file_names = [f"city_{tile.id}.jsonld" for tile in tiles]
+
+    write_manifest(str(tmp_path / "manifest.json"), "https://example.com/city", "city_header.jsonld", tiles, file_names,
+                   "jsonld", max_tiles=4)
+
+    with open(tmp_path / "manifest.json") as manifest_file:
+        manifest = json.load(manifest_file)
+    assert manifest["scheme"] == "quadtree" and manifest["max_tiles"] == 4 and "tile_size" not in manifest
+    assert manifest["header"] == "city_header.jsonld"
+    assert [entry["file"] for entry in manifest["tiles"]] == file_names
+    assert [entry["cityobjects"] for entry in manifest["tiles"]] == [len(tile.cityobject_ids) for tile in tiles]
+    assert sum(entry["cityobjects"] for entry in manifest["tiles"]) == len(cityjson_data["CityObjects"])
+    assert manifest["tiles"][-1]["id"] == unlocated_tile_id and manifest["tiles"][-1]["bounds"] is None
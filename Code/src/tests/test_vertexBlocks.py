@@ -0,0 +1,72 @@
+import io
+import json
+import numpy as np
+import pytest
+from rdflib import Graph, Namespace
+from Vertices.vertexBlocks import VertexBlockIndex, decode_vertex_values, encode_vertex_block
+from Vertices.vertices import Vertices
+from Writer.rdfWriter import RdfWriter
+from cityJsonData import build_cityjson
+
+CJ = Namespace("https://www.cityjson.org/ont/cityjson.ttl#")
+
+input_vertices = np.array([[i * 1000 - 5000, -(i ** 3), 2 ** 40 + i] for i in range(23)], dtype=np.int64)
+
+
+@pytest.mark.parametrize("encoding", ["json", "base64"])
+def test_decode_vertex_values(encoding):
+    values = encode_vertex_block(input_vertices, 0, encoding)["cj:vertexValues"]
+
+    assert np.array_equal(decode_vertex_values(values["@value"], values["@type"]), input_vertices)
+    # The lexical form of the literal, as read from RDF
+    lexical_form = values["@value"] if encoding == "base64" else json.dumps(values["@value"])
+    assert np.array_equal(decode_vertex_values(lexical_form, values["@type"]), input_vertices)
+
+
+def test_decode_vertex_values_rejects_other_datatypes():
+    with pytest.raises(ValueError):
+        decode_vertex_values("[]", "xsd:string")
+
+
+@pytest.mark.parametrize("encoding", ["json", "base64"])
+@pytest.mark.parametrize("block_size", [1, 5, 23, 100])
+def test_vertex_block_index_round_trip(encoding, block_size):
+    blocks = json.loads(json.dumps(Vertices(input_vertices, None, encoding, block_size).to_json()))
+    index = VertexBlockIndex(reversed(blocks))
+
+    assert len(index) == len(input_vertices)
+    assert np.array_equal(index.get_range(0, len(input_vertices)), input_vertices)
+    for start, stop in [(0, 0), (3, 4), (4, 17), (5, 10), (22, 23)]:
+        assert np.array_equal(index.get_range(start, stop), input_vertices[start:stop])
+    indices = [22, 0, 7, 7, 13, 5]
+    assert np.array_equal(index.get_vertices(indices), input_vertices[indices])
+
+
+def test_vertex_block_index_rejects_indices_out_of_the_blocks():
+    index = VertexBlockIndex(Vertices(input_vertices, None, "base64", 10).to_json())
+
+    with pytest.raises(ValueError):
+        index.get_range(20, 24)
+    with pytest.raises(ValueError):
+        index.get_vertices([23])
+    with pytest.raises(ValueError):
+        index.get_vertices([-1])
+
+
+@pytest.mark.parametrize("encoding", ["json", "base64"])
+def test_vertex_blocks_read_from_rdf(cityjson_data, encoding):
+    cityjson = build_cityjson(cityjson_data, True, encoding)
+    cityjson.vertices.block_size = 10
+    output = io.StringIO()
+    cityjson.write_rdf(RdfWriter(output, "nt", cityjson.get_context(), cityjson.id))
+    graph = Graph().parse(data=output.getvalue(), format="nt")
+
+    blocks = []
+    for block in graph.objects(predicate=CJ.hasVertexBlock):
+        values = graph.value(block, CJ.vertexValues)
+        blocks.append({"cj:startIndex": {"@value": graph.value(block, CJ.startIndex).toPython()},
+                       "cj:vertexCount": {"@value": graph.value(block, CJ.vertexCount).toPython()},
+                       "cj:vertexValues": {"@value": str(values), "@type": str(values.datatype)}})
+    index = VertexBlockIndex(blocks)
+
+    assert np.array_equal(index.get_range(0, len(index)), np.array(cityjson_data["vertices"]))
@@ -0,0 +1,59 @@
+from itertools import chain
+from Cityobjects.Geometry.boundaryIndices import boundary_depths
+from Cityobjects.Geometry.points import points_to_json
+from Vertices.vertices import Vertices
+from cityJsonData import build_cityjson
+
+
+def iter_vertex_ids(data):
+    # The IRIs of the vertices referred to by every line string, in document order
+    if isinstance(data, dict):
+        for key, value in data.items():
+            if key == "cj:hasVertex":
+                yield [vertex["@id"] for vertex in value["@list"]]
+            else:
+                yield from iter_vertex_ids(value)
+    elif isinstance(data, list):
+        for item in data:
+            yield from iter_vertex_ids(item)
+
+
+def iter_rings(geometry):
+    rings = geometry["boundaries"]
+    for _ in range(boundary_depths[geometry["type"]] - 2):
+        rings = chain.from_iterable(rings)
+    return rings
+
+
+def get_coordinates(vertex):
+    return [vertex["cj:vertexX"]["@value"], vertex["cj:vertexY"]["@value"], vertex["cj:vertexZ"]["@value"]]
+
+
+def test_points_refer_to_the_vertices_by_index():
+    vertices = Vertices([[0, 0, 0], [1, 2, 3], [4, 5, 6]], Vertices.get_vertex_prefix())
+    by_id = {vertex["@id"]: get_coordinates(vertex) for vertex in vertices.to_json()["@list"]}
+
+    data = points_to_json([2, 0, 1], vertex_prefix=Vertices.get_vertex_prefix())
+
+    assert [[by_id[vertex_id] for vertex_id in line] for line in iter_vertex_ids(data)] == [[[4, 5, 6], [0, 0, 0], [1, 2, 3]]]
+
+
+def test_bounding_boxes_refer_to_the_vertices_of_their_boundaries(cityjson_data):
+    data = build_cityjson(cityjson_data, vertex_references=True).to_json()
+    vertices = data["cj:hasVertices"]["@list"]
+    by_id = {vertex["@id"]: get_coordinates(vertex) for vertex in vertices}
+    assert len(by_id) == len(cityjson_data["vertices"])
+
+    cityobjects = {cityobject["@id"]: cityobject for cityobject in data["cj:hasCityObjects"]}
+    for cityobject_id, cityobject in cityjson_data["CityObjects"].items():
+        geometries = cityobjects[f"ex:{cityobject_id}"].get("cj:hasGeometry", [])
+        assert len(geometries) == len(cityobject.get("geometry", []))
+        for geometry_data, geometry in zip(geometries, cityobject.get("geometry", [])):
+            rings = [[cityjson_data["vertices"][index] for index in ring] for ring in iter_rings(geometry)]
+            lines = list(iter_vertex_ids(geometry_data["cj:hasBoundingBox"]))
+            assert lines
+            for line in lines:
+                # Every line string is a ring of the boundaries, closed again by its first vertex for some types
+                if len(line) > 1 and line[0] == line[-1]:
+                    line = line[:-1]
+                assert [by_id[vertex_id] for vertex_id in line] in rings